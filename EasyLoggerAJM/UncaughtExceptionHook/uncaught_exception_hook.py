@@ -1,8 +1,14 @@
+import logging
+import os
 import sys
+import threading
+import weakref
 from logging import basicConfig, error
 from pathlib import Path
+from typing import Iterable, Optional
 from . import UncaughtLogger
 from ..backend import LogFilePrepError
+from ..logger_parts import FlightRecorderHandler
 
 
 def clear_screen():
@@ -25,7 +31,8 @@ class UncaughtExceptionHook:
 
     Class Components:
     1. Initialization:
-       - Initializes an instance of `UncaughtLogger`.
+       - Initializes an instance of `UncaughtLogger` (on the first uncaught exception
+         if lazy=True, which is what `set_sys_excepthook` uses).
        - Prepares a logger with an email handler for administrator notification.
        - Defines the log file path for unhandled exceptions.
 
@@ -40,10 +47,17 @@ class UncaughtExceptionHook:
            a. Logging the exception details using `_basic_log_to_file`.
            b. Calling the default exception hook to print the traceback information to the console.
            c. Logging the exception using the uncaught logger.
-           d. Initializing a new email notification via the associated emailer.
-           e. Displaying a console message to inform where the exception logs are stored.
-           f. Prompting the user to press enter to exit the program.
-           g. Exiting the application with a status code of -1.
+           d. Dumping any open FlightRecorderHandler buffers to their crash files.
+           e. Initializing a new email notification via the associated emailer.
+           f. Displaying a console message to inform where the exception logs are stored.
+           g. Prompting the user to press enter to exit the program
+              (with interactive=False: flushing/closing all log handlers within flush_deadline instead).
+           h. Exiting the application with a status code of -1.
+
+       - `show_thread_exception_and_exit(args)` / `asyncio_exception_handler(loop, context)`:
+           The same for threading.excepthook and asyncio loops (see `install_asyncio_handler`),
+           except that these never prompt: they always flush, close and exit the process
+           as with interactive=False.
 
     Use example:
         in __init__.py:
@@ -54,14 +68,44 @@ class UncaughtExceptionHook:
     UNCAUGHT_LOG_MSG = ('\n********\n if exception could be logged, it is logged in \'{log_file_name}\' '
                         'even if it does not appear in other log files \n********\n')
 
-    def __init__(self, **kwargs):
-        self.uncaught_logger_class = kwargs.pop('uncaught_logger_class', UncaughtLogger)
-        self.uncaught_logger_class = self.uncaught_logger_class(logger_name='UncaughtExceptionLogger',
-                                   **kwargs)
-        self.uc_logger = self.uncaught_logger_class()
+    EXIT_CODE = -1
+    DEFAULT_FLUSH_DEADLINE = 5.0
+
+    def __init__(self, lazy: bool = False, interactive: bool = True,
+                 flush_deadline: float = DEFAULT_FLUSH_DEADLINE, **kwargs):
+        # interactive=False: no prompt/sleep, flush and close every handler within
+        # flush_deadline seconds, then exit at once (batch jobs, containers, ...)
+        self.interactive = interactive
+        self.flush_deadline = flush_deadline
+        self._uncaught_logger_type = kwargs.pop('uncaught_logger_class', UncaughtLogger)
+        self._uncaught_logger_kwargs = kwargs
+        self._uncaught_logger = None
+        self._uc_logger = None
+        if not lazy:
+            # build it now, as before; with lazy=True it is built on the first uncaught exception
+            _ = self.uc_logger
 
         self.log_file_name = Path('./unhandled_exception.log')
 
+    @property
+    def uncaught_logger_class(self):
+        """The UncaughtLogger instance, constructed on first access."""
+        if self._uncaught_logger is None:
+            self._uncaught_logger = self._uncaught_logger_type(logger_name='UncaughtExceptionLogger',
+                                                               **self._uncaught_logger_kwargs)
+        return self._uncaught_logger
+
+    @property
+    def uc_logger(self):
+        """The logger uncaught exceptions are logged to, constructed on first access."""
+        if self._uc_logger is None:
+            self._uc_logger = self.uncaught_logger_class()
+        return self._uc_logger
+
+    @property
+    def logger_initialized(self) -> bool:
+        return self._uc_logger is not None
+
     @classmethod
     def set_sys_excepthook(cls, **kwargs):
         """
@@ -78,16 +122,39 @@ class UncaughtExceptionHook:
         exceptions, display detailed error messages, or execute additional
         steps before termination of the program.
 
+        The hook is installed lazily: the UncaughtLogger (and everything EasyLogger
+        sets up for it) is only built when the first uncaught exception arrives.
+        Pass lazy=False to build it immediately.
+
+        Pass hook_threads=True to set threading.excepthook as well; an exception that ends
+        any thread then ends the whole process. For asyncio, call `install_asyncio_handler()`
+        on the returned hook from inside the loop.
+
         :param kwargs: Keyword arguments that will be passed to the class
                        constructor.
         :return: An instance of the class configured as the system exception
                  hook.
         :rtype: ClassName
         """
+        kwargs.setdefault('lazy', True)
+        hook_threads = kwargs.pop('hook_threads', False)
         c = cls(**kwargs)
         sys.excepthook = c.show_exception_and_exit
+        if hook_threads:
+            threading.excepthook = c.show_thread_exception_and_exit
         return c
 
+    def install_asyncio_handler(self, loop=None):
+        """
+        Use this hook as the exception handler of an asyncio event loop
+        (the running loop if `loop` is None), for exceptions nobody retrieved from a task or callback.
+        """
+        if loop is None:
+            import asyncio
+            loop = asyncio.get_running_loop()
+        loop.set_exception_handler(self.asyncio_exception_handler)
+        return loop
+
     @staticmethod
     def wait_for_key_and_exit():
         """Prompt the user before exiting the process with a non-zero status.
@@ -115,6 +182,47 @@ class UncaughtExceptionHook:
 
         sys.exit(-1)
 
+    @staticmethod
+    def flush_and_close_handlers(handlers: Optional[Iterable[logging.Handler]] = None,
+                                 deadline: float = DEFAULT_FLUSH_DEADLINE) -> bool:
+        """
+        Flush and close `handlers` (every handler logging knows of if None), like
+        logging.shutdown does at exit, but give up after `deadline` seconds so a stuck
+        handler (a blocked email, a full pipe, a lock held by a crashed thread) can't
+        keep the process alive.
+
+        :return: True if every handler was closed in time.
+        """
+        if handlers is None:
+            # noinspection PyProtectedMember,PyUnresolvedReferences
+            handler_refs = list(logging._handlerList)
+        else:
+            handler_refs = [weakref.ref(h) for h in reversed(list(handlers))]
+        closer = threading.Thread(target=logging.shutdown, args=(handler_refs,),
+                                  name='UncaughtExceptionHook-flush', daemon=True)
+        closer.start()
+        closer.join(deadline)
+        if closer.is_alive():
+            print(f'log handlers were not closed within {deadline} seconds, exiting anyway', file=sys.stderr)
+            return False
+        return True
+
+    def exit_process(self, interactive: Optional[bool] = None):
+        """
+        Exit after an uncaught exception: prompt first (interactive), or flush and close
+        the handlers within flush_deadline and exit immediately (non-interactive).
+
+        :param interactive: overrides self.interactive, e.g. False where a prompt can't work.
+        """
+        if self.interactive if interactive is None else interactive:
+            self.wait_for_key_and_exit()
+            return
+        self.flush_and_close_handlers(deadline=self.flush_deadline)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # os._exit: don't wait for non-daemon threads or atexit handlers, the logs are already closed
+        os._exit(self.__class__.EXIT_CODE)
+
     def _check_and_initialize_new_email_file(self):
         """Initialize a fresh email draft for the uncaught-exception emailer, if present.
 
@@ -150,9 +258,21 @@ class UncaughtExceptionHook:
 
         Attaches extra={'uncaught_exception': True} so filters/handlers can
         route these records appropriately (e.g., to email).
+        If the (lazily built) uncaught logger cannot be set up, a message is printed instead.
         """
-        self.uc_logger.error(msg='Uncaught exception', exc_info=(exc_type, exc_value, tb),
-                             extra={'uncaught_exception': True})
+        try:
+            uc_logger = self.uc_logger
+        except Exception as e:
+            print(f'could not set up the uncaught exception logger: {e}')
+            return
+        uc_logger.error(msg='Uncaught exception', exc_info=(exc_type, exc_value, tb),
+                        extra={'uncaught_exception': True})
+
+    @staticmethod
+    def _dump_flight_recorders(exc_type):
+        """Write the recent-records buffer of every open FlightRecorderHandler to its crash file."""
+        for crash_path in FlightRecorderHandler.dump_all(reason=f'uncaught {exc_type.__name__}'):
+            print(f'recent log records were written to \'{crash_path}\'')
 
     def show_exception_and_exit(self, exc_type, exc_value, tb):
         """Handle an uncaught exception, report it, and terminate the process.
@@ -163,8 +283,10 @@ class UncaughtExceptionHook:
         - Log the exception via the configured uncaught logger with
           extra={'uncaught_exception': True} so filters/handlers can route it
           (e.g., to email). A minimal file log helper exists but is disabled by default.
+        - Dump any FlightRecorderHandler buffers to their crash files.
         - Inform the user where a basic log would be written.
-        - Prompt the user before exiting with status -1.
+        - Prompt the user before exiting with status -1, or, if interactive=False, flush and
+          close the log handlers within flush_deadline and exit immediately.
         """
         # self._basic_log_to_file(exc_type, exc_value, tb)
         if exc_type == LogFilePrepError:
@@ -172,9 +294,46 @@ class UncaughtExceptionHook:
 
         sys.__excepthook__(exc_type, exc_value, tb)
 
+        self._report_exception(exc_type, exc_value, tb)
+        self.exit_process()
+
+    def _report_exception(self, exc_type, exc_value, tb):
+        """Log the exception, dump the flight recorders and tell the user where to look."""
         self._log_exception(exc_type, exc_value, tb)
+        self._dump_flight_recorders(exc_type)
 
         print(self.__class__.UNCAUGHT_LOG_MSG.format(log_file_name=self.log_file_name))
 
-        self.wait_for_key_and_exit()
+    def show_thread_exception_and_exit(self, args):
+        """
+        threading.excepthook version of show_exception_and_exit, for exceptions that end a thread.
+        SystemExit in a thread is ignored, as by the default hook.
+
+        Never prompts: sys.exit() would only end this thread, and the main thread would go on
+        without it, so the handlers are flushed and the process exits as with interactive=False.
+        """
+        if args.exc_type is SystemExit:
+            return
+        default_hook = getattr(threading, '__excepthook__', None)
+        if default_hook is not None:
+            default_hook(args)
+        else:
+            # threading.__excepthook__ is new in 3.10
+            sys.__excepthook__(args.exc_type, args.exc_value, args.exc_traceback)
+        self._report_exception(args.exc_type, args.exc_value, args.exc_traceback)
+        self.exit_process(interactive=False)
+
+    def asyncio_exception_handler(self, loop, context):
+        """
+        asyncio loop exception handler: exceptions are handled like uncaught ones,
+        contexts without an exception go to the loop's default handler.
+
+        Never prompts (that would block the event loop): the process exits as with interactive=False.
+        """
+        exception = context.get('exception')
+        loop.default_exception_handler(context)
+        if exception is None:
+            return
+        self._report_exception(type(exception), exception, exception.__traceback__)
+        self.exit_process(interactive=False)
 
@@ -6,3 +6,6 @@ logger instances.
 from EasyLoggerAJM.backend.errs import *
 from EasyLoggerAJM.backend.sub_initializers import _PropertiesInitializer, _InternalLoggerMethods, _HandlerInitializer, _FormatterInitializer
 from EasyLoggerAJM.backend.easy_logger_initializer import EasyLoggerInitializer
+from EasyLoggerAJM.backend.retention import LogRetentionManager
+from EasyLoggerAJM.backend.metrics import LevelCounters, PrometheusExporter
+from EasyLoggerAJM.backend.watchdog import StallWatchdog
@@ -26,8 +26,30 @@ class EasyLoggerInitializer(_PropertiesInitializer,
             - root_log_location: Base folder for logs.
             - no_stream_color: Disable colorized stream formatting.
             - show_warning_logs_in_console: If True, create a console handler for warnings.
-            - internal_verbose: If True, the internal logger also logs to console.
+            - internal_verbose: If True, the internal logger is enabled (DEBUG) and also logs to console.
+            - internal_log_level: Level of the process wide internal diagnostics logger ('OFF' by default,
+              or the EASYLOGGER_INTERNAL_LEVEL environment variable).
             - timestamp: Optional override for the timestamp used in log specs.
+            - file_handler_class: Handler class used for each level file (default logging.FileHandler).
+            - file_handler_kwargs: Extra keyword arguments passed to file_handler_class.
+            - retention: True or a dict of LogRetentionManager kwargs to clean up root_log_location.
+            - slotted_records: If True, the logger builds SlottedLogRecord records instead of LogRecords
+              (smaller retained records, no throughput or GC gain).
+            - flight_recorder: True or a dict of FlightRecorderHandler kwargs to keep recent records in memory
+              and dump them to a crash file on errors and uncaught exceptions.
+            - tail_sampling: True or a dict of TailSamplingHandler kwargs to hold back DEBUG/INFO records
+              logged inside EasyLogger.log_context() unless that context logs an ERROR.
+            - instrument_handlers: If True, every handler counts its emits, bytes, errors and dropped
+              records and keeps an emit-latency histogram, read with EasyLogger.stats().
+            - metrics: True or a dict (port, host, textfile, textfile_interval, exporter) to count records
+              per level and export them with the handler stats in Prometheus format (implies instrument_handlers).
+            - aggregates: True or a dict (interval, level, process_stats) to start the background flusher of
+              logger.count()/gauge(), one `metrics ...` line per interval in the INFO file.
+            - watchdog: True or a dict of StallWatchdog kwargs to sample every thread's stack to a file in
+              log_location when EasyLogger.heartbeat() stops being called or a handler blocks.
+            - profile_formatting: If True, count the call sites whose message was formatted by the caller
+              (f-string, %, .format) and then dropped by the level or every handler, see
+              logger.format_profiler.format_report().
         """
         kwargs.setdefault('root_log_location', None)
         kwargs.setdefault('project_name', project_name)
@@ -106,7 +128,7 @@ class EasyLoggerInitializer(_PropertiesInitializer,
         timestamp = kwargs.get('timestamp', None)
         if timestamp is not None:
             if isinstance(timestamp, (datetime, str)):
-                self._internal_logger.info(f"timestamp set to {timestamp}")
+                self._internal_logger.info("timestamp set to %s", timestamp)
                 return timestamp
             else:
                 try:
@@ -116,7 +138,7 @@ class EasyLoggerInitializer(_PropertiesInitializer,
                     raise e from None
         else:
             timestamp = datetime.now().isoformat(timespec='minutes').replace(':', '')
-            self._internal_logger.info(f"timestamp set to {timestamp}")
+            self._internal_logger.info("timestamp set to %s", timestamp)
             return timestamp
 
     def _set_timestamp_if_different(self):
@@ -125,8 +147,8 @@ class EasyLoggerInitializer(_PropertiesInitializer,
             self.timestamp = self.set_timestamp(timestamp=self.timestamp)
 
     def _initialize_internal_logger(self, internal_loggable_attrs: dict, **kwargs):
-        self._internal_logger = self._setup_internal_logger(verbose=kwargs.get('internal_verbose', False))
+        self._internal_logger = self._setup_internal_logger(verbose=kwargs.get('internal_verbose', False),
+                                                            level=kwargs.get('internal_log_level', None))
 
         self._log_attributes_internal(internal_loggable_attrs)
-        self._internal_logger.info(f'show_warning_logs_in_console set to '
-                                   f'{self.show_warning_logs_in_console}')
+        self._internal_logger.info("show_warning_logs_in_console set to %s", self.show_warning_logs_in_console)
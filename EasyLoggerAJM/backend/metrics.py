@@ -0,0 +1,323 @@
+"""
+metrics.py
+
+Prometheus text exposition of EasyLogger's health: records per level per logger, handler
+emits/bytes/errors/drops and emit-latency quantiles (from instrument_handler), tail sampling
+discards and handler queue depths. Served on a local HTTP endpoint and/or written to a text
+file for node_exporter's textfile collector.
+
+"""
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import Handler, getLevelName, getLogger
+from pathlib import Path
+from threading import Event, Lock, Thread, current_thread, local
+from typing import Dict, List, Optional, Tuple, Union
+
+from EasyLoggerAJM.backend.sub_initializers import _InternalLoggerMethods
+from EasyLoggerAJM.logger_parts import (BufferedRecordHandler, TailSamplingHandler, get_handler_stats,
+                                        default_handler_name)
+
+
+class LevelCounters:
+    """
+    Records per level for one logger, counted without locks.
+
+    Each thread increments a dict of its own (found through a threading.local), so the hot
+    path is a dict update no other thread writes to. `snapshot()` sums the per-thread dicts.
+    The dicts of finished threads are folded into a retired total whenever a new thread
+    registers or a snapshot is taken, so thread churn doesn't grow the list. Only the
+    registration of a new thread and `snapshot()` take a lock.
+
+    `users` counts the EasyLogger instances that share these counters through their logger,
+    so the last one to close can take them off the logger.
+    """
+
+    def __init__(self):
+        self._local = local()
+        self._lock = Lock()
+        self._thread_counts: List[Tuple[object, Dict[int, int]]] = []
+        self._retired: Dict[int, int] = {}
+        self.users = 0
+
+    def _register_thread(self) -> Dict[int, int]:
+        counts = self._local.counts = {}
+        with self._lock:
+            self._retire_finished_threads()
+            self._thread_counts.append((current_thread(), counts))
+        return counts
+
+    def _retire_finished_threads(self):
+        """Fold the counts of finished threads into the retired total. Caller holds the lock."""
+        live = []
+        for thread, counts in self._thread_counts:
+            if thread.is_alive():
+                live.append((thread, counts))
+            else:
+                self._add(self._retired, counts)
+        self._thread_counts = live
+
+    def increment(self, level: int, n: int = 1):
+        try:
+            counts = self._local.counts
+        except AttributeError:
+            counts = self._register_thread()
+        counts[level] = counts.get(level, 0) + n
+
+    @staticmethod
+    def _add(totals: Dict[int, int], counts: Dict[int, int]):
+        for level, count in counts.items():
+            totals[level] = totals.get(level, 0) + count
+
+    def snapshot(self) -> Dict[int, int]:
+        """Return {level number: records} summed over all threads."""
+        with self._lock:
+            self._retire_finished_threads()
+            totals = dict(self._retired)
+            for _, counts in self._thread_counts:
+                # copy(): a consistent view even while the owning thread keeps counting
+                self._add(totals, counts.copy())
+        return totals
+
+
+class _MetricFamily:
+    __slots__ = ('name', 'metric_type', 'help_text', 'samples')
+
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        self.name = name
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.samples: List[Tuple[str, Dict[str, str], Union[int, float]]] = []
+
+    def add(self, value: Union[int, float], suffix: str = '', **labels):
+        self.samples.append((suffix, labels, value))
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+class PrometheusExporter:
+    """
+    Collects the metrics of the registered EasyLogger instances and renders them in the
+    Prometheus text exposition format (version 0.0.4).
+
+    Metrics (prefixed with `namespace`, 'easylogger' by default):
+        - records_total{logger, level}: records that reached the logger's _log, i.e. that
+          passed the logger level (counted by LevelCounters, _EasyLoggerCustomLogger only)
+        - handler_emitted_total / handler_bytes_total / handler_errors_total /
+          handler_dropped_total{logger, handler}: from instrumented handlers; dropped counts
+          records rejected by the handler's filters (e.g. ConsoleOneTimeFilter)
+        - handler_emit_latency_seconds{logger, handler, quantile}: summary of the emit latency
+        - tail_sampling_discarded_total{logger}: records a TailSamplingHandler threw away
+        - handler_queue_depth{logger, handler}: records held by buffering handlers
+          (BufferedRecordHandler, TailSamplingHandler, anything with a `queue` with qsize())
+
+    usage:
+        exporter = PrometheusExporter()
+        exporter.register(easy_logger)
+        exporter.start_http_server(port=9464)       # http://127.0.0.1:9464/metrics
+        exporter.start_textfile_writer('/var/lib/node_exporter/easylogger.prom')
+    """
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+    QUANTILES = (0.5, 0.9, 0.99)
+    DEFAULT_HOST = '127.0.0.1'
+    DEFAULT_TEXTFILE_INTERVAL = 15.0
+
+    def __init__(self, namespace: str = 'easylogger'):
+        self.namespace = namespace
+        self._sources: list = []
+        self._lock = Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._server_thread: Optional[Thread] = None
+        self._textfile_stop = Event()
+        self._textfile_thread: Optional[Thread] = None
+        self._textfile_path: Optional[Path] = None
+        self.textfile_errors = 0
+
+    # sources
+    def register(self, easy_logger):
+        with self._lock:
+            if easy_logger not in self._sources:
+                self._sources.append(easy_logger)
+        return self
+
+    def unregister(self, easy_logger):
+        with self._lock:
+            if easy_logger in self._sources:
+                self._sources.remove(easy_logger)
+
+    @property
+    def sources(self) -> list:
+        with self._lock:
+            return list(self._sources)
+
+    # collection
+    @staticmethod
+    def _handler_label(handler: Handler) -> str:
+        stats = get_handler_stats(handler)
+        return stats.name if stats is not None else default_handler_name(handler)
+
+    @staticmethod
+    def _queue_depth(handler: Handler) -> Optional[int]:
+        if isinstance(handler, TailSamplingHandler):
+            return handler.buffered_records
+        if isinstance(handler, BufferedRecordHandler):
+            return len(handler.buffer)
+        queue = getattr(handler, 'queue', None)
+        if queue is not None and hasattr(queue, 'qsize'):
+            return queue.qsize()
+        return None
+
+    def _family(self, families: Dict[str, _MetricFamily], name: str, metric_type: str,
+                help_text: str) -> _MetricFamily:
+        full_name = f"{self.namespace}_{name}"
+        if full_name not in families:
+            families[full_name] = _MetricFamily(full_name, metric_type, help_text)
+        return families[full_name]
+
+    def _collect_source(self, families: Dict[str, _MetricFamily], easy_logger, seen_counters: set):
+        logger = easy_logger.logger
+        logger_name = logger.name
+        counters = getattr(logger, 'level_counters', None)
+        # several EasyLogger instances can share a logger (and its counters)
+        if counters is not None and id(counters) not in seen_counters:
+            seen_counters.add(id(counters))
+            records = self._family(families, 'records_total', 'counter', 'Records logged, per logger and level.')
+            for level, count in sorted(counters.snapshot().items()):
+                records.add(count, logger=logger_name, level=getLevelName(level))
+
+        for stats in (easy_logger.handler_stats or {}).values():
+            labels = {'logger': logger_name, 'handler': stats.name}
+            self._family(families, 'handler_emitted_total', 'counter',
+                         'Records that reached the handler emit().').add(stats.emitted, **labels)
+            self._family(families, 'handler_bytes_total', 'counter',
+                         'Formatted characters the handler wrote.').add(stats.bytes_written, **labels)
+            self._family(families, 'handler_errors_total', 'counter',
+                         'Handler emits that failed (handleError calls).').add(stats.errors, **labels)
+            self._family(families, 'handler_dropped_total', 'counter',
+                         'Records rejected by the handler filters (one-time/rate limiting).'
+                         ).add(stats.dropped, **labels)
+            latency = stats.latency
+            summary = self._family(families, 'handler_emit_latency_seconds', 'summary',
+                                   'Handler emit() latency, sampled (see HandlerStats.LATENCY_SAMPLE_EVERY).')
+            for quantile in self.__class__.QUANTILES:
+                summary.add(latency.percentile(quantile * 100) / 1e9, **labels, quantile=str(quantile))
+            summary.add(latency.total_ns / 1e9, '_sum', **labels)
+            summary.add(latency.count, '_count', **labels)
+
+        tail_sampler = getattr(easy_logger, 'tail_sampler', None)
+        if tail_sampler is not None:
+            self._family(families, 'tail_sampling_discarded_total', 'counter',
+                         'Records dropped by tail sampling.').add(tail_sampler.discarded_records, logger=logger_name)
+
+        # noinspection PyProtectedMember
+        for handler in easy_logger._own_handlers():
+            depth = self._queue_depth(handler)
+            if depth is not None:
+                self._family(families, 'handler_queue_depth', 'gauge',
+                             'Records currently held by a buffering handler.'
+                             ).add(depth, logger=logger_name, handler=self._handler_label(handler))
+
+    def collect(self) -> List[_MetricFamily]:
+        families: Dict[str, _MetricFamily] = {}
+        seen_counters = set()
+        for source in self.sources:
+            self._collect_source(families, source, seen_counters)
+        return list(families.values())
+
+    def render(self) -> str:
+        """Return the current metrics in the Prometheus text exposition format."""
+        lines = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} {family.metric_type}")
+            for suffix, labels, value in family.samples:
+                label_text = ','.join(f'{key}="{_escape_label_value(val)}"' for key, val in labels.items())
+                lines.append(f"{family.name}{suffix}{{{label_text}}} {value}")
+        return '\n'.join(lines) + '\n'
+
+    # exposition
+    def _make_request_handler(self):
+        exporter = self
+
+        class _MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', exporter.CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # scrapes would otherwise be printed to stderr
+                pass
+        return _MetricsRequestHandler
+
+    @property
+    def server_address(self) -> Optional[Tuple[str, int]]:
+        return self._server.server_address[:2] if self._server is not None else None
+
+    def start_http_server(self, host: str = DEFAULT_HOST, port: int = 0):
+        """
+        Serve /metrics on a daemon thread. port=0 picks a free port, see `server_address`.
+        Binds to localhost unless another host is given.
+        """
+        if self._server is None:
+            self._server = ThreadingHTTPServer((host, port), self._make_request_handler())
+            self._server.daemon_threads = True
+            self._server_thread = Thread(target=self._server.serve_forever, daemon=True,
+                                         name=f"{self.__class__.__name__}-http")
+            self._server_thread.start()
+        return self
+
+    def write_textfile(self, path: Union[str, Path]):
+        """Write the metrics to `path` atomically (temporary file + rename), as the textfile collector expects."""
+        path = Path(path)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            temp_path.write_text(self.render(), encoding='utf-8')
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def _textfile_loop(self, path: Path, interval: float):
+        internal_logger = getLogger(_InternalLoggerMethods.INTERNAL_LOGGER_NAME)
+        while True:
+            try:
+                self.write_textfile(path)
+            except Exception:
+                # e.g. a full disk or a directory that went away: try again next interval
+                self.textfile_errors += 1
+                internal_logger.exception("could not write the metrics textfile %s", path)
+            if self._textfile_stop.wait(interval):
+                break
+
+    def start_textfile_writer(self, path: Union[str, Path], interval: float = DEFAULT_TEXTFILE_INTERVAL):
+        """
+        Rewrite `path` every `interval` seconds on a daemon thread. A failed write is logged to
+        the internal logger and counted in `textfile_errors`, the thread keeps going.
+        """
+        if self._textfile_thread is None or not self._textfile_thread.is_alive():
+            self._textfile_stop.clear()
+            self._textfile_path = Path(path)
+            self._textfile_thread = Thread(target=self._textfile_loop, args=(self._textfile_path, interval),
+                                           daemon=True, name=f"{self.__class__.__name__}-textfile")
+            self._textfile_thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5):
+        """Shut down the HTTP server and the textfile writer."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._textfile_thread is not None:
+            self._textfile_stop.set()
+            self._textfile_thread.join(timeout=timeout)
+            self._textfile_thread = None
@@ -0,0 +1,405 @@
+"""
+retention.py
+
+age, size and per-project retention for the EasyLogger log tree, with compaction of
+old date partitions into single zip archives.
+
+"""
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from shutil import rmtree
+from threading import Event, Lock, Thread
+from typing import Optional, Union, Iterable, Iterator, Tuple, Dict, List
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from EasyLoggerAJM.backend.sub_initializers import _InternalLoggerMethods
+
+
+class _PartitionInfo:
+    """Size and project breakdown for a single date partition (directory or archive)."""
+    __slots__ = ('name', 'path', 'day', 'compacted', 'size', 'project_sizes')
+
+    def __init__(self, name: str, path: Path, day: date, compacted: bool):
+        self.name = name
+        self.path = path
+        self.day = day
+        self.compacted = compacted
+        self.size = 0
+        self.project_sizes: Dict[str, int] = {}
+
+    def add(self, project: Optional[str], size: int):
+        self.size += size
+        if project:
+            self.project_sizes[project] = self.project_sizes.get(project, 0) + size
+
+
+class LogRetentionManager:
+    """
+    Enforces retention on a `root_log_location` tree laid out as `<date>/<HHMM>/...`
+    (or `<date>/<HH00>/...`, `<date>/...` for the hourly and daily log specs).
+
+    Each top level `<date>` directory is a partition. Partitions are handled incrementally,
+    a few per `scan_step()`, so a large tree never has to be walked in one go:
+
+    - partitions older than `max_age_days` are deleted.
+    - partitions older than `compact_after_days` are compacted into `<date>.zip` with a
+      `<date>.manifest.json` next to it, and the original directory is removed.
+    - once a full pass has been indexed, the oldest partitions are deleted until the tree is
+      under `max_total_bytes`, and the oldest files of any project over `max_project_bytes`
+      are removed (archives are rewritten without those members).
+
+    Partitions containing any of `protected_paths` (e.g. the active `log_location`) and
+    today's partition are never compacted or deleted.
+
+    `start()` runs the scan on a daemon thread (a step that fails, e.g. on a file that vanished
+    or is locked, is logged to the internal logger, counted in `scan_errors` and retried after
+    `scan_interval`), `search()` greps both live files and archives, using the manifests to skip
+    archives that can't match.
+    """
+    ARCHIVE_SUFFIX = '.zip'
+    MANIFEST_SUFFIX = '.manifest.json'
+    LOG_FILE_PATTERN = re.compile(r'^(?P<level>[A-Z]+)-(?P<project>.+)-'
+                                  r'(?P<timestamp>\d{4}-\d{2}-\d{2}(T\d{4})?|\d{4})(\.\d+)?\.log(\.gz)?$')
+
+    def __init__(self, root_log_location: Union[str, Path], max_age_days: Optional[int] = None,
+                 max_total_bytes: Optional[int] = None, max_project_bytes: Optional[int] = None,
+                 compact_after_days: Optional[int] = 7, scan_batch_size: int = 10,
+                 scan_interval: float = 60.0, protected_paths: Iterable[Union[str, Path]] = (), **kwargs):
+        self.root_log_location = Path(root_log_location)
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        self.max_project_bytes = max_project_bytes
+        self.compact_after_days = compact_after_days
+        self.scan_batch_size = scan_batch_size
+        self.scan_interval = scan_interval
+        self.protected_paths = [Path(x).resolve() for x in protected_paths]
+
+        self._index: Dict[str, _PartitionInfo] = {}
+        self._pending: List[str] = []
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+        self.passes_completed = 0
+        self.partitions_compacted = 0
+        self.partitions_deleted = 0
+        self.files_deleted = 0
+        self.scan_errors = 0
+
+    # partition discovery
+    @classmethod
+    def parse_log_file_name(cls, file_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (level, project) for an EasyLogger log file name, or (None, None)."""
+        match = cls.LOG_FILE_PATTERN.match(file_name)
+        if match:
+            return match.group('level'), match.group('project')
+        return None, None
+
+    @classmethod
+    def _partition_day(cls, name: str) -> Optional[date]:
+        try:
+            return date.fromisoformat(name)
+        except ValueError:
+            return None
+
+    def _list_partitions(self) -> List[str]:
+        names = set()
+        if not self.root_log_location.is_dir():
+            return []
+        with os.scandir(self.root_log_location) as it:
+            for entry in it:
+                name = entry.name
+                if entry.is_file() and name.endswith(self.__class__.ARCHIVE_SUFFIX):
+                    name = name[:-len(self.__class__.ARCHIVE_SUFFIX)]
+                elif not entry.is_dir():
+                    continue
+                if self._partition_day(name):
+                    names.add(name)
+        return sorted(names)
+
+    def archive_path(self, name: str) -> Path:
+        return Path(self.root_log_location, name + self.__class__.ARCHIVE_SUFFIX)
+
+    def manifest_path(self, name: str) -> Path:
+        return Path(self.root_log_location, name + self.__class__.MANIFEST_SUFFIX)
+
+    def _iter_partition_files(self, path: Path) -> Iterator[os.DirEntry]:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._iter_partition_files(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+    def read_manifest(self, name: str) -> dict:
+        """Return the manifest of a compacted partition (empty members if it is missing)."""
+        try:
+            with open(self.manifest_path(name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'partition': name, 'members': []}
+
+    def _index_partition(self, name: str) -> Optional[_PartitionInfo]:
+        day = self._partition_day(name)
+        dir_path = Path(self.root_log_location, name)
+        if dir_path.is_dir():
+            info = _PartitionInfo(name, dir_path, day, compacted=False)
+            for entry in self._iter_partition_files(dir_path):
+                info.add(self.parse_log_file_name(entry.name)[1], entry.stat().st_size)
+            if self.archive_path(name).is_file():
+                # a partition compacted earlier but written to again, count the archive as well
+                for member in self.read_manifest(name)['members']:
+                    info.add(member.get('project'), member['compressed_size'])
+            return info
+        if self.archive_path(name).is_file():
+            info = _PartitionInfo(name, self.archive_path(name), day, compacted=True)
+            for member in self.read_manifest(name)['members']:
+                info.add(member.get('project'), member['compressed_size'])
+            return info
+        return None
+
+    # policy
+    def _is_protected(self, info: _PartitionInfo) -> bool:
+        if info.day >= date.today():
+            return True
+        partition_dir = Path(self.root_log_location, info.name).resolve()
+        return any(partition_dir == p or partition_dir in p.parents for p in self.protected_paths)
+
+    def _age_days(self, info: _PartitionInfo) -> int:
+        return (date.today() - info.day).days
+
+    def delete_partition(self, name: str):
+        """Remove a partition's directory, archive and manifest."""
+        rmtree(Path(self.root_log_location, name), ignore_errors=True)
+        self.archive_path(name).unlink(missing_ok=True)
+        self.manifest_path(name).unlink(missing_ok=True)
+        self._index.pop(name, None)
+        self.partitions_deleted += 1
+
+    def compact_partition(self, name: str) -> Path:
+        """
+        Compress every file of the `<date>` directory into `<date>.zip`, write the manifest,
+        and remove the directory. Members already in an existing archive are kept.
+        """
+        dir_path = Path(self.root_log_location, name)
+        archive_path = self.archive_path(name)
+        manifest = self.read_manifest(name)
+        members = {m['name']: m for m in manifest['members']}
+
+        with ZipFile(archive_path, 'a', compression=ZIP_DEFLATED) as zipf:
+            existing = set(zipf.namelist())
+            for entry in self._iter_partition_files(dir_path):
+                arcname = Path(entry.path).relative_to(dir_path).as_posix()
+                if arcname in existing:
+                    continue
+                zipf.write(entry.path, arcname=arcname)
+                zip_info = zipf.getinfo(arcname)
+                level, project = self.parse_log_file_name(entry.name)
+                members[arcname] = {'name': arcname, 'size': zip_info.file_size,
+                                    'compressed_size': zip_info.compress_size,
+                                    'level': level, 'project': project,
+                                    'mtime': entry.stat().st_mtime}
+
+        self._write_manifest(name, list(members.values()))
+        rmtree(dir_path, ignore_errors=True)
+        self.partitions_compacted += 1
+        return archive_path
+
+    def _write_manifest(self, name: str, members: List[dict]):
+        manifest = {'partition': name, 'archive': self.archive_path(name).name,
+                    'compacted_at': datetime.now().isoformat(timespec='seconds'),
+                    'members': sorted(members, key=lambda m: m['name'])}
+        tmp_path = self.manifest_path(name).with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path(name))
+
+    def _drop_project_from_archive(self, name: str, project: str) -> int:
+        """Rewrite a partition archive without the members of `project`; return the bytes freed."""
+        archive_path = self.archive_path(name)
+        members = self.read_manifest(name)['members']
+        keep = [m for m in members if m.get('project') != project]
+        freed = sum(m['compressed_size'] for m in members if m.get('project') == project)
+        if not keep:
+            archive_path.unlink(missing_ok=True)
+            self.manifest_path(name).unlink(missing_ok=True)
+            self.files_deleted += len(members)
+            return freed
+        tmp_path = archive_path.with_suffix('.tmp')
+        with ZipFile(archive_path, 'r') as src, ZipFile(tmp_path, 'w', compression=ZIP_DEFLATED) as dst:
+            for member in keep:
+                dst.writestr(src.getinfo(member['name']), src.read(member['name']))
+        os.replace(tmp_path, archive_path)
+        self._write_manifest(name, keep)
+        self.files_deleted += len(members) - len(keep)
+        return freed
+
+    def _drop_project_from_dir(self, info: _PartitionInfo, project: str) -> int:
+        freed = 0
+        for entry in list(self._iter_partition_files(Path(self.root_log_location, info.name))):
+            if self.parse_log_file_name(entry.name)[1] == project:
+                freed += entry.stat().st_size
+                Path(entry.path).unlink(missing_ok=True)
+                self.files_deleted += 1
+        return freed
+
+    def _apply_age_policy(self, info: _PartitionInfo):
+        if self._is_protected(info):
+            return
+        age = self._age_days(info)
+        if self.max_age_days is not None and age > self.max_age_days:
+            self.delete_partition(info.name)
+        elif (self.compact_after_days is not None and age > self.compact_after_days
+              and not info.compacted):
+            self.compact_partition(info.name)
+            self._index[info.name] = self._index_partition(info.name)
+
+    def _enforce_total_size(self):
+        if self.max_total_bytes is None:
+            return
+        total = sum(info.size for info in self._index.values())
+        for info in sorted(self._index.values(), key=lambda x: x.day):
+            if total <= self.max_total_bytes:
+                break
+            if self._is_protected(info):
+                continue
+            total -= info.size
+            self.delete_partition(info.name)
+
+    def _enforce_project_size(self):
+        if self.max_project_bytes is None:
+            return
+        project_totals: Dict[str, int] = {}
+        for info in self._index.values():
+            for project, size in info.project_sizes.items():
+                project_totals[project] = project_totals.get(project, 0) + size
+
+        for project, total in project_totals.items():
+            for info in sorted(self._index.values(), key=lambda x: x.day):
+                if total <= self.max_project_bytes:
+                    break
+                if self._is_protected(info) or project not in info.project_sizes:
+                    continue
+                if Path(self.root_log_location, info.name).is_dir():
+                    total -= self._drop_project_from_dir(info, project)
+                if self.archive_path(info.name).is_file():
+                    total -= self._drop_project_from_archive(info.name, project)
+                refreshed = self._index_partition(info.name)
+                if refreshed is None:
+                    self._index.pop(info.name, None)
+                else:
+                    self._index[info.name] = refreshed
+
+    # scanning
+    def scan_step(self) -> int:
+        """
+        Process up to `scan_batch_size` partitions. When a pass over the tree finishes,
+        the size caps are enforced and the next call starts a new pass.
+
+        :return: the number of partitions processed in this step.
+        """
+        with self._lock:
+            if not self._pending:
+                self._pending = self._list_partitions()
+                self._index = {k: v for k, v in self._index.items() if k in self._pending}
+
+            batch = self._pending[:self.scan_batch_size]
+            del self._pending[:self.scan_batch_size]
+            for name in batch:
+                info = self._index_partition(name)
+                if info is None:
+                    self._index.pop(name, None)
+                    continue
+                self._index[name] = info
+                self._apply_age_policy(info)
+
+            if not self._pending:
+                self._enforce_total_size()
+                self._enforce_project_size()
+                self.passes_completed += 1
+            return len(batch)
+
+    def run_once(self):
+        """Run a complete pass over the tree in the calling thread."""
+        passes = self.passes_completed
+        while self.passes_completed == passes:
+            self.scan_step()
+
+    def _run(self):
+        internal_logger = logging.getLogger(_InternalLoggerMethods.INTERNAL_LOGGER_NAME)
+        while not self._stop_event.is_set():
+            try:
+                self.scan_step()
+                pause = self.scan_interval if not self._pending else 0
+            except Exception:
+                # a file that vanished or is locked mid-step must not end retention for good
+                self.scan_errors += 1
+                internal_logger.exception("retention scan of %s failed", self.root_log_location)
+                pause = self.scan_interval
+            if self._stop_event.wait(pause):
+                break
+
+    def start(self):
+        """Start scanning on a background daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = Thread(target=self._run, daemon=True, name=self.__class__.__name__)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5):
+        """Stop the background thread started by `start()`."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'partitions': len(self._index),
+                    'compacted_partitions': len([x for x in self._index.values() if x.compacted]),
+                    'total_bytes': sum(x.size for x in self._index.values()),
+                    'passes_completed': self.passes_completed,
+                    'partitions_compacted': self.partitions_compacted,
+                    'partitions_deleted': self.partitions_deleted,
+                    'files_deleted': self.files_deleted}
+
+    # searching
+    def search(self, pattern: str, project: Optional[str] = None,
+               level: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Yield (source, line) for every line matching the regex `pattern`, in live
+        partitions and in compacted archives. Archive members are chosen from the
+        manifest, so archives without a matching project/level are never opened.
+        """
+        regex = re.compile(pattern)
+
+        def _wanted(member_level, member_project):
+            return ((project is None or member_project == project)
+                    and (level is None or member_level == level))
+
+        for name in self._list_partitions():
+            dir_path = Path(self.root_log_location, name)
+            if dir_path.is_dir():
+                for entry in self._iter_partition_files(dir_path):
+                    if not _wanted(*self.parse_log_file_name(entry.name)):
+                        continue
+                    open_func = gzip.open if entry.name.endswith('.gz') else open
+                    with open_func(entry.path, 'rt', encoding='utf-8', errors='replace') as f:
+                        for line in f:
+                            if regex.search(line):
+                                yield Path(entry.path).as_posix(), line.rstrip('\n')
+
+            members = [m['name'] for m in self.read_manifest(name)['members']
+                       if _wanted(m.get('level'), m.get('project'))]
+            if not members:
+                continue
+            with ZipFile(self.archive_path(name), 'r') as zipf:
+                for member in members:
+                    for raw in zipf.read(member).decode('utf-8', errors='replace').splitlines():
+                        if regex.search(raw):
+                            yield f"{self.archive_path(name).as_posix()}:{member}", raw
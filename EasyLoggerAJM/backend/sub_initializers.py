@@ -1,10 +1,13 @@
 import logging
+import os
 from abc import abstractmethod
 from datetime import datetime
 from pathlib import Path
 from typing import Union, Optional, Callable, Tuple, Type
 
-from EasyLoggerAJM.logger_parts import ConsoleOneTimeFilter, ColorizedFormatter
+from EasyLoggerAJM.logger_parts import ConsoleOneTimeFilter, ColorizedFormatter, DurableFileHandler, FsyncPolicy
+# noinspection PyProtectedMember
+from EasyLoggerAJM.logger_parts.handlers import _DurableHandlerMixin
 
 
 class _LogSpec:
@@ -94,6 +97,13 @@ class _InternalLoggerMethods:
     logging of initial attributes, setting up file and stream handlers, and initializing
     the internal logger.
 
+    The internal logger ('EasyLogger_internal') is process wide: its handlers are added once,
+    the first time it is enabled, no matter how many EasyLoggers are created. It is disabled
+    by default; enable it with the `internal_log_level` kwarg (a level name or number, or 'OFF'),
+    the EASYLOGGER_INTERNAL_LEVEL environment variable, or `internal_verbose=True` (DEBUG, also to console).
+    While it is disabled, the internal messages cost a level check each and no I/O,
+    they are all lazily %-formatted.
+
     Methods
     -------
     _log_attributes_internal(logger_kwargs)
@@ -101,13 +111,23 @@ class _InternalLoggerMethods:
         arguments passed during initialization.
 
     _setup_internal_logger_handlers(verbose=False)
-        Sets up handlers for the internal logger, including a file handler to log into
-        a predefined file and, optionally, a stream handler for console output.
+        Sets up handlers for the internal logger (once per process), including a file handler
+        to log into a predefined file and, optionally, a stream handler for console output.
 
     _setup_internal_logger(**kwargs)
         Initializes and configures the internal logger with a designated logging level
         and handlers. Returns the initialized logger.
     """
+    INTERNAL_LOGGER_NAME = 'EasyLogger_internal'
+    INTERNAL_LOG_FILE_NAME = 'EasyLogger_internal.log'
+    INTERNAL_LEVEL_ENV_VAR = 'EASYLOGGER_INTERNAL_LEVEL'
+    # level that disables the internal logger
+    INTERNAL_LEVEL_OFF = logging.CRITICAL + 1
+
+    # process wide state, shared by every EasyLogger
+    _internal_file_handler: Optional[logging.Handler] = None
+    _internal_stream_handler: Optional[logging.Handler] = None
+    _internal_level_configured = False
 
     def _log_attributes_internal(self, logger_kwargs):
         """
@@ -116,10 +136,30 @@ class _InternalLoggerMethods:
         :param logger_kwargs: Arguments passed during the initialization of the instance.
         :type logger_kwargs: dict
         """
-        self._internal_logger.info(f"root_log_location set to {self._root_log_location}")
-        self._internal_logger.info(f"chosen_format set to {self._chosen_format}")
-        self._internal_logger.info(f"no_stream_color set to {self._no_stream_color}")
-        self._internal_logger.info(f"kwargs passed to __init__ are {logger_kwargs}")
+        self._internal_logger.info("root_log_location set to %s", self._root_log_location)
+        self._internal_logger.info("chosen_format set to %s", self._chosen_format)
+        self._internal_logger.info("no_stream_color set to %s", self._no_stream_color)
+        self._internal_logger.info("kwargs passed to __init__ are %s", logger_kwargs)
+
+    @classmethod
+    def _resolve_internal_level(cls, level: Union[int, str, None] = None) -> Optional[int]:
+        """
+        Return the internal logger level from `level`, falling back to the
+        EASYLOGGER_INTERNAL_LEVEL environment variable; None if neither is set.
+        """
+        if level is None:
+            level = os.environ.get(cls.INTERNAL_LEVEL_ENV_VAR) or None
+        if level is None or isinstance(level, int):
+            return level
+        level = level.strip().upper()
+        if level in ('OFF', 'NONE', 'FALSE'):
+            return cls.INTERNAL_LEVEL_OFF
+        if level.isdigit():
+            return int(level)
+        resolved = logging.getLevelName(level)
+        if not isinstance(resolved, int):
+            raise ValueError(f"invalid internal log level: {level}")
+        return resolved
 
     def _setup_internal_logger_handlers(self, verbose=False):
         """
@@ -128,37 +168,51 @@ class _InternalLoggerMethods:
         :return: None
         :rtype: None
         """
-        log_file_path = Path(self._root_log_location,
-                             'EasyLogger_internal.log'.replace('\\', '/'))
+        internal_state = _InternalLoggerMethods
         fmt = logging.Formatter(self._chosen_format)
 
-        log_file_mode = 'w'
-        if not log_file_path.exists():
-            Path(self._root_log_location).mkdir(parents=True, exist_ok=True)
-        h = logging.FileHandler(log_file_path, mode=log_file_mode)
-        h.setFormatter(fmt)
-        self._internal_logger.addHandler(h)
+        if internal_state._internal_file_handler not in self._internal_logger.handlers:
+            log_file_path = Path(self._root_log_location, self.__class__.INTERNAL_LOG_FILE_NAME)
+            if not log_file_path.exists():
+                Path(self._root_log_location).mkdir(parents=True, exist_ok=True)
+            h = logging.FileHandler(log_file_path, mode='w')
+            h.setFormatter(fmt)
+            self._internal_logger.addHandler(h)
+            internal_state._internal_file_handler = h
 
-        if verbose:
+        if verbose and internal_state._internal_stream_handler not in self._internal_logger.handlers:
             h2 = logging.StreamHandler()
             h2.setFormatter(fmt)
             self._internal_logger.addHandler(h2)
+            internal_state._internal_stream_handler = h2
 
     def _setup_internal_logger(self, **kwargs):
         """
         Sets up the internal logger for the application.
 
         :param kwargs: Optional keyword arguments for configuring the logger.
-            The key 'verbose' can be used to enable or disable verbose logging.
+            The key 'verbose' can be used to enable or disable verbose logging,
+            'level' sets the internal logger level (see the class docstring).
         :return: The configured internal logger instance.
         :rtype: logging.Logger
         """
-        self._internal_logger = logging.getLogger('EasyLogger_internal')
+        internal_state = _InternalLoggerMethods
+        verbose = kwargs.get('verbose', False)
+        self._internal_logger = logging.getLogger(self.__class__.INTERNAL_LOGGER_NAME)
         self._internal_logger.propagate = False
-        self._internal_logger.setLevel(10)
-        self._setup_internal_logger_handlers(verbose=kwargs.get('verbose', False))
 
-        self._internal_logger.info("internal logger initialized")
+        level = self._resolve_internal_level(kwargs.get('level', None))
+        if level is not None:
+            self._internal_logger.setLevel(level)
+        elif verbose and not self._internal_logger.isEnabledFor(logging.DEBUG):
+            self._internal_logger.setLevel(logging.DEBUG)
+        elif not internal_state._internal_level_configured:
+            self._internal_logger.setLevel(self.__class__.INTERNAL_LEVEL_OFF)
+        internal_state._internal_level_configured = True
+
+        if self._internal_logger.isEnabledFor(logging.CRITICAL):
+            self._setup_internal_logger_handlers(verbose=verbose)
+            self._internal_logger.info("internal logger initialized")
         return self._internal_logger
 
 
@@ -170,6 +224,8 @@ class _PropertiesInitializer(_LogSpec):
 
     def __init__(self, root_log_location=None, **kwargs):
         self._file_logger_levels = None
+        self._durability_policies = {}
+        self.default_durability_policy = None
         self._project_name = None
         self._log_spec = None
         # noinspection SpellCheckingInspection
@@ -189,17 +245,50 @@ class _PropertiesInitializer(_LogSpec):
         """
         :param kwargs: A dictionary of keyword arguments used to initialize properties. Expected keys include:
             - 'file_logger_levels': A list specifying logger levels for file logging.
+                Entries may also be (level, durability_policy) pairs, or a dict of level: durability_policy.
+            - 'durability_policy': The FsyncPolicy (or mode string) used for levels without their own.
             - 'project_name': The name of the project.
             - 'log_spec': The logging specification details.
         :type kwargs: dict
         :return: None
         :rtype: None
         """
+        self.default_durability_policy = kwargs.get('durability_policy', None)
         # properties
         self.file_logger_levels = kwargs.get('file_logger_levels', [])
         self.project_name = kwargs.get('project_name', None)
         self.log_spec = kwargs.get('log_spec', None)
 
+    def _level_to_int(self, level: Union[int, str]) -> int:
+        if isinstance(level, str) and not level.isdigit():
+            return self.__class__.STR_TO_INT_LOGGER_LEVELS[level.upper()]
+        return int(level)
+
+    def _split_durability_policies(self, fll: Union[list, dict]) -> list:
+        """
+        Strip the durability policies out of file_logger_levels entries.
+
+        Accepts a dict of {level: policy} or a list whose entries are either plain levels
+        or (level, policy) pairs (a policy of None means the default policy). The policies
+        are stored by integer level and the plain list of levels is returned.
+        """
+        if isinstance(fll, dict):
+            fll = list(fll.items())
+        levels = []
+        for entry in fll:
+            if isinstance(entry, (tuple, list)):
+                level, policy = entry
+                if policy is not None:
+                    self._durability_policies[self._level_to_int(level)] = policy
+                levels.append(level)
+            else:
+                levels.append(entry)
+        return levels
+
+    def get_durability_policy(self, level: Union[int, str]):
+        """Return the durability policy configured for a file level (or the default policy)."""
+        return self._durability_policies.get(self._level_to_int(level), self.default_durability_policy)
+
     def _validate_file_logger_levels(self, fll: list):
         if [x for x in fll
             if x in self.__class__.STR_TO_INT_LOGGER_LEVELS
@@ -222,9 +311,11 @@ class _PropertiesInitializer(_LogSpec):
         if not value:
             self._file_logger_levels = self.get_default_file_logger_levels()
         else:
-            self._file_logger_levels = self._validate_file_logger_levels(value)
+            self._file_logger_levels = self._validate_file_logger_levels(self._split_durability_policies(value))
         if hasattr(self, "_internal_logger"):
-            self._internal_logger.info(f"file_logger_levels set to {self._file_logger_levels}")
+            self._internal_logger.info("file_logger_levels set to %s", self._file_logger_levels)
+            if self._durability_policies:
+                self._internal_logger.info("durability policies set to %s", self._durability_policies)
 
     @property
     def project_name(self):
@@ -245,7 +336,7 @@ class _PropertiesInitializer(_LogSpec):
         if not self._project_name:
             self._project_name = self.__class__._PROJECT_NAME
         if hasattr(self, "_internal_logger"):
-            self._internal_logger.info(f"project_name set to {self._project_name}")
+            self._internal_logger.info("project_name set to %s", self._project_name)
 
     # noinspection SpellCheckingInspection
     @property
@@ -334,6 +425,22 @@ class _EasyFileHandlerInitializer(_LogSpec):
     def project_name(self):
         ...
 
+    @abstractmethod
+    def get_durability_policy(self, level: Union[int, str]):
+        ...
+
+    def _set_durability_policy(self, file_handler: logging.FileHandler, policy):
+        """Attach the level's durability policy to a handler that supports one."""
+        if policy is None:
+            return
+        if isinstance(file_handler, _DurableHandlerMixin):
+            file_handler.durability_policy = FsyncPolicy.from_value(policy)
+            self._internal_logger.info("%s set on %s for %s", file_handler.durability_policy,
+                                       file_handler.__class__.__name__, file_handler.baseFilename)
+        else:
+            self._internal_logger.warning("%s does not support a durability policy, %s ignored for %s",
+                                          file_handler.__class__.__name__, policy, file_handler.baseFilename)
+
     def _make_file_handler_for_level(self, lvl: Union[int, str], file_handler_class: Type[logging.FileHandler], **kwargs):
         self.logger.setLevel(lvl)
         level_string = self.__class__.INT_TO_STR_LOGGER_LEVELS[self.logger.level]
@@ -341,8 +448,14 @@ class _EasyFileHandlerInitializer(_LogSpec):
         log_path = Path(self.log_location, '{}-{}-{}.log'.format(level_string,
                                                                  self.project_name, self.timestamp))
 
+        durability_policy = self.get_durability_policy(self.logger.level)
+        if durability_policy is not None and file_handler_class is logging.FileHandler:
+            # plain FileHandler can't fsync, use its durable subclass instead
+            file_handler_class = DurableFileHandler
+
         # Create a file handler for the logger, and specify the log file location
-        file_handler = file_handler_class(log_path)
+        file_handler = file_handler_class(log_path, **kwargs.get('file_handler_kwargs', {}))
+        self._set_durability_policy(file_handler, durability_policy)
         # Set the logging format for the file handler
         file_handler.setFormatter(self.formatter)
         file_handler.setLevel(self.logger.level)
@@ -351,6 +464,7 @@ class _EasyFileHandlerInitializer(_LogSpec):
 
         # Add the file handlers to the loggers
         self.logger.addHandler(file_handler)
+        return file_handler
 
     def make_file_handlers(self, **kwargs):
         """
@@ -360,17 +474,20 @@ class _EasyFileHandlerInitializer(_LogSpec):
 
         Parameters:
             self
+            file_handler_class: the handler class used for every level file (default logging.FileHandler).
+                It is called as file_handler_class(log_path, **file_handler_kwargs).
+            file_handler_kwargs: optional dict of extra keyword arguments for file_handler_class.
 
         Returns:
-            None
+            None (the created handlers are kept in self.file_handlers)
 
         Raises:
             None
         """
         self._internal_logger.info("creating file handlers for each logger level and log file location")
-        for lvl in self.file_logger_levels:
-            file_handler_class = kwargs.pop('file_handler_class', logging.FileHandler)
-            self._make_file_handler_for_level(lvl, file_handler_class, **kwargs)
+        file_handler_class = kwargs.pop('file_handler_class', None) or logging.FileHandler
+        self.file_handlers = [self._make_file_handler_for_level(lvl, file_handler_class, **kwargs)
+                              for lvl in self.file_logger_levels]
 
     def _add_filter_to_file_handler(self, handler: logging.FileHandler):
         """
@@ -413,9 +530,9 @@ class _EasyStreamHandlerInitializer(_LogSpec):
         try:
             otf_name = self.logger.handlers[-1].filters[0].name
         except (IndexError, Exception) as e:
-            self._internal_logger.error(f"Error getting filter name: {e}")
+            self._internal_logger.error("Error getting filter name: %s", e)
             otf_name = "Unknown"
-        self._internal_logger.info(f'Added filter {otf_name} to StreamHandler()')
+        self._internal_logger.info("Added filter %s to StreamHandler()", otf_name)
 
     @classmethod
     def _validate_llts(cls, log_level_to_stream: Union[int, str]):
@@ -435,7 +552,7 @@ class _EasyStreamHandlerInitializer(_LogSpec):
             # set the one time filter, so that log_level_to_stream messages will only be printed to the console once.
             one_time_filter = ConsoleOneTimeFilter()
             stream_handler.addFilter(one_time_filter)
-            self._internal_logger.info(f"Added filter {one_time_filter.name} to StreamHandler()")
+            self._internal_logger.info("Added filter %s to StreamHandler()", one_time_filter.name)
 
         return stream_handler
 
@@ -459,11 +576,10 @@ class _EasyStreamHandlerInitializer(_LogSpec):
                           if isinstance(log_level_to_stream, int)
                           else log_level_to_stream)
 
-        self._internal_logger.info(
-            f"creating StreamHandler() for {log_level_name} messages to print to console")
+        self._internal_logger.info("creating StreamHandler() for %s messages to print to console", log_level_name)
 
         use_one_time_filter = kwargs.pop('use_one_time_filter', True)
-        self._internal_logger.info(f"use_one_time_filter set to {use_one_time_filter}")
+        self._internal_logger.info("use_one_time_filter set to %s", use_one_time_filter)
 
         stream_handler = self._setup_stream_handler(log_level_to_stream,
                                                     use_one_time_filter,
@@ -474,9 +590,8 @@ class _EasyStreamHandlerInitializer(_LogSpec):
 
         # Add the stream handler to logger
         self.logger.addHandler(stream_handler)
-        self._internal_logger.info(
-            f"StreamHandler() for {log_level_name} messages added. "
-            f"{log_level_name} messages will be printed to console")
+        self._internal_logger.info("StreamHandler() for %s messages added. %s messages will be printed to console",
+                                   log_level_name, log_level_name)
 
         if use_one_time_filter:
             self._log_otf_use()
@@ -496,31 +611,32 @@ class _HandlerInitializer(_EasyFileHandlerInitializer, _EasyStreamHandlerInitial
     def _create_handler_instance(self, handler_to_create, handler_args, **kwargs):
         if handler_args is not None and isinstance(handler_to_create, type):
             instance = handler_to_create(**handler_args, **kwargs)
-            self._internal_logger.info(f"{handler_to_create.__class__.__name__} handler created")
-            self._internal_logger.debug(f"handler has the following args {dict(**handler_args, **kwargs)}")
+            self._internal_logger.info("%s handler created", handler_to_create.__class__.__name__)
+            self._internal_logger.debug("handler has the following args %s", dict(**handler_args, **kwargs))
         else:
             instance = handler_to_create
-            self._internal_logger.info(f"instance of {handler_to_create.__class__.__name__} handler detected, moving to set up")
+            self._internal_logger.info("instance of %s handler detected, moving to set up",
+                                       handler_to_create.__class__.__name__)
         return instance
 
     def create_other_handlers(self, handler_to_create: Optional[logging.Handler] = None,
                               handler_args: Optional[dict] = None, **kwargs):
         if handler_to_create and (callable(handler_to_create) or isinstance(handler_to_create, logging.Handler)):
-            self._internal_logger.info(f"creating {handler_to_create.__class__.__name__} handler")
+            self._internal_logger.info("creating %s handler", handler_to_create.__class__.__name__)
             instance = self._create_handler_instance(handler_to_create, handler_args, **kwargs)
             self._setup_other_handler(instance, **kwargs)
         else:
-            self._internal_logger.debug(f"no other handlers created")
+            self._internal_logger.debug("no other handlers created")
 
     def _setup_other_handler(self, handler_instance: logging.Handler, **kwargs):
         handler_instance.setLevel(kwargs.get('logging_level', self.logger.level))
-        self._internal_logger.info(f"handler level set to {logging.getLevelName(handler_instance.level)}")
+        self._internal_logger.info("handler level set to %s", logging.getLevelName(handler_instance.level))
 
         handler_instance.setFormatter(kwargs.get('formatter', self.formatter))
-        self._internal_logger.info(f"handler formatter set to {handler_instance.formatter.__class__.__name__}")
+        self._internal_logger.info("handler formatter set to %s", handler_instance.formatter.__class__.__name__)
 
         self.logger.addHandler(handler_instance)
-        self._internal_logger.info(f"{handler_instance.__class__.__name__} handler added")
+        self._internal_logger.info("%s handler added", handler_instance.__class__.__name__)
 
 
 class _FormatterInitializer:
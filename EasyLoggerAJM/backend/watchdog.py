@@ -0,0 +1,178 @@
+"""
+watchdog.py
+
+stall watchdog for EasyLogger: samples every thread's stack to a file when the
+application stops sending heartbeats or a handler blocks for too long.
+
+"""
+import sys
+import threading
+import traceback
+from logging import Handler, getLevelName
+from pathlib import Path
+from threading import Event, Lock, Thread, get_ident
+from time import monotonic, localtime, strftime
+from typing import Optional, Union, Dict, List, Tuple
+
+
+class StallWatchdog:
+    """
+    Watches for stalls on a daemon thread and writes aggregated stack samples of all threads
+    (sys._current_frames) to `<stacks_dir>/<stacks_file_name>` when:
+
+    - heartbeats stop: no `heartbeat()` for `heartbeat_timeout_ms` (only once a first
+      heartbeat has arrived, so loggers that never send one are not reported), or
+    - a handler blocks: a watched handler's `handle()` (waiting for its lock + filter + emit)
+      has been running for `emit_timeout_ms` in some thread.
+
+    Threads with identical stacks are written once with their count and names. Samples are
+    rate limited to one per `min_sample_interval` seconds while the stall lasts (the skipped
+    ones are counted in `samples_suppressed`), so a long stall doesn't make the watchdog a
+    bottleneck itself. The file is written directly, never through the logger: a blocked
+    handler may be holding the lock the logger would need.
+    """
+    DEFAULT_STACKS_FILE_NAME = 'watchdog_stacks.log'
+    SAMPLE_HEADER = '===== watchdog stack sample ({reason}) at {timestamp}: {count} thread(s) =====\n'
+    GROUP_HEADER = '--- {count} thread(s): {names} ---\n'
+
+    def __init__(self, stacks_dir: Union[str, Path], heartbeat_timeout_ms: Optional[float] = 5000,
+                 emit_timeout_ms: Optional[float] = 1000, check_interval_ms: Optional[float] = None,
+                 min_sample_interval: float = 10.0, max_stack_depth: int = 50,
+                 stacks_file_name: Optional[str] = None, encoding: str = 'utf-8'):
+        self.stacks_path = Path(stacks_dir, stacks_file_name or self.__class__.DEFAULT_STACKS_FILE_NAME)
+        self.heartbeat_timeout = heartbeat_timeout_ms / 1000 if heartbeat_timeout_ms else None
+        self.emit_timeout = emit_timeout_ms / 1000 if emit_timeout_ms else None
+        if check_interval_ms is None:
+            timeouts = [t for t in (self.heartbeat_timeout, self.emit_timeout) if t]
+            # a quarter of the shortest timeout, between 10 ms and 1 s
+            self.check_interval = min(max(min(timeouts, default=1.0) / 4, 0.01), 1.0)
+        else:
+            self.check_interval = check_interval_ms / 1000
+        self.min_sample_interval = min_sample_interval
+        self.max_stack_depth = max_stack_depth
+        self.encoding = encoding
+
+        self._last_heartbeat: Optional[float] = None
+        # (handler name, {thread ident: handle() start}) per watched handler
+        self._in_flight: List[Tuple[str, Dict[int, float]]] = []
+        self._last_sample: Optional[float] = None
+        self._sample_lock = Lock()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+        self.samples_written = 0
+        self.samples_suppressed = 0
+        self.last_reason: Optional[str] = None
+
+    def heartbeat(self):
+        """Tell the watchdog the application is making progress."""
+        self._last_heartbeat = monotonic()
+
+    def watch_handler(self, handler: Handler, name: Optional[str] = None):
+        """Wrap `handler.handle` (on the instance) so a call running past emit_timeout_ms is a stall."""
+        if getattr(handler, '_watchdog_in_flight', None) is not None:
+            return
+        in_flight: Dict[int, float] = {}
+        handle = handler.handle
+
+        def watched_handle(record):
+            ident = get_ident()
+            # a handler re-entered on this thread (e.g. it logs while emitting): the outer call
+            # keeps its own start once the inner one is done
+            outer_start = in_flight.get(ident)
+            in_flight[ident] = monotonic()
+            try:
+                return handle(record)
+            finally:
+                if outer_start is None:
+                    in_flight.pop(ident, None)
+                else:
+                    in_flight[ident] = outer_start
+
+        handler.handle = watched_handle
+        handler._watchdog_in_flight = in_flight
+        self._in_flight.append((name or handler.get_name() or
+                                f"{handler.__class__.__name__}-{getLevelName(handler.level)}", in_flight))
+
+    def stall_reasons(self, now: Optional[float] = None) -> List[str]:
+        """Why the application looks stalled right now (empty if it doesn't)."""
+        now = monotonic() if now is None else now
+        reasons = []
+        last_heartbeat = self._last_heartbeat
+        if self.heartbeat_timeout and last_heartbeat is not None and now - last_heartbeat >= self.heartbeat_timeout:
+            reasons.append(f"no heartbeat for {(now - last_heartbeat) * 1000:.0f} ms")
+        if self.emit_timeout:
+            for name, in_flight in self._in_flight:
+                # copy: the dict changes under us as records are handled
+                for ident, start in list(in_flight.items()):
+                    if now - start >= self.emit_timeout:
+                        reasons.append(f"{name} blocked for {(now - start) * 1000:.0f} ms in thread {ident}")
+        return reasons
+
+    def check(self) -> Optional[Path]:
+        """Sample the stacks if the application looks stalled and the rate limit allows it."""
+        now = monotonic()
+        reasons = self.stall_reasons(now)
+        if not reasons:
+            return None
+        if self._last_sample is not None and now - self._last_sample < self.min_sample_interval:
+            self.samples_suppressed += 1
+            return None
+        self._last_sample = now
+        return self.sample('; '.join(reasons))
+
+    def format_stacks(self) -> Tuple[int, str]:
+        """(thread count, text) of every thread's stack except the watchdog thread's, identical stacks grouped."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        own_ident = self._thread.ident if self._thread is not None else None
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = tuple(traceback.format_list(traceback.extract_stack(frame, limit=self.max_stack_depth)))
+            groups.setdefault(stack, []).append(names.get(ident, str(ident)))
+        parts = []
+        for stack, thread_names in sorted(groups.items(), key=lambda item: -len(item[1])):
+            parts.append(self.__class__.GROUP_HEADER.format(count=len(thread_names),
+                                                           names=', '.join(sorted(thread_names))))
+            parts.extend(stack)
+        return sum(len(x) for x in groups.values()), ''.join(parts)
+
+    def sample(self, reason: str = 'manual sample') -> Optional[Path]:
+        """
+        Append the current stacks of all threads to the stacks file.
+
+        :return: the stacks file path, or None if it could not be written.
+        """
+        with self._sample_lock:
+            count, stacks = self.format_stacks()
+            try:
+                self.stacks_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.stacks_path, 'a', encoding=self.encoding) as f:
+                    f.write(self.__class__.SAMPLE_HEADER.format(reason=reason, count=count,
+                                                               timestamp=strftime('%Y-%m-%d %H:%M:%S', localtime())))
+                    f.write(stacks)
+            except OSError as e:
+                print(f"could not write watchdog stack sample to {self.stacks_path}: {e}", file=sys.stderr)
+                return None
+            self.samples_written += 1
+            self.last_reason = reason
+        return self.stacks_path
+
+    def _run(self):
+        while not self._stop_event.wait(self.check_interval):
+            self.check()
+
+    def start(self):
+        """Start watching on a background daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = Thread(target=self._run, daemon=True, name=self.__class__.__name__)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5):
+        """Stop the background thread started by `start()`."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
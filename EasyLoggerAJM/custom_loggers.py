@@ -1,4 +1,18 @@
-from logging import Logger, getLevelName, StreamHandler, FileHandler, Handler
+import atexit
+import logging
+import sys
+from collections.abc import Mapping
+from logging import (Logger, LogRecord, getLevelName, StreamHandler, FileHandler, Handler,
+                     DEBUG, INFO, WARNING, ERROR, CRITICAL)
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from EasyLoggerAJM.logger_parts.format_profiler import WastedFormatProfiler
+from EasyLoggerAJM.logger_parts.lazy import LazyMessage, is_lazy_call
+from EasyLoggerAJM.logger_parts.batching import handle_batch
+from EasyLoggerAJM.logger_parts.aggregates import MetricAggregator, PeriodicFlusher, format_metrics_line
+from EasyLoggerAJM.logger_parts.timing import Timed, TimingAggregator, format_clock, format_duration
 
 
 class _EasyLoggerCustomLogger(Logger):
@@ -39,16 +53,78 @@ class _EasyLoggerCustomLogger(Logger):
 
     critical(self, msg: str, *args, **kwargs) -> None:
         Logs a critical message.
+
+    log_many(self, level: int, messages, exc_info=None, extra=None, stacklevel=1) -> int:
+        Log many precomputed messages (or (msg, *args) tuples) at once: each handler gets them
+        as one batch (one lock acquisition and one write per file for plain stream/file handlers).
+
+    progress(self, iterable, every_n=None, every_s=10.0, total=None, name=None, level=None):
+        Generator wrapper logging counts, rate and ETA of a loop at throttled intervals, and a
+        last line when it ends.
+
+    makeRecord(self, name, level, fn, lno, msg, args, exc_info, func=None, extra=None, sinfo=None):
+        Builds records with `record_factory` when one is set on the logger (e.g. SlottedLogRecord),
+        otherwise with the global logging record factory.
+
+    timed(self, name: str) -> Timed:
+        Context manager/decorator recording durations under `name`; a background thread logs
+        one summary line per `timing_interval` seconds (count, p50, p95, p99, max) at `timing_level`.
+
+    flush_timings(self) / stop_timings(self):
+        Log the timing summaries now / stop the background thread after a last flush.
+
+    count(self, name: str, n=1) / gauge(self, name: str, value):
+        Aggregate a counter / set a gauge in memory; a background thread logs them as one
+        `metrics ...` line per `aggregate_interval` seconds at `aggregate_level` (and flushes
+        the timing summaries too).
+
+    flush_aggregates(self) / stop_aggregates(self):
+        Log the aggregated line now / stop the background thread after a last flush.
+
+    `level_counters`, when set (see EasyLogger's `metrics` kwarg), counts every record that
+    reaches `_log` per level.
+
+    Messages may be callables or `lazy(...)` and args `lazy(...)`: they are only evaluated
+    (and sanitized/printed) once a handler formats the record, see logger_parts.lazy.
+
+    `format_profiler`, when set (see EasyLogger's `profile_formatting` kwarg), collects the call
+    sites of debug()/info()/warning()/error()/critical()/log() whose message was formatted by
+    the caller (no args, not a literal) and then dropped by the level or by every handler.
     """
+    # opt-in, per logger replacement for logging's global record factory
+    record_factory: Optional[Callable] = None
+    # opt-in, per logger record counts (a backend.metrics.LevelCounters)
+    level_counters = None
+    # opt-in, per logger detection of eagerly formatted messages that are dropped
+    format_profiler: Optional[WastedFormatProfiler] = None
+    # timed(): seconds between summary lines and their level
+    timing_interval: float = 60.0
+    timing_level: int = INFO
+    TIMING_SUMMARY_MSG = "timing %s: count=%d p50=%s p95=%s p99=%s max=%s"
+    _timings_lock = Lock()
+    _timings: Optional[TimingAggregator] = None
+    _timings_flusher: Optional[PeriodicFlusher] = None
+    # progress(): the level of its lines, and the most items between two clock reads
+    progress_level: int = INFO
+    PROGRESS_MAX_STRIDE = 4096
+    PROGRESS_MSG = "%s: %d items, %.1f items/s, elapsed %s"
+    PROGRESS_TOTAL_MSG = "%s: %d/%d (%.1f%%), %.1f items/s, elapsed %s, eta %s"
+    PROGRESS_END_MSG = "%s: %s, %d items in %s, %.1f items/s"
+    # count()/gauge(): seconds between aggregated lines, their level, and process RSS/gc stats
+    aggregate_interval: float = 60.0
+    aggregate_level: int = INFO
+    aggregate_process_stats: bool = False
+    _aggregates: Optional[MetricAggregator] = None
+    _aggregate_flusher: Optional[PeriodicFlusher] = None
 
     @staticmethod
     def _stream_handler_subclass_exclusion_criteria(hnd: Handler) -> bool:
         """Return True if the handler should be considered a stream-like handler.
 
-        Excludes FileHandler explicitly so file-based handlers are not treated
-        as stream handlers in stream-related decisions.
+        Excludes FileHandler (and its subclasses) explicitly so file-based handlers
+        are not treated as stream handlers in stream-related decisions.
         """
-        return type(hnd) is not FileHandler
+        return not isinstance(hnd, FileHandler)
 
     def _handler_is_stream_handler_subclass(self, hnd: Handler) -> bool:
         """Determine whether a handler is a StreamHandler or its subclass (excluding FileHandler)."""
@@ -106,13 +182,57 @@ class _EasyLoggerCustomLogger(Logger):
         if kwargs.get('print_msg', False) and self._logger_should_print_normal_msg():
             print(msg)
 
+    def _has_emitting_handler(self, level: int) -> bool:
+        """
+        Whether any handler callHandlers() would reach has a level that accepts `level`
+        (or logging.lastResort would be used). Handler filters are not evaluated, they may
+        have side effects (e.g. ConsoleOneTimeFilter remembers what it has seen).
+        """
+        logger = self
+        found = False
+        while logger:
+            for hnd in logger.handlers:
+                found = True
+                if level >= hnd.level:
+                    return True
+            if not logger.propagate:
+                break
+            logger = logger.parent
+        return not found and logging.lastResort is not None and level >= logging.lastResort.level
+
+    @staticmethod
+    def _caller_frame():
+        """The first frame outside of logging and this module, i.e. the logging call site."""
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename in (logging._srcfile, __file__):
+            frame = frame.f_back
+        return frame
+
+    def _profile_format(self, level: int, msg, args):
+        """Report `msg` to the format_profiler if the caller formatted it and it won't be emitted."""
+        if args or not isinstance(msg, str):
+            return
+        if self.isEnabledFor(level):
+            if self._has_emitting_handler(level):
+                return
+            by_level = False
+        else:
+            by_level = True
+        frame = self._caller_frame()
+        if frame is None or msg in frame.f_code.co_consts:
+            # a string literal: nothing was formatted
+            return
+        self.format_profiler.record(frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name,
+                                    len(msg), by_level)
+
     def _log(self, level, msg, args, exc_info=None, extra=None, stack_info=False, **kwargs):
         """
         :param level: The logging level specified for the log message.
         :type level: int
-        :param msg: The message that needs to be logged.
+        :param msg: The message that needs to be logged, or a callable/Lazy returning it.
         :type msg: str
-        :param args: Arguments to be merged into the log message.
+        :param args: Arguments to be merged into the log message, Lazy ones are only evaluated
+            if a handler formats the record (see logger_parts.lazy).
         :type args: tuple
         :param exc_info: Indicator or exception information for the log message. Can be a tuple, exception, or boolean.
         :type exc_info: Optional[Union[tuple, Exception, bool]]
@@ -125,25 +245,355 @@ class _EasyLoggerCustomLogger(Logger):
         :return: None
         :rtype: None
         """
-        self._print_msg(msg, print_msg=kwargs.pop('print_msg', False))
-        msg = self.sanitize_msg(msg)
+        if self.level_counters is not None:
+            self.level_counters.increment(level)
+        print_msg = kwargs.pop('print_msg', False)
+        if (args or msg.__class__ is not str) and is_lazy_call(msg, args):
+            # rendered (and sanitized) by the first handler that formats the record, if any
+            msg, args = LazyMessage(msg, args, self.sanitize_msg), ()
+            # printing renders the message, only do that if a handler will emit the record as well
+            if print_msg and self._has_emitting_handler(level):
+                try:
+                    text = str(msg)
+                except Exception:
+                    # reported by the handlers (handleError), not raised into the logging call
+                    pass
+                else:
+                    self._print_msg(text, print_msg=print_msg)
+        else:
+            self._print_msg(msg, print_msg=print_msg)
+            msg = self.sanitize_msg(msg)
         # noinspection PyProtectedMember
         super()._log(level, msg, args,
                      exc_info=exc_info,
                      extra=extra, stack_info=stack_info,
                      **kwargs)
 
+    def log_many(self, level: int, messages: Iterable, exc_info=None, extra=None, stacklevel: int = 1) -> int:
+        """
+        Log every item of `messages` at `level`, each item a message or a (msg, *args) tuple,
+        with one caller lookup for the whole batch. Unless a record_factory (or a global record
+        factory) is set, only the first record is built by makeRecord, the others are copies of
+        it with their own msg/args, so the whole batch shares its timestamp.
+
+        The records go through the logger's filters and are then passed to each handler as one
+        batch (see logger_parts.batching.handle_batch): a plain StreamHandler/FileHandler takes
+        its lock once and writes them all with a single write(), handlers without batch support
+        get handle() per record.
+
+        usage:
+            logger.log_many(logging.INFO, (('row %d: %s', i, result) for i, result in enumerate(results)))
+
+        :return: how many records were passed to the handlers (after the logger's filters).
+        """
+        if not isinstance(level, int):
+            raise TypeError("level must be an integer")
+        if self.disabled or not self.isEnabledFor(level):
+            return 0
+        try:
+            fn, lno, func, _ = self.findCaller(False, stacklevel + 1)
+        except ValueError:
+            fn, lno, func = "(unknown file)", 0, "(unknown function)"
+        if exc_info:
+            if isinstance(exc_info, BaseException):
+                exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+            elif not isinstance(exc_info, tuple):
+                exc_info = sys.exc_info()
+
+        records = []
+        logged = 0
+        # attributes shared by the records of the batch, see _copy_record
+        template = None
+        for item in messages:
+            logged += 1
+            if isinstance(item, tuple):
+                msg, args = item[0], item[1:]
+            else:
+                msg, args = item, ()
+            if (args or msg.__class__ is not str) and is_lazy_call(msg, args):
+                msg, args = LazyMessage(msg, args, self.sanitize_msg), ()
+            else:
+                msg = self.sanitize_msg(msg)
+            if template is None:
+                record = self.makeRecord(self.name, level, fn, lno, msg, args, exc_info, func, extra, None)
+                if self.record_factory is None and logging.getLogRecordFactory() is LogRecord:
+                    # copied before the logger's filters can change the record
+                    template = dict(record.__dict__)
+            else:
+                record = self._copy_record(template, msg, args)
+            rv = self.filter(record)
+            if rv:
+                records.append(rv if isinstance(rv, LogRecord) else record)
+        if self.level_counters is not None and logged:
+            self.level_counters.increment(level, logged)
+        if not records:
+            return 0
+
+        # same handler walk as Logger.callHandlers, once per batch
+        logger = self
+        found = False
+        while logger:
+            for hnd in logger.handlers:
+                found = True
+                if level >= hnd.level:
+                    handle_batch(hnd, records)
+            if not logger.propagate:
+                break
+            logger = logger.parent
+        if not found and logging.lastResort is not None and level >= logging.lastResort.level:
+            handle_batch(logging.lastResort, records)
+        return len(records)
+
+    def progress(self, iterable: Iterable, every_n: Optional[int] = None, every_s: Optional[float] = 10.0,
+                 total: Optional[int] = None, name: Optional[str] = None,
+                 level: Optional[int] = None) -> Iterator[Any]:
+        """
+        Yield the items of `iterable`, logging a progress line (count, items/s, elapsed, and
+        with a total the percentage and ETA) every `every_n` items and/or every `every_s`
+        seconds, whichever comes first, plus one line when the loop ends ("done") or is left
+        early ("stopped"). `total` defaults to len(iterable) when it has one. An item is counted
+        once the loop body is done with it.
+
+        Per item this costs a counter and a comparison: the clock is only read every few items,
+        with a stride that grows while the loop is fast (up to PROGRESS_MAX_STRIDE items, and no
+        more than the last observed rate gets through in every_s / 20) so the reads stay well
+        within `every_s`; a read that finds the loop has slowed down starts over at 1. If `level` (progress_level, INFO, by default) is not
+        enabled the items are passed through untouched.
+
+        usage:
+            for row in logger.progress(rows, every_s=30, name='import'):
+                load(row)
+        """
+        level = self.progress_level if level is None else level
+        if not self.isEnabledFor(level):
+            yield from iterable
+            return
+        if total is None:
+            try:
+                total = len(iterable)
+            except TypeError:
+                total = None
+        label = f"progress {name}" if name else "progress"
+        start = last_check = last_line = monotonic()
+        n = last_check_n = 0
+        stride = 1
+        next_line_n = every_n or 0
+        # with neither every_n nor every_s only the last line is logged
+        next_check = (every_n or float('inf')) if every_s is None else 1
+        finished = False
+        try:
+            for item in iterable:
+                yield item
+                n += 1
+                if n < next_check:
+                    continue
+                now = monotonic()
+                if (every_n and n >= next_line_n) or (every_s is not None and now - last_line >= every_s):
+                    self._log_progress(level, label, n, total, now - start)
+                    last_line = now
+                    if every_n:
+                        next_line_n = (n // every_n + 1) * every_n
+                if every_s is None:
+                    next_check = next_line_n
+                    continue
+                # aim for about 10 clock reads per every_s
+                span = now - last_check
+                if span > every_s:
+                    # the loop slowed down: read the clock every item until the stride is found again
+                    stride = 1
+                else:
+                    if span < every_s / 20:
+                        stride *= 2
+                    elif span > every_s / 5:
+                        stride //= 2
+                    if span > 0:
+                        # a stride the observed rate gets through in every_s / 20, so a slower
+                        # phase is not read (and logged) only thousands of items later
+                        stride = min(stride, int((n - last_check_n) * every_s / 20 / span))
+                    stride = max(1, min(stride, self.__class__.PROGRESS_MAX_STRIDE))
+                last_check = now
+                last_check_n = n
+                next_check = n + stride
+                if every_n:
+                    next_check = min(next_check, next_line_n)
+            finished = True
+        finally:
+            elapsed = monotonic() - start
+            self.log(level, self.__class__.PROGRESS_END_MSG, label, 'done' if finished else 'stopped', n,
+                     format_clock(elapsed), n / elapsed if elapsed > 0 else 0.0)
+
+    def _log_progress(self, level: int, label: str, n: int, total: Optional[int], elapsed: float):
+        rate = n / elapsed if elapsed > 0 else 0.0
+        if total:
+            eta = format_clock((total - n) / rate) if rate and n <= total else '?'
+            self.log(level, self.__class__.PROGRESS_TOTAL_MSG, label, n, total, n * 100 / total, rate,
+                     format_clock(elapsed), eta)
+        else:
+            self.log(level, self.__class__.PROGRESS_MSG, label, n, rate, format_clock(elapsed))
+
+    @staticmethod
+    def _copy_record(template: dict, msg, args) -> LogRecord:
+        """
+        A LogRecord with the attributes of `template` (the first record of a log_many batch:
+        same caller, time, thread and process) and its own msg/args, without LogRecord.__init__.
+        """
+        record = LogRecord.__new__(LogRecord)
+        record.__dict__.update(template)
+        if args and len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+            # as in LogRecord.__init__
+            args = args[0]
+        record.msg = msg
+        record.args = args
+        return record
+
+    def makeRecord(self, name, level, fn, lno, msg, args, exc_info,
+                   func=None, extra=None, sinfo=None):
+        """
+        Same as Logger.makeRecord, but uses this logger's `record_factory` if one is set.
+        """
+        if self.record_factory is None:
+            return super().makeRecord(name, level, fn, lno, msg, args, exc_info,
+                                      func=func, extra=extra, sinfo=sinfo)
+        rv = self.record_factory(name, level, fn, lno, msg, args, exc_info, func, sinfo)
+        if extra is not None:
+            record_dict = rv.__dict__
+            for key in extra:
+                if (key in ["message", "asctime"]) or (key in record_dict):
+                    raise KeyError("Attempt to overwrite %r in LogRecord" % key)
+                record_dict[key] = extra[key]
+        return rv
+
+    @property
+    def timings(self) -> TimingAggregator:
+        """
+        This logger's TimingAggregator, created on first use together with a background flusher,
+        so the last interval of a name that stops being timed (or of the process) is summarized too.
+        """
+        timings = self._timings
+        if timings is None or (self._timings_flusher is None and self.timing_interval > 0):
+            with self.__class__._timings_lock:
+                timings = self._timings
+                if timings is None:
+                    timings = self._timings = TimingAggregator(self._log_timing_summary, self.timing_interval)
+                # with no interval every record() summarizes, there is nothing to flush later
+                if self._timings_flusher is None and self.timing_interval > 0:
+                    self._timings_flusher = PeriodicFlusher(timings.flush, self.timing_interval,
+                                                            name=f'{self.name}-timings').start()
+                    # runs before logging.shutdown() closes the handlers
+                    atexit.register(self.stop_timings)
+        return timings
+
+    def _log_timing_summary(self, name: str, histogram):
+        self.log(self.timing_level, self.__class__.TIMING_SUMMARY_MSG, name, histogram.count,
+                 format_duration(histogram.percentile(50)), format_duration(histogram.percentile(95)),
+                 format_duration(histogram.percentile(99)), format_duration(histogram.max_ns))
+
+    def timed(self, name: str) -> Timed:
+        """
+        Time a block or a function under `name`, without a log line per call: durations go
+        into a per-name histogram, summarized in one line per `timing_interval` seconds.
+
+        usage:
+            with logger.timed('db.query'):
+                run_query()
+
+            @logger.timed('render')
+            def render(page): ...
+        """
+        return Timed(name, self.timings)
+
+    def flush_timings(self):
+        """Log the summary of every name timed since the last summary, and start a new interval."""
+        if self._timings is not None:
+            self._timings.flush()
+
+    def stop_timings(self):
+        """Stop the background timing summaries after a last flush; the next timed() starts them again."""
+        flusher = self._timings_flusher
+        if flusher is None:
+            return
+        flusher.stop()
+        self._timings_flusher = None
+        atexit.unregister(self.stop_timings)
+
+    @property
+    def aggregates(self) -> MetricAggregator:
+        """This logger's MetricAggregator, created (with its background flusher) on first use."""
+        aggregates = self._aggregates
+        if aggregates is None:
+            with self.__class__._timings_lock:
+                aggregates = self._aggregates
+                if aggregates is None:
+                    # raises on an invalid aggregate_interval before anything is set up
+                    flusher = PeriodicFlusher(self.flush_aggregates, self.aggregate_interval,
+                                              name=f'{self.name}-aggregates')
+                    aggregates = self._aggregates = MetricAggregator(self.aggregate_process_stats)
+                    self._aggregate_flusher = flusher.start()
+                    # runs before logging.shutdown() closes the handlers
+                    atexit.register(self.stop_aggregates)
+        return aggregates
+
+    def count(self, name: str, n: Union[int, float] = 1):
+        """
+        Add `n` to the counter `name` instead of logging a line per event, e.g.
+        logger.count('items.processed') in place of logger.info('processed item %s', item).
+        """
+        self.aggregates.count(name, n)
+
+    def gauge(self, name: str, value: Union[int, float]):
+        """Set the gauge `name`; its latest value is reported every interval."""
+        self.aggregates.gauge(name, value)
+
+    def flush_aggregates(self):
+        """
+        Log the counters since the last line, the gauges and (if enabled) the process stats as one
+        `metrics interval=... name=value ...` line, and the pending timing summaries.
+        The snapshot is also attached to the record as `record.aggregates`.
+        """
+        aggregates = self._aggregates
+        if aggregates is not None:
+            snapshot = aggregates.take()
+            if snapshot['counters'] or snapshot['gauges'] or snapshot['process']:
+                self.log(self.aggregate_level, format_metrics_line(snapshot), extra={'aggregates': snapshot})
+        if self._timings is not None:
+            self._timings.flush()
+
+    def stop_aggregates(self):
+        """Stop the background flusher after a last flush; the next count()/gauge() starts a new one."""
+        flusher = self._aggregate_flusher
+        if flusher is None:
+            return
+        flusher.stop()
+        self._aggregate_flusher = None
+        self._aggregates = None
+        atexit.unregister(self.stop_aggregates)
+
     def info(self, msg, *args, **kwargs):
+        if self.format_profiler is not None:
+            self._profile_format(INFO, msg, args)
         super().info(msg, *args, **kwargs)
 
     def warning(self, msg, *args, **kwargs):
+        if self.format_profiler is not None:
+            self._profile_format(WARNING, msg, args)
         super().warning(msg, *args, **kwargs)
 
     def error(self, msg, *args, **kwargs):
+        if self.format_profiler is not None:
+            self._profile_format(ERROR, msg, args)
         super().error(msg, *args, **kwargs)
 
     def debug(self, msg, *args, **kwargs):
+        if self.format_profiler is not None:
+            self._profile_format(DEBUG, msg, args)
         super().debug(msg, *args, **kwargs)
 
     def critical(self, msg, *args, **kwargs):
+        if self.format_profiler is not None:
+            self._profile_format(CRITICAL, msg, args)
         super().critical(msg, *args, **kwargs)
+
+    def log(self, level, msg, *args, **kwargs):
+        if self.format_profiler is not None and isinstance(level, int):
+            self._profile_format(level, msg, args)
+        super().log(level, msg, *args, **kwargs)
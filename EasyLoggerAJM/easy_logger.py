@@ -5,11 +5,15 @@ logger with already set up generalized file handlers
 
 """
 import logging
-from typing import Union, List, Optional, Callable, Any, Tuple
+from contextlib import nullcontext
+from typing import Union, List, Optional, Callable, Any, Tuple, Hashable, Dict
 
 from EasyLoggerAJM import _EasyLoggerCustomLogger
-from EasyLoggerAJM.logger_parts import NO_COLORIZER
-from EasyLoggerAJM.backend import EasyLoggerInitializer, InstanceNotCallableError
+from EasyLoggerAJM.logger_parts import (NO_COLORIZER, SlottedLogRecord, FlightRecorderHandler, TailSamplingHandler,
+                                        HandlerStats, instrument_handler, default_handler_name,
+                                        WastedFormatProfiler)
+from EasyLoggerAJM.backend import (EasyLoggerInitializer, InstanceNotCallableError, LogRetentionManager,
+                                   LevelCounters, PrometheusExporter, StallWatchdog)
 
 
 class EasyLogger(EasyLoggerInitializer):
@@ -75,6 +79,42 @@ class EasyLogger(EasyLoggerInitializer):
     classmethod UseLogger(cls, **kwargs)
         Instantiate a class with a specified logger.
 
+    create_retention_manager(self, retention=None)
+        Start background retention/compaction of root_log_location (opt-in via the `retention` kwarg).
+
+    create_flight_recorder(self, flight_recorder=None)
+        Add an in-memory FlightRecorderHandler that dumps to a crash file (opt-in via the `flight_recorder` kwarg).
+
+    create_tail_sampler(self, tail_sampling=None)
+        Route the level files through a per-context TailSamplingHandler (opt-in via the `tail_sampling` kwarg).
+
+    log_context(self, context_id)
+        Context manager that logs its body under `context_id` for tail sampling.
+
+    create_handler_stats(self, instrument_handlers=False)
+        Instrument every handler of this instance (opt-in via the `instrument_handlers` kwarg).
+
+    stats(self)
+        Snapshot of the per-handler emit counts, bytes, errors, drops and latency histograms.
+
+    create_metrics_exporter(self, metrics=None)
+        Count records per level and expose them with the handler stats in Prometheus format (opt-in via `metrics`).
+
+    create_aggregates(self, aggregates=None)
+        Start the logger's count()/gauge() background flusher with the given settings (opt-in via `aggregates`).
+
+    create_watchdog(self, watchdog=None)
+        Sample all thread stacks to a file when heartbeats stop or a handler blocks (opt-in via `watchdog`).
+
+    heartbeat(self)
+        Tell the watchdog the application is making progress.
+
+    create_format_profiler(self, profile_formatting=False)
+        Find call sites that format messages which are then dropped (opt-in via `profile_formatting`).
+
+    close(self)
+        Remove and close the handlers this instance added and stop its retention manager.
+
     Note:
     -----
     The EasyLogger class provides easy logging functionality for projects,
@@ -87,14 +127,31 @@ class EasyLogger(EasyLoggerInitializer):
         super().__init__(**kwargs)
 
         self.logger = self.initialize_logger(logger=logger, **kwargs)
+        # anything already on the logger isn't ours to close
+        self._preexisting_handlers = list(self.logger.handlers)
+        self.handler_stats: Optional[Dict[str, HandlerStats]] = None
+        self.watchdog: Optional[StallWatchdog] = None
+        # the logger's LevelCounters while this instance counts records (see create_metrics_exporter)
+        self._level_counters: Optional[LevelCounters] = None
 
-        self.make_file_handlers()
+        self.make_file_handlers(file_handler_class=kwargs.get('file_handler_class', None),
+                                file_handler_kwargs=kwargs.get('file_handler_kwargs', {}))
+        self.tail_sampler = self.create_tail_sampler(kwargs.get('tail_sampling', None))
 
         if self.show_warning_logs_in_console:
             self._internal_logger.info(self.__class__.SHOW_WARNING_LOGS_MSG)
             self.create_stream_handler(**kwargs)
 
         self.create_other_handlers()
+        self.flight_recorder = self.create_flight_recorder(kwargs.get('flight_recorder', None))
+        self.retention_manager = self.create_retention_manager(kwargs.get('retention', None))
+        # the exporter reports the handler stats, so metrics turn the instrumentation on
+        self.handler_stats = self.create_handler_stats(kwargs.get('instrument_handlers', False)
+                                                       or bool(kwargs.get('metrics', None)))
+        self.metrics_exporter = self.create_metrics_exporter(kwargs.get('metrics', None))
+        self.aggregates = self.create_aggregates(kwargs.get('aggregates', None))
+        self.watchdog = self.create_watchdog(kwargs.get('watchdog', None))
+        self.format_profiler = self.create_format_profiler(kwargs.get('profile_formatting', False))
         self.post_handler_setup()
 
     @staticmethod
@@ -134,12 +191,12 @@ class EasyLogger(EasyLoggerInitializer):
         """
         self._internal_logger.info('no passed in logger detected')
         logging.setLoggerClass(logger_class)
-        self._internal_logger.info(f'logger class set to \'{logger_class.__name__}\'')
+        self._internal_logger.info("logger class set to '%s'", logger_class.__name__)
 
         logger_name = kwargs.get('logger_name', self.__class__.DEFAULT_LOGGER_NAME)
         # Create a logger with a specified name
         self.logger = logging.getLogger(logger_name)
-        self._internal_logger.info(f'logger created with name set to \'{self.logger.name}\'')
+        self._internal_logger.info("logger created with name set to '%s'", self.logger.name)
         return self.logger
 
     def initialize_logger(self, logger=None, **kwargs) -> Union[logging.Logger, _EasyLoggerCustomLogger]:
@@ -159,14 +216,299 @@ class EasyLogger(EasyLoggerInitializer):
         if logger is None:
             self.logger = self._set_logger_class(**kwargs)
         else:
-            self._internal_logger.info(f'passed in logger ({logger}) detected')
+            self._internal_logger.info("passed in logger (%s) detected", logger)
             self.logger = logger
 
         self.logger.propagate = kwargs.get('propagate', True)
         self._internal_logger.info('logger initialized')
-        self._internal_logger.info(f'propagate set to {self.logger.propagate}')
+        self._internal_logger.info("propagate set to %s", self.logger.propagate)
+        self._set_record_factory(kwargs.get('slotted_records', False))
         return self.logger
 
+    def _set_record_factory(self, slotted_records: bool = False):
+        """
+        Use SlottedLogRecord for this logger's records if requested and the logger supports it.
+        Otherwise the default factory is put back, in case an earlier EasyLogger on the same
+        logger name asked for slotted records.
+        """
+        if isinstance(self.logger, _EasyLoggerCustomLogger):
+            self.logger.record_factory = SlottedLogRecord if slotted_records else None
+            if slotted_records:
+                self._internal_logger.info("record_factory set to %s", SlottedLogRecord.__name__)
+        elif slotted_records:
+            self._internal_logger.warning("slotted_records requires a %s, %s keeps the default record factory",
+                                          _EasyLoggerCustomLogger.__name__, self.logger.__class__.__name__)
+
+    def create_retention_manager(self, retention: Optional[Union[dict, bool]] = None) -> Optional[LogRetentionManager]:
+        """
+        Start a background LogRetentionManager on root_log_location if `retention` is given.
+
+        :param retention: True for the default policy, or a dict of LogRetentionManager kwargs
+            (max_age_days, max_total_bytes, max_project_bytes, compact_after_days, ...).
+            The current log_location is always protected.
+        :return: the started manager, or None if retention is not enabled.
+        """
+        if not retention:
+            return None
+        retention_kwargs = dict(retention) if isinstance(retention, dict) else {}
+        retention_kwargs['protected_paths'] = [*retention_kwargs.get('protected_paths', []), self.log_location]
+        manager = LogRetentionManager(self._root_log_location, **retention_kwargs)
+        self._internal_logger.info("retention manager created for %s", self._root_log_location)
+        return manager.start()
+
+    def create_flight_recorder(self, flight_recorder: Optional[Union[dict, bool]] = None
+                               ) -> Optional[FlightRecorderHandler]:
+        """
+        Add a FlightRecorderHandler that keeps the last records of every level (including DEBUG,
+        whether or not there is a DEBUG file) in memory and dumps them to a crash file in log_location.
+
+        :param flight_recorder: True for the defaults, or a dict of FlightRecorderHandler kwargs
+            (buffer_size, dump_level, crash_file_name).
+        :return: the handler, or None if the flight recorder is not enabled.
+        """
+        if not flight_recorder:
+            return None
+        recorder_kwargs = dict(flight_recorder) if isinstance(flight_recorder, dict) else {}
+        recorder = FlightRecorderHandler(self.log_location, **recorder_kwargs)
+        self._setup_other_handler(recorder, logging_level=logging.DEBUG)
+        self._internal_logger.info("flight recorder will dump to %s", recorder.crash_path)
+        return recorder
+
+    def create_tail_sampler(self, tail_sampling: Optional[Union[dict, bool]] = None
+                            ) -> Optional[TailSamplingHandler]:
+        """
+        Put the level file handlers behind a TailSamplingHandler, so DEBUG/INFO records logged
+        inside a `log_context()` only reach the files if that context logs an ERROR (or raises).
+
+        :param tail_sampling: True for the defaults, or a dict of TailSamplingHandler kwargs
+            (max_records_per_context, max_total_records, flush_level, buffer_below, context_var,
+            max_flushed_contexts).
+        :return: the handler, or None if tail sampling is not enabled.
+        """
+        if not tail_sampling:
+            return None
+        sampler_kwargs = dict(tail_sampling) if isinstance(tail_sampling, dict) else {}
+        # subclasses may not make file handlers (UncaughtLogger)
+        file_handlers = getattr(self, 'file_handlers', None) or []
+        for file_handler in file_handlers:
+            self.logger.removeHandler(file_handler)
+        sampler = TailSamplingHandler(file_handlers, **sampler_kwargs)
+        self.logger.addHandler(sampler)
+        self._internal_logger.info("tail sampling enabled for %s file handler(s)", len(file_handlers))
+        return sampler
+
+    def log_context(self, context_id: Hashable):
+        """
+        Log the body of the with block under `context_id` (a request or job id, ...).
+        Without tail sampling this does nothing.
+
+        usage:
+            with el.log_context(job.id):
+                run(job)
+        """
+        if self.tail_sampler is None:
+            return nullcontext(context_id)
+        return self.tail_sampler.context(context_id)
+
+    def _own_handlers(self) -> List[logging.Handler]:
+        """The handlers this instance added to the logger, plus the level file handlers behind a tail sampler."""
+        own_handlers = [h for h in self.logger.handlers if h not in self._preexisting_handlers]
+        return own_handlers + [h for h in (getattr(self, 'file_handlers', None) or []) if h not in own_handlers]
+
+    def _instrument(self, handler: logging.Handler) -> HandlerStats:
+        base_name = name = default_handler_name(handler)
+        suffix = 2
+        while name in self.handler_stats:
+            name = f"{base_name}-{suffix}"
+            suffix += 1
+        stats = instrument_handler(handler, name)
+        self.handler_stats[stats.name] = stats
+        return stats
+
+    def create_handler_stats(self, instrument_handlers: bool = False) -> Optional[Dict[str, HandlerStats]]:
+        """
+        Instrument every handler this instance set up (level files, console, other handlers,
+        and any added later through create_other_handlers) with a HandlerStats.
+
+        :param instrument_handlers: True to enable the instrumentation.
+        :return: the stats keyed by handler name ('<ClassName>-<LEVEL>' unless the handler has
+            a name), or None if instrumentation is not enabled.
+        """
+        if not instrument_handlers:
+            return None
+        self.handler_stats = {}
+        for handler in self._own_handlers():
+            self._instrument(handler)
+        self._internal_logger.info("instrumented %s handler(s)", len(self.handler_stats))
+        return self.handler_stats
+
+    def _setup_other_handler(self, handler_instance: logging.Handler, **kwargs):
+        super()._setup_other_handler(handler_instance, **kwargs)
+        if self.handler_stats is not None:
+            self._instrument(handler_instance)
+        if self.watchdog is not None:
+            self.watchdog.watch_handler(handler_instance, default_handler_name(handler_instance))
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Return a snapshot of every instrumented handler's counters, keyed by handler name:
+        emitted, bytes_written, errors, dropped and an emit-latency histogram (ns).
+        Empty unless the instance was created with instrument_handlers=True.
+        """
+        if self.handler_stats is None:
+            return {}
+        return {name: stats.snapshot() for name, stats in self.handler_stats.items()}
+
+    def create_metrics_exporter(self, metrics: Optional[Union[dict, bool]] = None) -> Optional[PrometheusExporter]:
+        """
+        Count this logger's records per level (LevelCounters, updated in _EasyLoggerCustomLogger._log)
+        and register this instance with a PrometheusExporter.
+
+        :param metrics: True to only create the exporter (see its `render()`), or a dict with any of
+            - port: serve /metrics over HTTP on this port (0 for any free port)
+            - host: the address to bind, 127.0.0.1 by default
+            - textfile: path of a .prom file to rewrite every textfile_interval seconds (15 by default)
+            - exporter: an existing PrometheusExporter to register with instead of a new one
+        :return: the exporter, or None if metrics are not enabled.
+        """
+        if not metrics:
+            return None
+        metrics_kwargs = dict(metrics) if isinstance(metrics, dict) else {}
+        if isinstance(self.logger, _EasyLoggerCustomLogger):
+            if self.logger.level_counters is None:
+                self.logger.level_counters = LevelCounters()
+            self.logger.level_counters.users += 1
+            self._level_counters = self.logger.level_counters
+        else:
+            self._internal_logger.warning("records per level are only counted by a %s, not by %s",
+                                          _EasyLoggerCustomLogger.__name__, self.logger.__class__.__name__)
+        exporter = metrics_kwargs.get('exporter', None) or PrometheusExporter()
+        exporter.register(self)
+        if metrics_kwargs.get('port', None) is not None:
+            exporter.start_http_server(metrics_kwargs.get('host', PrometheusExporter.DEFAULT_HOST),
+                                       metrics_kwargs['port'])
+            self._internal_logger.info("metrics served on %s", exporter.server_address)
+        if metrics_kwargs.get('textfile', None):
+            exporter.start_textfile_writer(metrics_kwargs['textfile'],
+                                           metrics_kwargs.get('textfile_interval',
+                                                              PrometheusExporter.DEFAULT_TEXTFILE_INTERVAL))
+            self._internal_logger.info("metrics written to %s", metrics_kwargs['textfile'])
+        return exporter
+
+    def _release_level_counters(self):
+        """Stop counting records on the (global) logger once no open EasyLogger uses the counters."""
+        counters, self._level_counters = self._level_counters, None
+        if counters is None:
+            return
+        counters.users -= 1
+        if counters.users <= 0 and self.logger.level_counters is counters:
+            self.logger.level_counters = None
+
+    def create_aggregates(self, aggregates: Optional[Union[dict, bool]] = None):
+        """
+        Configure this logger's count()/gauge() aggregation and start its background flusher now,
+        so the process stats and timing summaries are reported even before the first count().
+
+        :param aggregates: True for the defaults, or a dict with any of
+            - interval: seconds between `metrics ...` lines (60 by default)
+            - level: level of those lines (INFO by default, so they land in the INFO file)
+            - process_stats: if True, add the process RSS and gc collections per generation
+        :return: the logger's MetricAggregator, or None if not enabled.
+        """
+        if not aggregates:
+            return None
+        if not isinstance(self.logger, _EasyLoggerCustomLogger):
+            self._internal_logger.warning("count()/gauge() are only available on a %s, not on %s",
+                                          _EasyLoggerCustomLogger.__name__, self.logger.__class__.__name__)
+            return None
+        aggregates_kwargs = dict(aggregates) if isinstance(aggregates, dict) else {}
+        # restart with the new settings if count()/gauge() were already in use
+        self.logger.stop_aggregates()
+        if 'interval' in aggregates_kwargs:
+            self.logger.aggregate_interval = aggregates_kwargs['interval']
+        if 'level' in aggregates_kwargs:
+            self.logger.aggregate_level = logging._checkLevel(aggregates_kwargs['level'])
+        if 'process_stats' in aggregates_kwargs:
+            self.logger.aggregate_process_stats = aggregates_kwargs['process_stats']
+        self._internal_logger.info("aggregated metrics every %ss", self.logger.aggregate_interval)
+        return self.logger.aggregates
+
+    def create_watchdog(self, watchdog: Optional[Union[dict, bool]] = None) -> Optional[StallWatchdog]:
+        """
+        Start a StallWatchdog watching every handler this instance set up (and any added later
+        through create_other_handlers); its stack samples go to a file in log_location.
+        Heartbeats are only checked once `heartbeat()` has been called.
+
+        :param watchdog: True for the defaults, or a dict of StallWatchdog kwargs (heartbeat_timeout_ms,
+            emit_timeout_ms, check_interval_ms, min_sample_interval, max_stack_depth, stacks_file_name).
+        :return: the watchdog, or None if not enabled.
+        """
+        if not watchdog:
+            return None
+        watchdog_kwargs = dict(watchdog) if isinstance(watchdog, dict) else {}
+        stall_watchdog = StallWatchdog(self.log_location, **watchdog_kwargs)
+        for hnd in self._own_handlers():
+            stall_watchdog.watch_handler(hnd, default_handler_name(hnd))
+        self._internal_logger.info("watchdog will sample stacks to %s", stall_watchdog.stacks_path)
+        return stall_watchdog.start()
+
+    def heartbeat(self):
+        """Tell the watchdog (if any) the application is making progress, e.g. once per main loop iteration."""
+        if self.watchdog is not None:
+            self.watchdog.heartbeat()
+
+    def create_format_profiler(self, profile_formatting: bool = False) -> Optional[WastedFormatProfiler]:
+        """
+        Set a WastedFormatProfiler on the logger: calls whose message was already formatted
+        (f-strings, %, .format) but is dropped by the level or by every handler are counted per
+        call site. Read it with `format_profiler.format_report()`; it costs a caller frame lookup
+        per dropped message, so it's meant for profiling runs.
+
+        :return: the profiler, or None if not enabled.
+        """
+        if not profile_formatting:
+            return None
+        if not isinstance(self.logger, _EasyLoggerCustomLogger):
+            self._internal_logger.warning("message formatting is only profiled by a %s, not by %s",
+                                          _EasyLoggerCustomLogger.__name__, self.logger.__class__.__name__)
+            return None
+        if self.logger.format_profiler is None:
+            self.logger.format_profiler = WastedFormatProfiler()
+        self._internal_logger.info("profiling wasted message formatting")
+        return self.logger.format_profiler
+
+    def close(self):
+        """
+        Undo what this instance set up: remove and close the handlers it added to the logger
+        (plus the level file handlers behind a tail sampler), stop the retention manager, the
+        watchdog and the aggregated metrics and timing flushers (after a last flush), and unregister from the
+        metrics exporter (stopping it once nothing is registered). The logger stops counting
+        records per level once no open instance uses its counters.
+        Handlers that were on the logger before this instance was created are left alone.
+
+        The logger itself is global (logging.getLogger), so without close() every
+        EasyLogger created for the same logger name adds another set of handlers.
+        """
+        if isinstance(self.logger, _EasyLoggerCustomLogger):
+            # last flush while the file handlers are still attached, also when count()/gauge()
+            # started the flusher without the aggregates kwarg
+            self.logger.stop_aggregates()
+            self.logger.stop_timings()
+        own_handlers = self._own_handlers()
+        for hnd in own_handlers:
+            self.logger.removeHandler(hnd)
+            hnd.close()
+        if self.retention_manager is not None:
+            self.retention_manager.stop()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.unregister(self)
+            if not self.metrics_exporter.sources:
+                self.metrics_exporter.stop()
+        self._release_level_counters()
+        self._internal_logger.info("%s closed %s handler(s)", self.__class__.__name__, len(own_handlers))
+
     def post_handler_setup(self):
         """Finalize logger configuration after handlers are attached.
 
@@ -176,7 +518,7 @@ class EasyLogger(EasyLoggerInitializer):
         """
         # set the logger level back to DEBUG, so it handles all messages
         self.logger.setLevel(10)
-        self._internal_logger.info(f'logger level set back to {self.logger.level}')
+        self._internal_logger.info("logger level set back to %s", self.logger.level)
         self.logger.info(f"Starting {self.project_name} with the following handlers: "
                          f"{self._get_level_handler_string(self.logger.handlers)}")
         if not self._no_stream_color and NO_COLORIZER:
@@ -1,8 +1,27 @@
 """Convenience re-exports for logger handler/formatter/filter utilities."""
 from EasyLoggerAJM.logger_parts.handlers import (OutlookEmailHandler, StreamHandlerIgnoreExecInfo,
-                                                 BufferedRecordHandler, LastRecordHandler, HourlyRotatingFileHandler)
+                                                 BufferedRecordHandler, LastRecordHandler, HourlyRotatingFileHandler,
+                                                 SizeAndTimeRotatingFileHandler, GzipFileHandler, DurableFileHandler,
+                                                 MmapFileHandler, FlightRecorderHandler)
 from EasyLoggerAJM.logger_parts.formatters import ColorizedFormatter, NO_COLORIZER
 from EasyLoggerAJM.logger_parts.filters import ConsoleOneTimeFilter
+from EasyLoggerAJM.logger_parts.durability import FsyncPolicy
+from EasyLoggerAJM.logger_parts.ring_buffer import RecordRingBuffer
+from EasyLoggerAJM.logger_parts.record_snapshot import RecordSnapshot
+from EasyLoggerAJM.logger_parts.slotted_record import SlottedLogRecord
+from EasyLoggerAJM.logger_parts.tail_sampling import TailSamplingHandler, LOG_CONTEXT_ID
+from EasyLoggerAJM.logger_parts.instrumentation import (HandlerStats, LatencyHistogram, instrument_handler,
+                                                        get_handler_stats, default_handler_name)
+from EasyLoggerAJM.logger_parts.timing import Timed, TimingAggregator
+from EasyLoggerAJM.logger_parts.aggregates import MetricAggregator, PeriodicFlusher, ProcessStats
+from EasyLoggerAJM.logger_parts.format_profiler import WastedFormatProfiler
+from EasyLoggerAJM.logger_parts.lazy import Lazy, LazyMessage, lazy
+from EasyLoggerAJM.logger_parts.batching import handle_batch, supports_batches
 
 __all__ = ['OutlookEmailHandler', 'StreamHandlerIgnoreExecInfo', 'BufferedRecordHandler', 'LastRecordHandler',
-           'HourlyRotatingFileHandler', 'ColorizedFormatter', 'NO_COLORIZER', 'ConsoleOneTimeFilter']
\ No newline at end of file
+           'HourlyRotatingFileHandler', 'SizeAndTimeRotatingFileHandler', 'GzipFileHandler', 'DurableFileHandler',
+           'MmapFileHandler', 'FlightRecorderHandler', 'ColorizedFormatter', 'NO_COLORIZER', 'ConsoleOneTimeFilter', 'FsyncPolicy',
+           'RecordRingBuffer', 'RecordSnapshot', 'SlottedLogRecord', 'TailSamplingHandler', 'LOG_CONTEXT_ID',
+           'HandlerStats', 'LatencyHistogram', 'instrument_handler', 'get_handler_stats', 'default_handler_name',
+           'Timed', 'TimingAggregator', 'MetricAggregator', 'PeriodicFlusher', 'ProcessStats', 'WastedFormatProfiler',
+           'Lazy', 'LazyMessage', 'lazy', 'handle_batch', 'supports_batches']
\ No newline at end of file
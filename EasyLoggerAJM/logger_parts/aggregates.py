@@ -0,0 +1,151 @@
+import gc
+import os
+import sys
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Callable, Dict, Optional, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+Number = Union[int, float]
+
+
+class ProcessStats:
+    """
+    Resident memory and garbage collections, for the periodic metrics line.
+
+    rss_bytes is the current RSS where /proc is available, otherwise the peak RSS
+    (resource.getrusage) as max_rss_bytes; neither is reported on platforms with neither.
+    gc_gen<N> are the collections of generation N since the previous `collect()`.
+    """
+
+    def __init__(self):
+        self._last_collections = self._collections()
+
+    @staticmethod
+    def _collections():
+        return [generation['collections'] for generation in gc.get_stats()]
+
+    @staticmethod
+    def memory() -> Dict[str, int]:
+        try:
+            with open('/proc/self/statm') as statm:
+                return {'rss_bytes': int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')}
+        except (OSError, ValueError, IndexError, AttributeError):
+            pass
+        if resource is not None:
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # kilobytes on Linux, bytes on macOS
+            return {'max_rss_bytes': max_rss if sys.platform == 'darwin' else max_rss * 1024}
+        return {}
+
+    def collect(self) -> Dict[str, int]:
+        stats = self.memory()
+        collections = self._collections()
+        for generation, (now, before) in enumerate(zip(collections, self._last_collections)):
+            stats[f'gc_gen{generation}'] = now - before
+        self._last_collections = collections
+        return stats
+
+
+class PeriodicFlusher:
+    """Calls `flush` every `interval` (> 0) seconds on a daemon thread, and once more on `stop()`."""
+
+    def __init__(self, flush: Callable[[], None], interval: float = 60.0, name: Optional[str] = None):
+        if not interval > 0:
+            # wait(0) returns at once: the thread would spin
+            raise ValueError(f"interval must be greater than 0, not {interval}")
+        self.flush = flush
+        self.interval = interval
+        self.name = name or self.__class__.__name__
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.flush()
+
+    def start(self):
+        if not self.running:
+            self._stop_event.clear()
+            self._thread = Thread(target=self._run, daemon=True, name=self.name)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        self.flush()
+
+
+class IntervalClock:
+    """Seconds since the previous `lap()` (or since creation)."""
+    __slots__ = ('_last',)
+
+    def __init__(self):
+        self._last = monotonic()
+
+    def lap(self) -> float:
+        now = monotonic()
+        elapsed, self._last = now - self._last, now
+        return elapsed
+
+
+class MetricAggregator:
+    """
+    In-memory counters and gauges, reported once per interval instead of one log line per event.
+
+    - count(name, n): adds n to the counter; counters report what was added since the last
+      `take()` and start again from 0.
+    - gauge(name, value): sets the gauge; gauges report their latest value every interval.
+    - process_stats: also report the process RSS and gc collections (see ProcessStats).
+    """
+
+    def __init__(self, process_stats: bool = False):
+        self.process_stats: Optional[ProcessStats] = ProcessStats() if process_stats else None
+        self._lock = Lock()
+        self._counters: Dict[str, Number] = {}
+        self._gauges: Dict[str, Number] = {}
+        self._clock = IntervalClock()
+
+    def count(self, name: str, n: Number = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: Number):
+        with self._lock:
+            self._gauges[name] = value
+
+    def take(self) -> dict:
+        """
+        Snapshot of the interval that just ended and reset the counters:
+        {'interval': seconds, 'counters': {...}, 'gauges': {...}, 'process': {...}}
+        """
+        with self._lock:
+            counters, self._counters = self._counters, {}
+            gauges = dict(self._gauges)
+            interval = self._clock.lap()
+        process = self.process_stats.collect() if self.process_stats is not None else {}
+        return {'interval': interval, 'counters': counters, 'gauges': gauges, 'process': process}
+
+
+def format_metrics_line(snapshot: dict) -> str:
+    """
+    One logfmt line for a MetricAggregator snapshot:
+    `metrics interval=60.0s <counter>=<n> ... <gauge>=<value> ... <process stat>=<n> ...`
+    """
+    fields = [f"interval={snapshot['interval']:.1f}s"]
+    for values in (snapshot['counters'], snapshot['gauges'], snapshot['process']):
+        fields.extend(f"{name}={value:g}" if isinstance(value, float) else f"{name}={value}"
+                      for name, value in sorted(values.items()))
+    return 'metrics ' + ' '.join(fields)
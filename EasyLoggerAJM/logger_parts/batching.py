@@ -0,0 +1,101 @@
+from logging import FileHandler, Handler, LogRecord, StreamHandler
+from typing import List, Sequence
+
+# emit()s whose batched equivalent is _stream_handle_batch (subclasses that override emit,
+# e.g. the rotating handlers, need their emit per record)
+_BATCHABLE_EMITS = (StreamHandler.emit, FileHandler.emit)
+
+
+def _filter_records(handler: Handler, records: Sequence[LogRecord]) -> List[LogRecord]:
+    """Handler.filter for each record; like Handler.handle, a filter may return a replacement record."""
+    kept = []
+    for record in records:
+        rv = handler.filter(record)
+        if rv:
+            kept.append(rv if isinstance(rv, LogRecord) else record)
+    return kept
+
+
+def _open_delayed_stream(handler: StreamHandler) -> bool:
+    """Whether `handler` has a stream to write to, opening it first like FileHandler.emit with delay=True."""
+    if isinstance(handler, FileHandler) and handler.stream is None:
+        # Handler._closed only exists from Python 3.10
+        if handler.mode != 'w' or not getattr(handler, '_closed', False):
+            handler.stream = handler._open()
+    return bool(handler.stream)
+
+
+def stream_emit(handler: StreamHandler, record: LogRecord) -> int:
+    """
+    StreamHandler.emit/FileHandler.emit (for a handler whose emit is one of _BATCHABLE_EMITS),
+    returning the length of the text written, 0 if nothing was. Called under the handler's lock.
+    """
+    if not _open_delayed_stream(handler):
+        return 0
+    try:
+        text = handler.format(record) + handler.terminator
+        handler.stream.write(text)
+        handler.flush()
+        return len(text)
+    except RecursionError:
+        raise
+    except Exception:
+        handler.handleError(record)
+        return 0
+
+
+def _stream_handle_batch(handler: StreamHandler, records: Sequence[LogRecord]) -> int:
+    """Format the records and write them with one write() and one flush(), under one lock acquisition."""
+    records = _filter_records(handler, records)
+    if not records:
+        return 0
+    handler.acquire()
+    try:
+        if not _open_delayed_stream(handler):
+            return 0
+        terminator = handler.terminator
+        parts = []
+        for record in records:
+            try:
+                parts.append(handler.format(record) + terminator)
+            except RecursionError:
+                raise
+            except Exception:
+                handler.handleError(record)
+        try:
+            handler.stream.write(''.join(parts))
+            handler.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            handler.handleError(records[-1])
+    finally:
+        handler.release()
+    return len(records)
+
+
+def supports_batches(handler: Handler) -> bool:
+    """Whether handle_batch() can pass `handler` a whole batch rather than one record at a time."""
+    if getattr(handler, 'handle_batch', None) is not None:
+        return True
+    # instance level wrappers (instrumentation, watchdog) must see every record, so only
+    # unwrapped StreamHandler/FileHandler emit and handle are batched
+    return (getattr(handler.emit, '__func__', None) in _BATCHABLE_EMITS
+            and getattr(handler.handle, '__func__', None) is Handler.handle)
+
+
+def handle_batch(handler: Handler, records: Sequence[LogRecord]) -> int:
+    """
+    Pass `records` to `handler` as one batch and return how many it kept (after its filters):
+
+    - a handler with a `handle_batch(records)` method gets the whole batch,
+    - a plain StreamHandler/FileHandler gets the records formatted and written with one write()
+      and one flush(), taking its lock once,
+    - any other handler gets `handle(record)` per record.
+    """
+    batch = getattr(handler, 'handle_batch', None)
+    if batch is not None:
+        return batch(records)
+    if supports_batches(handler):
+        return _stream_handle_batch(handler, records)
+    return sum(1 for record in records if handler.handle(record))
@@ -0,0 +1,85 @@
+import logging
+from time import monotonic
+from typing import Union
+
+
+class FsyncPolicy:
+    """
+    Decides when a file handler should fsync its file, i.e. when a record must be on disk
+    and not only in the OS page cache.
+
+    Modes:
+        - 'never': never fsync (the default, same as a plain FileHandler).
+        - 'always': fsync after every record.
+        - 'batch': fsync after every `batch_size` records.
+        - 'interval': fsync after a record once `interval` seconds have passed since the last fsync.
+        - 'error': fsync after any record at or above `error_level` (ERROR by default).
+
+    Handlers that support a policy (see `_DurableHandlerMixin`) call `should_sync(record)`
+    after writing each record and fsync when it returns True. A handler with any policy
+    other than 'never' also fsyncs when it is closed.
+    """
+    NEVER = 'never'
+    ALWAYS = 'always'
+    BATCH = 'batch'
+    INTERVAL = 'interval'
+    ERROR = 'error'
+    VALID_MODES = [NEVER, ALWAYS, BATCH, INTERVAL, ERROR]
+
+    def __init__(self, mode: str = NEVER, batch_size: int = 100, interval: float = 1.0,
+                 error_level: Union[int, str] = logging.ERROR):
+        mode = mode.lower()
+        if mode not in self.__class__.VALID_MODES:
+            raise ValueError(f"fsync policy mode must be one of {self.__class__.VALID_MODES}, not {mode}")
+        self.mode = mode
+        self.batch_size = batch_size
+        self.interval = interval
+        self.error_level = error_level if isinstance(error_level, int) else logging.getLevelName(error_level.upper())
+        self._unsynced = 0
+        self._last_sync = monotonic()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(mode={self.mode!r})"
+
+    def copy(self) -> 'FsyncPolicy':
+        """Return a policy with the same settings and its own (reset) counters."""
+        return self.__class__(self.mode, batch_size=self.batch_size, interval=self.interval,
+                              error_level=self.error_level)
+
+    @classmethod
+    def from_value(cls, value: Union[str, 'FsyncPolicy', None]) -> 'FsyncPolicy':
+        """
+        Return a policy for a mode string, an existing policy, or None ('never').
+
+        An existing policy is copied: the counters are per handler, so several handlers
+        given the same policy must not share them.
+        """
+        if isinstance(value, cls):
+            return value.copy()
+        if value is None:
+            return cls()
+        if isinstance(value, str):
+            return cls(value)
+        raise TypeError(f"fsync policy must be a string or an instance of {cls.__name__}, not {type(value)}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != self.__class__.NEVER
+
+    def should_sync(self, record) -> bool:
+        """Return True if the handler should fsync after writing `record`."""
+        if self.mode == self.__class__.NEVER:
+            return False
+        self._unsynced += 1
+        if self.mode == self.__class__.ALWAYS:
+            return True
+        if self.mode == self.__class__.BATCH:
+            return self._unsynced >= self.batch_size
+        if self.mode == self.__class__.INTERVAL:
+            return monotonic() - self._last_sync >= self.interval
+        return record.levelno >= self.error_level
+
+    def synced(self):
+        """Reset the counters, called by the handler after each fsync."""
+        self._unsynced = 0
+        self._last_sync = monotonic()
@@ -1,20 +1,40 @@
+from collections import OrderedDict
 from logging import Filter
 
+from EasyLoggerAJM.logger_parts.lazy import LazyMessage
+
 
 class ConsoleOneTimeFilter(Filter):
     """
     ConsoleOneTimeFilter class filters log messages to only allow them to be logged once.
     :param logging.Filter: A class representing a log filter.
     :param name: A string indicating the name of the filter.
-    :ivar logged_messages: A set to store logged messages.
+    :param max_messages: How many distinct messages to remember (None for no limit). Once full,
+        the least recently seen message is forgotten, and would be logged again if it came back.
+    :ivar logged_messages: The remembered messages (an insertion ordered mapping). Messages logged
+        with lazy parts are remembered by their rendered text.
     """
-    def __init__(self, name="ConsoleWarnOneTime"):
+    DEFAULT_MAX_MESSAGES = 10000
+
+    def __init__(self, name="ConsoleWarnOneTime", max_messages=DEFAULT_MAX_MESSAGES):
         super().__init__(name)
-        self.logged_messages = set()
+        self.max_messages = max_messages
+        self.logged_messages = OrderedDict()
 
     def filter(self, record):
+        msg = record.msg
+        if isinstance(msg, LazyMessage):
+            # don't keep the deferred payload alive in the cache
+            try:
+                msg = str(msg)
+            except Exception:
+                # filters run outside Handler.handleError: let the handler report the error
+                return True
         # We only log the message if it has not been logged before
-        if record.msg not in self.logged_messages:
-            self.logged_messages.add(record.msg)
+        if msg not in self.logged_messages:
+            self.logged_messages[msg] = None
+            if self.max_messages is not None and len(self.logged_messages) > self.max_messages:
+                self.logged_messages.popitem(last=False)
             return True
+        self.logged_messages.move_to_end(msg)
         return False
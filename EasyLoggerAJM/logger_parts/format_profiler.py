@@ -0,0 +1,100 @@
+from threading import Lock
+from timeit import timeit
+from typing import Dict, List, Optional, Tuple
+
+
+class _CallSiteWaste:
+    """Wasted messages of a single call site."""
+    __slots__ = ('filename', 'lineno', 'function', 'dropped_by_level', 'dropped_by_handlers', 'chars')
+
+    def __init__(self, filename: str, lineno: int, function: str):
+        self.filename = filename
+        self.lineno = lineno
+        self.function = function
+        self.dropped_by_level = 0
+        self.dropped_by_handlers = 0
+        self.chars = 0
+
+
+class WastedFormatProfiler:
+    """
+    Collects the call sites whose message was formatted before the logging call
+    (`logger.debug(f"... {expensive!r}")`, `'%s' % x`, `.format()`, ...) and then dropped,
+    either by the logger level or because no handler's level accepts the record.
+
+    _EasyLoggerCustomLogger reports a message here when it has no args, is not a string
+    literal of the calling code and would not be emitted (see its `format_profiler`).
+    The time wasted building each message is estimated from its length with a cost per
+    message and per character measured once per process (`calibrate()`): the real cost of
+    the expressions inside the f-string is not known, so treat it as a ranking aid.
+
+    report(top) / format_report(top) list the top offenders by estimated wasted time.
+    """
+    REPORT_HEADER = 'wasted message formatting, top {top} of {sites} call site(s):'
+    REPORT_LINE = ('{estimated_wasted_ms:10.3f} ms {count:>9} msg(s) (level {dropped_by_level}, '
+                   'handlers {dropped_by_handlers}, avg {avg_chars:.0f} chars)  {site}')
+
+    # (ns per message, ns per character), see calibrate()
+    _cost_model: Optional[Tuple[float, float]] = None
+
+    def __init__(self):
+        self._lock = Lock()
+        self._sites: Dict[Tuple[str, int], _CallSiteWaste] = {}
+
+    @classmethod
+    def calibrate(cls, number: int = 2000) -> Tuple[float, float]:
+        """Measure (ns per message, ns per character) of building an f-string with a repr()."""
+        short_list, long_list = list(range(4)), list(range(400))
+        short_len, long_len = len(f"items: {short_list!r}"), len(f"items: {long_list!r}")
+        short_ns = timeit(lambda: f"items: {short_list!r}", number=number) / number * 1e9
+        long_ns = timeit(lambda: f"items: {long_list!r}", number=number) / number * 1e9
+        per_char = max((long_ns - short_ns) / (long_len - short_len), 0.0)
+        cls._cost_model = (max(short_ns - per_char * short_len, 0.0), per_char)
+        return cls._cost_model
+
+    def estimate_ns(self, messages: int, chars: int) -> float:
+        if self.__class__._cost_model is None:
+            self.__class__.calibrate()
+        per_message, per_char = self.__class__._cost_model
+        return messages * per_message + chars * per_char
+
+    def record(self, filename: str, lineno: int, function: str, length: int, by_level: bool):
+        """Count one formatted message from filename:lineno dropped by the level (or by the handlers)."""
+        key = (filename, lineno)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = _CallSiteWaste(filename, lineno, function)
+            if by_level:
+                site.dropped_by_level += 1
+            else:
+                site.dropped_by_handlers += 1
+            site.chars += length
+
+    def reset(self):
+        with self._lock:
+            self._sites.clear()
+
+    def report(self, top: Optional[int] = 10) -> List[dict]:
+        """The `top` call sites (all with None) by estimated wasted time, most wasteful first."""
+        with self._lock:
+            sites = list(self._sites.values())
+            counts = [(site, site.dropped_by_level, site.dropped_by_handlers, site.chars) for site in sites]
+        rows = []
+        for site, by_level, by_handlers, chars in counts:
+            count = by_level + by_handlers
+            rows.append({'site': f"{site.filename}:{site.lineno} ({site.function})",
+                         'count': count, 'dropped_by_level': by_level, 'dropped_by_handlers': by_handlers,
+                         'avg_chars': chars / count,
+                         'estimated_wasted_ns': self.estimate_ns(count, chars)})
+        rows.sort(key=lambda row: row['estimated_wasted_ns'], reverse=True)
+        return rows[:top] if top is not None else rows
+
+    def format_report(self, top: Optional[int] = 10) -> str:
+        rows = self.report(top)
+        with self._lock:
+            sites = len(self._sites)
+        lines = [self.__class__.REPORT_HEADER.format(top=len(rows), sites=sites)]
+        lines.extend(self.__class__.REPORT_LINE.format(estimated_wasted_ms=row['estimated_wasted_ns'] / 1e6, **row)
+                     for row in rows)
+        return '\n'.join(lines)
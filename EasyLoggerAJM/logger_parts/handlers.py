@@ -1,13 +1,26 @@
+import gzip
+import mmap
+import os
+import re
+import zlib
 from collections import deque
-from logging import Handler, StreamHandler
-from logging.handlers import TimedRotatingFileHandler
+from locale import getpreferredencoding
+from logging import Handler, StreamHandler, FileHandler, LogRecord, getLevelName, ERROR
+from logging.handlers import TimedRotatingFileHandler, BaseRotatingHandler
 from pathlib import Path
+from queue import SimpleQueue
 from shutil import rmtree, copytree
-from sys import stderr
-from typing import Optional, Union
+from sys import stderr, version_info
+from threading import Lock, Thread, Timer
+from time import time, perf_counter_ns, monotonic, strftime, localtime
+from typing import Dict, List, Optional, Union
+from weakref import WeakSet
 from zipfile import ZipFile
 
 from EasyLoggerAJM.backend import InvalidEmailMsgType, LogFilePrepError
+from EasyLoggerAJM.logger_parts.durability import FsyncPolicy
+from EasyLoggerAJM.logger_parts.ring_buffer import RecordRingBuffer
+from EasyLoggerAJM.logger_parts.record_snapshot import RecordSnapshot, detach_traceback
 
 
 class _BaseCustomEmailHandler(Handler):
@@ -227,52 +240,240 @@ class StreamHandlerIgnoreExecInfo(StreamHandler):
 
 
 class BufferedRecordHandler(Handler):
-    """Handler that stores the last N log records."""
+    """
+    Handler that stores the last N log records.
+
+    Records are kept in a RecordRingBuffer together with their formatted message, so each
+    record is formatted once, when it is emitted, no matter how often it is read back.
+    The buffer holds compact RecordSnapshot objects, not the LogRecords themselves, so
+    args and exception tracebacks are not kept alive by the buffer.
+
+    With format_on_emit=False the formatting is deferred: records are stored unformatted
+    and only formatted when they are read back, which is cheaper when most records are never read.
+    The buffer then keeps the LogRecords (lazy messages stay unrendered until read), a record
+    with exc_info as a copy with its traceback rendered to text (see detach_traceback).
+    """
 
-    def __init__(self, buffer_size=10):
+    def __init__(self, buffer_size=10, format_on_emit: bool = True):
         super().__init__()
-        self.buffer = deque(maxlen=buffer_size)
+        self.format_on_emit = format_on_emit
+        self.buffer = RecordRingBuffer(buffer_size, renderer=None if format_on_emit else self.format)
 
     def emit(self, record):
-        """Store the record in the buffer."""
-        self.buffer.append(record)
+        """Format the record once and store a snapshot of it (unless format_on_emit is False) in the buffer."""
+        try:
+            if self.format_on_emit:
+                message = self.format(record)
+                # format() has rendered the traceback text to exc_text, the snapshot reuses it
+                self.buffer.append(RecordSnapshot.from_record(record), message)
+            else:
+                self.buffer.append(detach_traceback(record), None)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
     def get_last_message(self):
         """Get the most recent message."""
-        if self.buffer:
-            return self.format(self.buffer[-1])
+        messages = self.buffer.newest(1)
+        if messages:
+            return messages[0]
         return None
 
     def get_all_messages(self):
         """Get all buffered messages."""
-        return [self.format(record) for record in self.buffer]
+        return self.buffer.newest()
 
     def get_last_n_messages(self, n):
         """Get the last N messages."""
-        records = list(self.buffer)[-n:]
-        return [self.format(record) for record in records]
+        return self.buffer.newest(n)
+
+    def get_messages_by_level(self, level: Union[int, str], n: Optional[int] = None):
+        """Get the last N messages (all if n is None) logged at exactly `level`."""
+        if isinstance(level, str):
+            level = getLevelName(level.upper())
+        return self.buffer.by_level(level, n)
+
+    def get_messages_between(self, start: Optional[float] = None, end: Optional[float] = None):
+        """Get the messages of records created between `start` and `end` (epoch seconds, inclusive)."""
+        return self.buffer.between(start, end)
+
+
+class FlightRecorderHandler(BufferedRecordHandler):
+    """
+    In-memory flight recorder: keeps the last N records (DEBUG and up by default) and
+    writes them to a crash file when something goes wrong.
+
+    Records are stored unformatted (see BufferedRecordHandler's format_on_emit) so keeping
+    DEBUG context costs a buffer slot per record and no I/O; messages, lazy ones included,
+    are only rendered when they are dumped. The buffer is dumped to
+    `<crash_dir>/<crash_file_name>`:
+        - when a record at or above `dump_level` (ERROR by default) is handled,
+        - when `dump()` is called, e.g. by UncaughtExceptionHook.show_exception_and_exit
+          through `FlightRecorderHandler.dump_all()`.
+
+    Each dump is appended to the crash file with a header and contains only the records
+    handled since the previous dump, so repeated errors don't repeat the same context.
+    The dump is written directly to the crash file, never through the logger.
+    """
+    DEFAULT_CRASH_FILE_NAME = 'flight_recorder_crash.log'
+    DUMP_HEADER = '===== flight recorder dump ({reason}) at {timestamp}: {count} record(s) =====\n'
+
+    # every open recorder, so dump_all() can reach them from an exception hook
+    _instances = WeakSet()
+
+    def __init__(self, crash_dir: Union[str, Path], buffer_size: int = 1000,
+                 dump_level: Union[int, str] = ERROR, crash_file_name: Optional[str] = None,
+                 encoding: str = 'utf-8'):
+        super().__init__(buffer_size=buffer_size, format_on_emit=False)
+        self.crash_path = Path(crash_dir, crash_file_name or self.__class__.DEFAULT_CRASH_FILE_NAME)
+        self.dump_level = dump_level if isinstance(dump_level, int) else getLevelName(dump_level.upper())
+        self.encoding = encoding
+        self.dump_count = 0
+        self._undumped = 0
+        self.__class__._instances.add(self)
+
+    def emit(self, record):
+        """Store the record and dump the buffer if the record is at or above dump_level."""
+        super().emit(record)
+        self._undumped += 1
+        if record.levelno >= self.dump_level:
+            self.dump(reason=f'{record.levelname} record from {record.name}')
+
+    def dump(self, reason: str = 'manual dump') -> Optional[Path]:
+        """
+        Append the records handled since the last dump to the crash file.
+
+        :return: the crash file path, or None if there was nothing new to write.
+        """
+        with self.lock:
+            if not self._undumped:
+                return None
+            messages = self.buffer.newest(self._undumped)
+            self._undumped = 0
+            try:
+                self.crash_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.crash_path, 'a', encoding=self.encoding) as f:
+                    f.write(self.__class__.DUMP_HEADER.format(reason=reason, count=len(messages),
+                                                             timestamp=strftime('%Y-%m-%d %H:%M:%S', localtime())))
+                    f.write('\n'.join(messages) + '\n')
+            except OSError as e:
+                print(f"could not write flight recorder dump to {self.crash_path}: {e}", file=stderr)
+                return None
+            self.dump_count += 1
+            return self.crash_path
+
+    @classmethod
+    def dump_all(cls, reason: str = 'manual dump') -> list:
+        """Dump every open FlightRecorderHandler, returning the crash files that were written."""
+        return [path for path in (recorder.dump(reason) for recorder in list(cls._instances)) if path]
+
+    def close(self):
+        self.__class__._instances.discard(self)
+        super().close()
+
+
+class _LastRecordSlot:
+    """
+    One LastRecordHandler slot: a record, its sequence number and its rendered message,
+    which is only formatted the first time it is asked for (and again if the handler's
+    formatter has changed since).
+    """
+    __slots__ = ('record', 'seq', '_message', '_formatter')
+
+    def __init__(self, record: LogRecord, seq: int):
+        self.record = record
+        self.seq = seq
+        self._message = None
+        self._formatter = None
+
+    def message(self, handler: Handler) -> str:
+        formatter = handler.formatter
+        if self._message is None or self._formatter is not formatter:
+            self._message = handler.format(self.record)
+            self._formatter = formatter
+        return self._message
 
 
 class LastRecordHandler(Handler):
-    """Handler that stores the last log record."""
+    """
+    Handler that stores the last log record, the last record at each level and the last
+    record from each logger name. A record with exc_info is stored as a copy with its
+    traceback rendered to text (see detach_traceback).
 
-    def __init__(self):
+    Every lookup is a dict access, no scanning. The three views share one slot per record,
+    so a record's message is rendered at most once, on first read. `count` and
+    `level_counts` only ever go up; each slot's `seq` is the value of `count` when the
+    record was stored, so slots can be compared to see which is newer.
+
+    The per-logger slots and `logger_counts` are kept for at most `max_loggers` logger
+    names: when a new name would go over, the name that logged least recently is dropped
+    from both.
+    """
+    DEFAULT_MAX_LOGGERS = 1000
+
+    def __init__(self, max_loggers: int = DEFAULT_MAX_LOGGERS):
         super().__init__()
-        self.last_record = None
+        self.max_loggers = max_loggers
+        self.last_record: Optional[LogRecord] = None
+        self._last: Optional[_LastRecordSlot] = None
+        self._by_level: Dict[int, _LastRecordSlot] = {}
+        self._by_logger: Dict[str, _LastRecordSlot] = {}
+        self.count = 0
+        self.level_counts: Dict[int, int] = {}
+        self.logger_counts: Dict[str, int] = {}
 
     def emit(self, record):
         """Store the record without actually logging it anywhere."""
+        self.count += 1
+        record = detach_traceback(record)
+        slot = _LastRecordSlot(record, self.count)
         self.last_record = record
+        self._last = slot
+        self._by_level[record.levelno] = slot
+        self.level_counts[record.levelno] = self.level_counts.get(record.levelno, 0) + 1
+        name = record.name
+        by_logger = self._by_logger
+        # re-inserted, so the dict is ordered from least to most recently logging name
+        by_logger.pop(name, None)
+        by_logger[name] = slot
+        self.logger_counts[name] = self.logger_counts.get(name, 0) + 1
+        if len(by_logger) > self.max_loggers:
+            evicted = next(iter(by_logger))
+            del by_logger[evicted]
+            del self.logger_counts[evicted]
 
-    def get_last_message(self):
-        """Get the last logged message."""
-        if self.last_record:
-            return self.format(self.last_record)
+    def _get_slot(self, level: Union[int, str, None] = None,
+                  logger_name: Optional[str] = None) -> Optional[_LastRecordSlot]:
+        if level is not None and logger_name is not None:
+            raise ValueError("pass either level or logger_name, not both")
+        if level is not None:
+            if isinstance(level, str):
+                level = getLevelName(level.upper())
+            return self._by_level.get(level)
+        if logger_name is not None:
+            return self._by_logger.get(logger_name)
+        return self._last
+
+    def get_last_message(self, level: Union[int, str, None] = None, logger_name: Optional[str] = None):
+        """Get the last logged message, optionally the last one at exactly `level` or from `logger_name`."""
+        slot = self._get_slot(level, logger_name)
+        if slot:
+            with self.lock:
+                return slot.message(self)
         return None
 
-    def get_last_record(self):
-        """Get the last LogRecord object."""
-        return self.last_record
+    def get_last_record(self, level: Union[int, str, None] = None, logger_name: Optional[str] = None):
+        """Get the last LogRecord object, optionally the last one at `level` or from `logger_name`."""
+        slot = self._get_slot(level, logger_name)
+        return slot.record if slot else None
+
+    def get_counts(self) -> dict:
+        """Get a copy of the counters: {'total': int, 'levels': {levelname: int}, 'loggers': {name: int}}."""
+        with self.lock:
+            return {'total': self.count,
+                    'levels': {getLevelName(levelno): n for levelno, n in self.level_counts.items()},
+                    'loggers': dict(self.logger_counts)}
 
 
 class HourlyRotatingFileHandler(TimedRotatingFileHandler):
@@ -282,4 +483,597 @@ class HourlyRotatingFileHandler(TimedRotatingFileHandler):
         self.backupCount = backupCount
         super().__init__(filename, when=self.when,
                          interval=self.interval,
-                         backupCount=self.backupCount)
\ No newline at end of file
+                         backupCount=self.backupCount)
+
+
+def _errors_kwarg(errors: Optional[str]) -> dict:
+    """
+    The `errors` keyword for FileHandler/BaseRotatingHandler.__init__, which only take it from
+    Python 3.9 - the handlers below keep `self.errors` themselves so it is set on 3.8 too.
+    """
+    return {'errors': errors} if version_info >= (3, 9) else {}
+
+
+class _DurableHandlerMixin:
+    """
+    Adds an optional FsyncPolicy to a file based handler.
+
+    Subclasses call `_apply_durability_policy(record)` after writing each record,
+    and `_sync_on_close()` before closing their stream.
+    """
+    durability_policy: Optional[FsyncPolicy] = None
+    # FileHandler only sets these from Python 3.9/3.10
+    errors: Optional[str] = None
+    _builtin_open = staticmethod(open)
+
+    def _stream_fileno(self) -> int:
+        return self.stream.fileno()
+
+    def sync(self):
+        """Flush the handler and fsync its current file."""
+        self.acquire()
+        try:
+            if self.stream is not None:
+                self.flush()
+                os.fsync(self._stream_fileno())
+            if self.durability_policy is not None:
+                self.durability_policy.synced()
+        finally:
+            self.release()
+
+    def _apply_durability_policy(self, record):
+        if self.durability_policy is not None and self.durability_policy.should_sync(record):
+            self.sync()
+
+    def _sync_on_close(self):
+        if self.durability_policy is not None and self.durability_policy.enabled and self.stream is not None:
+            try:
+                self.sync()
+            except (OSError, ValueError) as e:
+                stderr.write(f"{self.__class__.__name__} could not fsync on close: {e}\n")
+
+
+class DurableFileHandler(_DurableHandlerMixin, FileHandler):
+    """A FileHandler that fsyncs according to its `durability_policy` (see FsyncPolicy)."""
+    def __init__(self, filename, mode='a', encoding=None, delay=False, errors=None,
+                 durability_policy: Union[str, FsyncPolicy, None] = None, **kwargs):
+        super().__init__(filename, mode=mode, encoding=encoding, delay=delay, **_errors_kwarg(errors))
+        self.errors = errors
+        self.durability_policy = FsyncPolicy.from_value(durability_policy)
+
+    def emit(self, record):
+        super().emit(record)
+        try:
+            self._apply_durability_policy(record)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self._sync_on_close()
+        super().close()
+
+
+def _existing_segment_indexes(base_filename: str) -> List[int]:
+    """The indexes of the <stem>.<n><suffix> segments of `base_filename` on disk (0 is the file itself), in order."""
+    base = Path(base_filename)
+    pattern = re.compile(rf"{re.escape(base.stem)}\.(\d+){re.escape(base.suffix)}")
+    names = os.listdir(base.parent) if base.parent.is_dir() else []
+    indexes = sorted(int(match.group(1)) for match in map(pattern.fullmatch, names) if match)
+    if base.exists():
+        indexes.insert(0, 0)
+    return indexes
+
+
+class SizeAndTimeRotatingFileHandler(_DurableHandlerMixin, BaseRotatingHandler):
+    """
+    A rotating file handler that rolls over on whichever comes first: the
+    current segment reaching `maxBytes`, or `interval` units of `when` elapsing.
+
+    Rather than renaming the active file (close, rename, open), every segment
+    keeps its own name: the first segment is `filename` itself and the
+    following ones are `<stem>.<n><suffix>` (e.g. DEBUG-proj-ts.1.log). Once
+    the current segment is half way to its rollover, the next one is opened
+    ahead of time on a background worker, so the rollover in the logging
+    thread is only a stream swap. Closing the old stream and pruning segments
+    beyond `backupCount` also happen on the worker.
+
+    Segments left by an earlier run are picked up on open: writing continues
+    in the last of them and they count towards `backupCount`. `maxBytes` is
+    compared with the encoded size of the segment.
+
+    Rollover latency is recorded and can be read with `stats()`.
+    """
+    WHEN_TO_SECONDS = {'S': 1, 'M': 60, 'H': 60 * 60, 'D': 60 * 60 * 24}
+    _STOP_WORKER = object()
+
+    def __init__(self, filename, maxBytes=50 * 1024 * 1024, when='H', interval=1, backupCount=0,
+                 encoding=None, delay=False, errors=None,
+                 durability_policy: Union[str, FsyncPolicy, None] = None, **kwargs):
+        if when.upper() not in self.__class__.WHEN_TO_SECONDS:
+            raise ValueError(f"when must be one of {list(self.__class__.WHEN_TO_SECONDS)}, not {when}")
+        self.maxBytes = maxBytes
+        self.when = when.upper()
+        self.interval = interval
+        self.backupCount = backupCount
+        self._interval_seconds = self.__class__.WHEN_TO_SECONDS[self.when] * interval
+
+        # the stream is opened below, once the segment to continue in is known
+        super().__init__(filename, 'a', encoding=encoding, delay=True, **_errors_kwarg(errors))
+        self.errors = errors
+        self.delay = delay
+        self.durability_policy = FsyncPolicy.from_value(durability_policy)
+        # self.encoding is None or 'locale' (3.10+) for the locale encoding
+        self._byte_encoding = (self.encoding if self.encoding not in (None, 'locale')
+                               else getpreferredencoding(False))
+
+        indexes = self.existing_segment_indexes()
+        self._segment_index = indexes[-1] if indexes else 0
+        current = self.segment_filename(self._segment_index)
+        self._segment_bytes = os.path.getsize(current) if os.path.exists(current) else 0
+        self._finished_segments = deque(self.segment_filename(index) for index in indexes[:-1])
+        self._rollover_at = self.compute_rollover(time())
+        self._preopen_bytes = self.maxBytes // 2
+        self._preopen_at = self._rollover_at - self._interval_seconds / 2
+        self._preopen_scheduled = False
+
+        self._next_lock = Lock()
+        self._next_stream = None
+        self._next_index = None
+        self._tasks = SimpleQueue()
+        self._worker = None
+
+        self._rollover_count = 0
+        self._preopen_hits = 0
+        self._preopen_misses = 0
+        self._last_rollover_ns = 0
+        self._max_rollover_ns = 0
+        self._total_rollover_ns = 0
+
+        self._prune()
+        if not delay:
+            self.stream = self._open()
+
+    def compute_rollover(self, current_time: float) -> float:
+        """Return the epoch time at which the current segment should roll over on time."""
+        return current_time + self._interval_seconds
+
+    def existing_segment_indexes(self) -> List[int]:
+        """Return the indexes of the segments already on disk (0 is the base filename), in order."""
+        return _existing_segment_indexes(self.baseFilename)
+
+    def segment_filename(self, index: int) -> str:
+        """Return the file name used for segment `index` (0 is the base filename)."""
+        if index == 0:
+            return self.baseFilename
+        base = Path(self.baseFilename)
+        return self.rotation_filename(str(base.with_name(f"{base.stem}.{index}{base.suffix}")))
+
+    def _open_segment(self, index: int):
+        return self._builtin_open(self.segment_filename(index), self.mode,
+                                  encoding=self.encoding, errors=self.errors)
+
+    def _open(self):
+        return self._open_segment(self._segment_index)
+
+    # background worker
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = Thread(target=self._run_worker, daemon=True,
+                                  name=f"{self.__class__.__name__}-worker")
+            self._worker.start()
+
+    def _run_worker(self):
+        while True:
+            task = self._tasks.get()
+            if task is self.__class__._STOP_WORKER:
+                return
+            try:
+                task()
+            except Exception as e:
+                stderr.write(f"{self.__class__.__name__} background task failed: {e}\n")
+
+    def _submit(self, task):
+        self._ensure_worker()
+        self._tasks.put(task)
+
+    def _preopen_next(self, index: int):
+        if index <= self._segment_index:
+            # a synchronous rollover already moved past this segment
+            return
+        stream = self._open_segment(index)
+        with self._next_lock:
+            if self._next_stream is None:
+                self._next_stream, self._next_index = stream, index
+                return
+        stream.close()
+
+    def _schedule_preopen(self):
+        self._preopen_scheduled = True
+        index = self._segment_index + 1
+        self._submit(lambda: self._preopen_next(index))
+
+    def _preopen_due(self, record) -> bool:
+        return ((0 < self._preopen_bytes <= self._segment_bytes)
+                or record.created >= self._preopen_at)
+
+    def _prune(self):
+        while 0 < self.backupCount < len(self._finished_segments):
+            Path(self._finished_segments.popleft()).unlink(missing_ok=True)
+
+    def _close_and_prune(self, old_stream):
+        if old_stream is not None:
+            old_stream.close()
+        self._prune()
+
+    # rotation
+    def shouldRollover(self, record) -> bool:
+        """Roll over once the segment is full or the rollover time has passed."""
+        if 0 < self.maxBytes <= self._segment_bytes:
+            return True
+        return record.created >= self._rollover_at
+
+    def _take_next_stream(self, index: int):
+        with self._next_lock:
+            stream, next_index = self._next_stream, self._next_index
+            self._next_stream, self._next_index = None, None
+        if stream is not None and next_index == index:
+            self._preopen_hits += 1
+            return stream
+        if stream is not None:
+            stream.close()
+        self._preopen_misses += 1
+        return self._open_segment(index)
+
+    def doRollover(self):
+        """Swap to the pre-opened next segment and hand the old stream to the worker."""
+        start = perf_counter_ns()
+        old_stream = self.stream
+        self._finished_segments.append(self.segment_filename(self._segment_index))
+        self._segment_index += 1
+        self.stream = self._take_next_stream(self._segment_index)
+        self._segment_bytes = 0
+        self._rollover_at = self.compute_rollover(time())
+        self._preopen_at = self._rollover_at - self._interval_seconds / 2
+        self._preopen_scheduled = False
+        self._submit(lambda: self._close_and_prune(old_stream))
+        self._record_rollover_latency(perf_counter_ns() - start)
+
+    def _record_rollover_latency(self, elapsed_ns: int):
+        self._rollover_count += 1
+        self._last_rollover_ns = elapsed_ns
+        self._total_rollover_ns += elapsed_ns
+        self._max_rollover_ns = max(self._max_rollover_ns, elapsed_ns)
+
+    def emit(self, record):
+        """Write the record, rolling over first if needed, and track the segment size."""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.shouldRollover(record):
+                self.doRollover()
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg)
+            self.flush()
+            self._segment_bytes += len(msg.encode(self._byte_encoding, self.errors or 'strict'))
+            if not self._preopen_scheduled and self._preopen_due(record):
+                self._schedule_preopen()
+            self._apply_durability_policy(record)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def stats(self) -> dict:
+        """Return a snapshot of rollover counters and latencies (in nanoseconds)."""
+        return {'rollovers': self._rollover_count,
+                'current_segment': self.segment_filename(self._segment_index),
+                'segment_bytes': self._segment_bytes,
+                'preopen_hits': self._preopen_hits,
+                'preopen_misses': self._preopen_misses,
+                'last_rollover_ns': self._last_rollover_ns,
+                'max_rollover_ns': self._max_rollover_ns,
+                'mean_rollover_ns': (self._total_rollover_ns // self._rollover_count
+                                     if self._rollover_count else 0)}
+
+    def close(self):
+        """Stop the worker, close the active stream and remove the unused pre-opened segment."""
+        self.acquire()
+        try:
+            self._sync_on_close()
+            if self._worker is not None and self._worker.is_alive():
+                self._tasks.put(self.__class__._STOP_WORKER)
+                self._worker.join(timeout=5)
+            with self._next_lock:
+                stream, index = self._next_stream, self._next_index
+                self._next_stream, self._next_index = None, None
+            if stream is not None:
+                stream.close()
+                next_path = Path(self.segment_filename(index))
+                if next_path.is_file() and next_path.stat().st_size == 0:
+                    next_path.unlink()
+            super().close()
+        finally:
+            self.release()
+
+
+class GzipFileHandler(_DurableHandlerMixin, FileHandler):
+    """
+    A FileHandler that writes straight into a gzip stream, meant for chatty DEBUG files.
+
+    `.gz` is appended to the filename it is given, so the level-split naming from
+    `_make_file_handler_for_level` is kept (DEBUG-proj-ts.log -> DEBUG-proj-ts.log.gz).
+
+    Instead of flushing after every record (which would defeat compression), the
+    compressor is sync-flushed every `flush_interval` seconds or `flush_records` records,
+    whichever comes first. The interval is kept by a timer that is armed while records
+    are waiting, so the tail is flushed even if the handler then goes idle. Everything up
+    to the last flush point can be read back even if the process crashes before the gzip
+    trailer is written - see `read_text()`.
+
+    Use with EasyLogger:
+        EasyLogger(file_handler_class=GzipFileHandler, file_handler_kwargs={'compresslevel': 6})
+    """
+    SUFFIX = '.gz'
+
+    def __init__(self, filename, mode='a', encoding='utf-8', delay=False, errors=None,
+                 compresslevel=6, flush_interval=2.0, flush_records=1000,
+                 durability_policy: Union[str, FsyncPolicy, None] = None, **kwargs):
+        filename = os.fspath(filename)
+        if not filename.endswith(self.__class__.SUFFIX):
+            filename += self.__class__.SUFFIX
+        self.compresslevel = compresslevel
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        self._unflushed_records = 0
+        self._last_flush = monotonic()
+        self._flush_timer: Optional[Timer] = None
+        super().__init__(filename, mode=mode, encoding=encoding, delay=delay, **_errors_kwarg(errors))
+        self.errors = errors
+        self.durability_policy = FsyncPolicy.from_value(durability_policy)
+
+    def _open(self):
+        raw_mode = self.mode.replace('t', '').replace('b', '') + 'b'
+        return gzip.GzipFile(filename=self.baseFilename, mode=raw_mode, compresslevel=self.compresslevel)
+
+    def _should_sync_flush(self) -> bool:
+        return (self._unflushed_records >= self.flush_records
+                or monotonic() - self._last_flush >= self.flush_interval)
+
+    def _arm_flush_timer(self):
+        timer = Timer(max(self.flush_interval - (monotonic() - self._last_flush), 0), self._flush_on_timer)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def _flush_on_timer(self):
+        self.acquire()
+        try:
+            self._flush_timer = None
+            if self._unflushed_records:
+                self.flush()
+        finally:
+            self.release()
+
+    def flush(self):
+        """Sync-flush the compressor so everything written so far is readable."""
+        self.acquire()
+        try:
+            timer, self._flush_timer = self._flush_timer, None
+            if timer is not None:
+                timer.cancel()
+            if self.stream and not self.stream.closed:
+                self.stream.flush(zlib.Z_SYNC_FLUSH)
+            self._unflushed_records = 0
+            self._last_flush = monotonic()
+        finally:
+            self.release()
+
+    def emit(self, record):
+        """Compress the formatted record, sync-flushing only at the periodic flush points."""
+        try:
+            if self.stream is None:
+                # Handler._closed only exists from Python 3.10
+                if self.mode != 'w' or not getattr(self, '_closed', False):
+                    self.stream = self._open()
+                else:
+                    return
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg.encode(self.encoding, errors=self.errors or 'strict'))
+            self._unflushed_records += 1
+            if self._should_sync_flush():
+                self.flush()
+            elif self._flush_timer is None:
+                self._arm_flush_timer()
+            # sync() sync-flushes the compressor before the fsync
+            self._apply_durability_policy(record)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self._sync_on_close()
+        super().close()
+        # FileHandler.close only flushes (and so cancels the timer) an open stream
+        timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.cancel()
+
+    @staticmethod
+    def read_text(path: Union[str, Path], encoding='utf-8') -> str:
+        """
+        Decompress a (possibly truncated) gzip log and return its text.
+
+        Unlike gzip.open, this does not fail on a stream that has no trailer yet, e.g.
+        a file that is still being written or one left behind by a crash.
+        """
+        data = Path(path).read_bytes()
+        chunks = []
+        while data:
+            decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+            try:
+                chunks.append(decompressor.decompress(data))
+            except zlib.error:
+                break
+            data = decompressor.unused_data
+        return b''.join(chunks).decode(encoding, errors='replace')
+
+
+class MmapFileHandler(_DurableHandlerMixin, FileHandler):
+    """
+    A FileHandler for very high volume files that writes through a memory mapping.
+
+    Each segment is preallocated to `segment_size` bytes (posix_fallocate where available,
+    ftruncate otherwise) and records are copied into the mapping, so emitting a record
+    does not make a syscall. When a segment is full the handler trims it to the bytes
+    actually written and moves on to the next one, named like
+    SizeAndTimeRotatingFileHandler segments (<stem>.<n><suffix>). The unused tail of the
+    last segment is trimmed on close.
+
+    If the process dies before close, the file keeps its preallocated size and ends in
+    NUL bytes; everything before them is intact. Reopening such a file appends after the
+    last complete line.
+
+    In mode 'a' a new handler continues in the newest segment already on disk, so records
+    stay in order across segments after a restart. In mode 'w' every existing segment is
+    truncated (the base file) or removed (the numbered ones) first.
+
+    Use with EasyLogger:
+        EasyLogger(file_handler_class=MmapFileHandler, file_handler_kwargs={'segment_size': 256 * 1024 * 1024})
+    """
+    DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, filename, mode='a', encoding='utf-8', delay=False, errors=None,
+                 segment_size: int = DEFAULT_SEGMENT_SIZE,
+                 durability_policy: Union[str, FsyncPolicy, None] = None, **kwargs):
+        self.segment_size = segment_size
+        self._segment_index = 0
+        self._fd = None
+        self._offset = 0
+        self._mapped_size = 0
+        # the stream is opened below, once the segment to continue in is known
+        super().__init__(filename, mode=mode, encoding=encoding, delay=True, **_errors_kwarg(errors))
+        self.errors = errors
+        self.delay = delay
+        self.durability_policy = FsyncPolicy.from_value(durability_policy)
+
+        indexes = self.existing_segment_indexes()
+        if 'w' in self.mode:
+            # segment 0 is truncated when it is mapped, later ones must not be appended to
+            for index in indexes:
+                if index:
+                    Path(self.segment_filename(index)).unlink(missing_ok=True)
+        elif indexes:
+            self._segment_index = indexes[-1]
+        if not delay:
+            self.stream = self._open()
+
+    def existing_segment_indexes(self) -> List[int]:
+        """Return the indexes of the segments already on disk (0 is the base filename), in order."""
+        return _existing_segment_indexes(self.baseFilename)
+
+    def segment_filename(self, index: int) -> str:
+        """Return the file name used for segment `index` (0 is the base filename)."""
+        if index == 0:
+            return self.baseFilename
+        base = Path(self.baseFilename)
+        return str(base.with_name(f"{base.stem}.{index}{base.suffix}"))
+
+    @staticmethod
+    def _preallocate(fd: int, size: int):
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except (AttributeError, OSError):
+            # not available on this platform/filesystem
+            os.ftruncate(fd, size)
+
+    @staticmethod
+    def _find_data_end(mapping: mmap.mmap) -> int:
+        """Return the offset just after the last complete line in an existing segment."""
+        return mapping.rfind(b'\n') + 1
+
+    def _map_segment(self, index: int, min_size: int = 0) -> mmap.mmap:
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        if 'w' in self.mode and index == 0:
+            flags |= os.O_TRUNC
+        fd = os.open(self.segment_filename(index), flags)
+        existing_size = os.fstat(fd).st_size
+        size = max(self.segment_size, min_size, existing_size)
+        try:
+            if size > existing_size:
+                self._preallocate(fd, size)
+            mapping = mmap.mmap(fd, size)
+        except Exception:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self._mapped_size = size
+        self._offset = self._find_data_end(mapping) if existing_size else 0
+        return mapping
+
+    def _open(self):
+        return self._map_segment(self._segment_index)
+
+    def _stream_fileno(self) -> int:
+        return self._fd
+
+    def _close_segment(self):
+        """Unmap the current segment and trim the unused preallocated tail."""
+        if self.stream is None:
+            return
+        self.stream.close()
+        self.stream = None
+        try:
+            os.ftruncate(self._fd, self._offset)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def _roll_segment(self, min_size: int):
+        self._close_segment()
+        self._segment_index += 1
+        self.stream = self._map_segment(self._segment_index, min_size=min_size)
+
+    def emit(self, record):
+        """Copy the formatted record into the mapping, moving to a new segment when it is full."""
+        try:
+            if self.stream is None:
+                # Handler._closed only exists from Python 3.10
+                if self.mode != 'w' or not getattr(self, '_closed', False):
+                    self.stream = self._open()
+                else:
+                    return
+            data = (self.format(record) + self.terminator).encode(self.encoding, errors=self.errors or 'strict')
+            end = self._offset + len(data)
+            if end > self._mapped_size:
+                self._roll_segment(len(data))
+                end = self._offset + len(data)
+            self.stream[self._offset:end] = data
+            self._offset = end
+            self._apply_durability_policy(record)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """msync the written part of the current segment."""
+        self.acquire()
+        try:
+            if self.stream is not None and self._offset:
+                self.stream.flush(0, self._offset)
+        finally:
+            self.release()
+
+    def close(self):
+        """Sync if a durability policy asks for it, then unmap and trim the current segment."""
+        self.acquire()
+        try:
+            try:
+                self._sync_on_close()
+                self._close_segment()
+            finally:
+                StreamHandler.close(self)
+                self._closed = True
+        finally:
+            self.release()
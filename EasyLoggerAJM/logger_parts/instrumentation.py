@@ -0,0 +1,243 @@
+from logging import Handler, LogRecord, getLevelName
+from time import perf_counter_ns
+from typing import List, Optional
+
+from EasyLoggerAJM.logger_parts.batching import _BATCHABLE_EMITS, _open_delayed_stream, stream_emit
+
+
+class LatencyHistogram:
+    """
+    Latency histogram with power-of-two buckets (in nanoseconds).
+
+    Bucket i counts the latencies whose ns.bit_length() is i, i.e. [2**(i-1), 2**i) ns,
+    so recording a value is one int.bit_length() and one list increment. Percentiles are
+    interpolated inside their bucket, so they are estimates (never off by more than the bucket width).
+    The caller serializes `record()` calls (handlers call it under their lock).
+    """
+    # 64 buckets cover any ns value below 2**63 (~292 years), so bit_length() is always a valid index
+    NUM_BUCKETS = 64
+
+    __slots__ = ('buckets', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * self.__class__.NUM_BUCKETS
+        self.total_ns = 0
+        self.max_ns = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.buckets)
+
+    def record(self, elapsed_ns: int):
+        self.buckets[elapsed_ns.bit_length()] += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def percentile(self, percent: float) -> int:
+        """
+        Estimate (ns) of the `percent` (0-100) percentile, 0 if empty: found by bucket, then
+        interpolated linearly inside the bucket and capped at the largest recorded value.
+        """
+        count = self.count
+        if not count:
+            return 0
+        rank = count * percent / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            if bucket_count and seen + bucket_count >= rank:
+                if not index:
+                    return 0
+                lower = 1 << (index - 1)
+                return min(int(lower + lower * (rank - seen) / bucket_count), self.max_ns)
+            seen += bucket_count
+        return self.max_ns
+
+    def reset(self):
+        # in place: instrumented handlers hold a reference to the bucket list
+        self.buckets[:] = [0] * self.__class__.NUM_BUCKETS
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def snapshot(self) -> dict:
+        """Return count, mean/p50/p90/p99/max (ns) and the non-empty buckets as {upper bound ns: count}."""
+        count = self.count
+        return {'count': count,
+                'mean_ns': self.total_ns // count if count else 0,
+                'p50_ns': self.percentile(50),
+                'p90_ns': self.percentile(90),
+                'p99_ns': self.percentile(99),
+                'max_ns': self.max_ns,
+                'buckets': {1 << index: bucket_count for index, bucket_count in enumerate(self.buckets)
+                            if bucket_count}}
+
+
+class HandlerStats:
+    """
+    Counters for one instrumented handler (see `instrument_handler`):
+        - emitted: records that reached emit(), including the ones that failed
+        - bytes_written: length of the text (plus the stream terminator) the handler formatted
+          in emit(); this is what stream/file handlers write, counted in characters
+        - errors: calls to handleError(), i.e. emits that raised
+        - dropped: records the handler's filters rejected
+        - latency: LatencyHistogram of the time spent in emit(), sampled: one emit in
+          LATENCY_SAMPLE_EVERY is timed (reading the clock costs more than the rest of the
+          instrumentation), so latency.count is about emitted / LATENCY_SAMPLE_EVERY
+    """
+    LATENCY_SAMPLE_EVERY = 32
+
+    __slots__ = ('name', 'emitted', 'bytes_written', 'errors', 'dropped', 'latency')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.emitted = 0
+        self.bytes_written = 0
+        self.errors = 0
+        self.dropped = 0
+        self.latency = LatencyHistogram()
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}({self.name!r}, emitted={self.emitted}, errors={self.errors}, "
+                f"dropped={self.dropped})")
+
+    def reset(self):
+        self.emitted = self.bytes_written = self.errors = self.dropped = 0
+        self.latency.reset()
+
+    def snapshot(self) -> dict:
+        return {'emitted': self.emitted, 'bytes_written': self.bytes_written, 'errors': self.errors,
+                'dropped': self.dropped, 'latency': self.latency.snapshot()}
+
+
+def default_handler_name(handler: Handler) -> str:
+    """The handler's name if it has one, else '<ClassName>-<LEVEL>'."""
+    return handler.get_name() or f"{handler.__class__.__name__}-{getLevelName(handler.level)}"
+
+
+def get_handler_stats(handler: Handler) -> Optional[HandlerStats]:
+    """The HandlerStats of an instrumented handler, None if it isn't instrumented."""
+    # getattr, not handler.__dict__: touching __dict__ materializes the instance dict, which
+    # disables CPython's inline attribute fast path and slows every handle() by a few hundred ns
+    return getattr(handler, '_handler_stats', None)
+
+
+def instrument_handler(handler: Handler, name: Optional[str] = None,
+                       latency_sample_every: Optional[int] = None) -> HandlerStats:
+    """
+    Wrap `handler`'s handle (on the instance, the class is untouched) so it updates a
+    HandlerStats, and return it. Instrumenting a handler twice returns the existing stats.
+    One emit in `latency_sample_every` (a power of two, HandlerStats.LATENCY_SAMPLE_EVERY by
+    default) is timed, starting with the first.
+
+    For a handler with Handler.handle the one wrapper does what handle does (filter, then
+    emit under the handler's lock) and updates the counters under that same lock acquisition.
+    A plain StreamHandler/FileHandler emit is done by the wrapper itself (see stream_emit), so
+    it knows the length it wrote; for any other emit, format is wrapped to note down the length
+    of the text, which is counted once emit returns (a record formatted outside emit, e.g. by a
+    later read of a buffered message, is not counted). handleError is wrapped as well, but only
+    runs when an emit fails. See benchmarks/bench_instrumentation.py for the cost per record.
+
+    A handler that overrides handle (or whose handle is already wrapped) keeps it: the wrapper
+    calls it and takes the lock again for the counters; its latency covers the whole handle().
+    """
+    stats = get_handler_stats(handler)
+    if stats is not None:
+        return stats
+    stats = HandlerStats(name or default_handler_name(handler))
+    sample_every = latency_sample_every or stats.LATENCY_SAMPLE_EVERY
+    if sample_every & (sample_every - 1):
+        raise ValueError(f"latency_sample_every must be a power of two, not {sample_every}")
+    # the 1st, (sample_every + 1)th, ... emits are timed: emitted & sample_mask == sample_at
+    sample_mask = sample_every - 1
+    sample_at = 1 & sample_mask
+    latency = stats.latency
+    handle, emit, record_filter = handler.handle, handler.emit, handler.filter
+    fmt, handle_error = handler.format, handler.handleError
+    terminator_len = len(getattr(handler, 'terminator', ''))
+    streamed = getattr(emit, '__func__', None) in _BATCHABLE_EMITS
+    formatted = 0
+
+    def emit_noting_format(record):
+        nonlocal formatted
+        formatted = 0
+        emit(record)
+        if formatted:
+            stats.bytes_written += formatted + terminator_len
+
+    def timed_emit(record):
+        start = perf_counter_ns()
+        try:
+            if streamed:
+                stats.bytes_written += stream_emit(handler, record)
+            else:
+                emit_noting_format(record)
+        finally:
+            latency.record(perf_counter_ns() - start)
+
+    def instrumented_handle(record):
+        rv = record_filter(record)
+        if isinstance(rv, LogRecord):
+            # Python 3.12+: a filter may return a replacement record
+            record = rv
+        if rv:
+            with handler.lock:
+                emitted = stats.emitted = stats.emitted + 1
+                if emitted & sample_mask == sample_at:
+                    timed_emit(record)
+                elif streamed:
+                    # stream_emit, inlined: this runs for every record
+                    if handler.stream is None and not _open_delayed_stream(handler):
+                        return rv
+                    try:
+                        text = fmt(record) + handler.terminator
+                        handler.stream.write(text)
+                        handler.flush()
+                        stats.bytes_written += len(text)
+                    except RecursionError:
+                        raise
+                    except Exception:
+                        handler.handleError(record)
+                else:
+                    emit_noting_format(record)
+        else:
+            with handler.lock:
+                stats.dropped += 1
+        return rv
+
+    def wrapped_handle(record):
+        nonlocal formatted
+        formatted = 0
+        start = perf_counter_ns()
+        rv = handle(record)
+        elapsed = perf_counter_ns() - start
+        with handler.lock:
+            if not rv:
+                stats.dropped += 1
+                return rv
+            emitted = stats.emitted = stats.emitted + 1
+            if formatted:
+                stats.bytes_written += formatted + terminator_len
+            if emitted & sample_mask == sample_at:
+                latency.record(elapsed)
+        return rv
+
+    def noted_format(record):
+        nonlocal formatted
+        text = fmt(record)
+        formatted = len(text)
+        return text
+
+    def counted_handle_error(record):
+        stats.errors += 1
+        handle_error(record)
+
+    if getattr(handle, '__func__', None) is Handler.handle:
+        handler.handle = instrumented_handle
+    else:
+        handler.handle = wrapped_handle
+        streamed = False
+    if not streamed:
+        handler.format = noted_format
+    handler.handleError = counted_handle_error
+    handler._handler_stats = stats
+    return stats
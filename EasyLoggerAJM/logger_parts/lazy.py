@@ -0,0 +1,126 @@
+from collections.abc import Mapping
+from typing import Any, Callable, Optional
+
+_UNSET = object()
+
+
+class Lazy:
+    """
+    A deferred log argument (or message): `func(*args, **kwargs)` is only called when a
+    handler actually formats the record, and at most once, however many handlers do.
+
+    usage:
+        logger.debug("state: %s", lazy(expensive_dump, obj))
+        logger.debug(lazy(lambda: f"state: {expensive_dump(obj)}"))
+
+    Plain callables are accepted as the message too (`logger.debug(lambda: ...)`), but args
+    have to be wrapped: a callable arg is logged as is, like with the stdlib logger.
+    Subclasses of Lazy are not recognized as args (they are checked by class, see is_lazy_call).
+    """
+    __slots__ = ('func', 'args', 'kwargs', '_value')
+
+    def __init__(self, func: Callable, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self._value = _UNSET
+
+    @property
+    def evaluated(self) -> bool:
+        return self._value is not _UNSET
+
+    def value(self) -> Any:
+        value = self._value
+        if value is _UNSET:
+            value = self._value = self.func(*self.args, **self.kwargs)
+        return value
+
+    def __str__(self):
+        return str(self.value())
+
+    def __repr__(self):
+        return repr(self.value())
+
+    def __format__(self, format_spec):
+        return format(self.value(), format_spec)
+
+
+def lazy(func: Callable, *args, **kwargs) -> Lazy:
+    """Defer `func(*args, **kwargs)` until the log record is formatted, see Lazy."""
+    return Lazy(func, *args, **kwargs)
+
+
+def is_lazy_call(msg, args: tuple) -> bool:
+    """Whether a logging call's message is callable/Lazy or its args (or mapping arg values) contain a Lazy."""
+    # this runs for every record: str messages and args are checked by class first
+    if msg.__class__ is not str and (callable(msg) or isinstance(msg, Lazy)):
+        return True
+    for arg in args:
+        if arg.__class__ is Lazy:
+            return True
+    if len(args) == 1 and args[0].__class__ is not str and isinstance(args[0], Mapping):
+        return any(value.__class__ is Lazy for value in args[0].values())
+    return False
+
+
+class LazyMessage:
+    """
+    The `msg` of a record logged with lazy parts (args are moved in here, the record's args
+    are empty). LogRecord.getMessage() calls str() on it, which resolves the message and the
+    Lazy args, sanitizes the message like _EasyLoggerCustomLogger._log does for plain
+    messages, applies the %-formatting and caches the text, so the level files share it.
+    If rendering raises, the exception is cached instead and raised again for every handler,
+    so the message callable still runs only once.
+    """
+    __slots__ = ('msg', 'args', 'sanitize', '_text', '_error')
+
+    def __init__(self, msg, args: tuple, sanitize: Optional[Callable[[Any], str]] = None):
+        self.msg = msg
+        self.args = args
+        self.sanitize = sanitize
+        self._text: Optional[str] = None
+        self._error: Optional[Exception] = None
+
+    @property
+    def rendered(self) -> bool:
+        return self._text is not None
+
+    @staticmethod
+    def _resolve(value):
+        return value.value() if isinstance(value, Lazy) else value
+
+    def _resolve_args(self):
+        args = self.args
+        if len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+            # same as LogRecord: a single mapping is used for %(name)s formatting
+            return {key: self._resolve(value) for key, value in args[0].items()}
+        return tuple(self._resolve(arg) for arg in args)
+
+    def _render(self) -> str:
+        msg = self.msg
+        if isinstance(msg, Lazy):
+            msg = msg.value()
+        elif callable(msg):
+            msg = msg()
+        # like a plain message, the callable may return any object
+        text = str(msg)
+        if self.sanitize is not None:
+            text = self.sanitize(text)
+        if self.args:
+            text = text % self._resolve_args()
+        return text
+
+    def __str__(self):
+        text = self._text
+        if text is None:
+            if self._error is not None:
+                raise self._error
+            try:
+                text = self._text = self._render()
+            except Exception as e:
+                self._error = e
+                raise
+        return text
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self._text if self.rendered else 'not rendered'}>"
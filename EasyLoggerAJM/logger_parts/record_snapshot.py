@@ -0,0 +1,93 @@
+import logging
+from copy import copy
+from logging import Formatter, LogRecord
+
+
+class RecordSnapshot:
+    """
+    Compact copy of a LogRecord, for buffers that hold many records which are mostly
+    never read (TailSamplingHandler).
+
+    A LogRecord keeps its `args` and `exc_info` alive, and through the traceback every
+    frame's locals, until the record is dropped. A snapshot renders the message and the
+    traceback text up front and keeps only plain values in __slots__ (no per-instance dict).
+
+    `msg`, `levelname` and `getMessage()` mirror the LogRecord API, and `to_record()`
+    rebuilds an equivalent LogRecord when a snapshot has to go through a Formatter.
+    Fields that are not kept (args, exc_info, `extra` attributes) are not restored.
+    """
+    __slots__ = ('name', 'levelno', 'created', 'message', 'exc_text', 'stack_info',
+                 'pathname', 'lineno', 'funcName', 'thread', 'threadName', 'process')
+
+    _TRACEBACK_FORMATTER = Formatter()
+
+    def __init__(self, name: str, levelno: int, created: float, message: str, exc_text=None, stack_info=None,
+                 pathname: str = '', lineno: int = 0, funcName=None, thread=None, threadName=None, process=None):
+        self.name = name
+        self.levelno = levelno
+        self.created = created
+        self.message = message
+        self.exc_text = exc_text
+        self.stack_info = stack_info
+        self.pathname = pathname
+        self.lineno = lineno
+        self.funcName = funcName
+        self.thread = thread
+        self.threadName = threadName
+        self.process = process
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.name}, {self.levelno}, "{self.message}">'
+
+    @classmethod
+    def from_record(cls, record: LogRecord) -> 'RecordSnapshot':
+        """Render the record's message and traceback and keep only the compact fields."""
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = cls._TRACEBACK_FORMATTER.formatException(record.exc_info)
+        return cls(record.name, record.levelno, record.created, record.getMessage(),
+                   exc_text=exc_text, stack_info=record.stack_info,
+                   pathname=record.pathname, lineno=record.lineno, funcName=record.funcName,
+                   thread=record.thread, threadName=record.threadName, process=record.process)
+
+    @property
+    def msg(self) -> str:
+        return self.message
+
+    @property
+    def levelname(self) -> str:
+        return logging.getLevelName(self.levelno)
+
+    def getMessage(self) -> str:
+        return self.message
+
+    def to_record(self) -> LogRecord:
+        """Rebuild a LogRecord (with the rendered message and traceback text) for formatting."""
+        record = LogRecord(self.name, self.levelno, self.pathname, self.lineno, self.message, None, None,
+                           func=self.funcName, sinfo=self.stack_info)
+        record.created = self.created
+        record.msecs = int((self.created - int(self.created)) * 1000) + 0.0
+        # noinspection PyProtectedMember,PyUnresolvedReferences
+        record.relativeCreated = (self.created - logging._startTime) * 1000
+        record.exc_text = self.exc_text
+        record.thread = self.thread
+        record.threadName = self.threadName
+        record.process = self.process
+        return record
+
+
+def detach_traceback(record: LogRecord) -> LogRecord:
+    """
+    Return `record` itself or, if it carries exc_info, a shallow copy with the traceback
+    rendered into exc_text and exc_info dropped, so that keeping the record around does not
+    keep the traceback's frames (and their locals) alive. The record passed in is not
+    changed: handlers further down the chain still see its exc_info.
+    """
+    if not record.exc_info:
+        return record
+    detached = copy(record)
+    if not detached.exc_text:
+        # noinspection PyProtectedMember
+        detached.exc_text = RecordSnapshot._TRACEBACK_FORMATTER.formatException(record.exc_info)
+    detached.exc_info = None
+    return detached
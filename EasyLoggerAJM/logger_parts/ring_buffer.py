@@ -0,0 +1,135 @@
+from collections import deque
+from itertools import islice
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+
+class RecordRingBuffer:
+    """
+    Fixed capacity ring buffer of (record, formatted message) pairs.
+
+    Every entry gets a sequence number; slot = seq % capacity. Alongside the slots the
+    buffer keeps a small per-level index (a deque of sequence numbers per levelno), which
+    is trimmed in O(1) as entries are overwritten. Time-range queries scan the `created`
+    timestamps, since concurrent appends are not strictly in time order.
+
+    All reads copy what they need while holding the buffer lock and do nothing else under
+    it - messages are formatted once, on append - so readers never hold up writers for
+    longer than a list slice.
+
+    If a `renderer` is given, entries may be appended without a message (message=None);
+    reads then render those messages from their records, outside the lock.
+    """
+
+    def __init__(self, capacity: int = 10, renderer: Optional[Callable[[Any], str]] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.renderer = renderer
+        self._records: List[Any] = [None] * capacity
+        self._messages: List[Optional[str]] = [None] * capacity
+        self._levels: List[int] = [0] * capacity
+        self._created: List[float] = [0.0] * capacity
+        self._level_index: Dict[int, deque] = {}
+        self._next_seq = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return min(self._next_seq, self.capacity)
+
+    def __bool__(self):
+        return self._next_seq > 0
+
+    def __iter__(self):
+        return iter(self.records())
+
+    @property
+    def _oldest_seq(self) -> int:
+        return max(0, self._next_seq - self.capacity)
+
+    def append(self, record, message: Optional[str] = None):
+        """Store a record and its formatted message, overwriting the oldest entry when full."""
+        with self._lock:
+            seq = self._next_seq
+            slot = seq % self.capacity
+            if seq >= self.capacity:
+                evicted_level = self._levels[slot]
+                level_seqs = self._level_index[evicted_level]
+                level_seqs.popleft()
+                if not level_seqs:
+                    del self._level_index[evicted_level]
+            self._records[slot] = record
+            self._messages[slot] = message
+            self._levels[slot] = record.levelno
+            self._created[slot] = record.created
+            self._level_index.setdefault(record.levelno, deque()).append(seq)
+            self._next_seq = seq + 1
+
+    def clear(self):
+        with self._lock:
+            self._records = [None] * self.capacity
+            self._messages = [None] * self.capacity
+            self._level_index.clear()
+            self._next_seq = 0
+
+    def _slice(self, values: list, start_seq: int, end_seq: int) -> list:
+        """Return values for sequence numbers [start_seq, end_seq) in order. Caller holds the lock."""
+        if start_seq >= end_seq:
+            return []
+        start, end = start_seq % self.capacity, end_seq % self.capacity
+        if start < end:
+            return values[start:end]
+        return values[start:] + values[:end]
+
+    def _newest_range(self, n: Optional[int]):
+        end = self._next_seq
+        start = self._oldest_seq if n is None else max(self._oldest_seq, end - max(n, 0))
+        return start, end
+
+    def _render(self, records: list, messages: list) -> List[str]:
+        """Fill in messages that were stored as None using the renderer. Called without the lock."""
+        if self.renderer is None:
+            return messages
+        return [self.renderer(record) if message is None else message
+                for record, message in zip(records, messages)]
+
+    def newest(self, n: Optional[int] = None) -> List[str]:
+        """Return the formatted messages of the newest `n` entries (all of them if n is None), oldest first."""
+        with self._lock:
+            start, end = self._newest_range(n)
+            records = self._slice(self._records, start, end) if self.renderer else []
+            messages = self._slice(self._messages, start, end)
+        return self._render(records, messages)
+
+    def records(self, n: Optional[int] = None) -> list:
+        """Return the newest `n` stored records (all of them if n is None), oldest first."""
+        with self._lock:
+            return self._slice(self._records, *self._newest_range(n))
+
+    def by_level(self, levelno: int, n: Optional[int] = None) -> List[str]:
+        """Return the formatted messages of the newest `n` entries logged at exactly `levelno`."""
+        with self._lock:
+            level_seqs = self._level_index.get(levelno, ())
+            if n is None:
+                seqs = list(level_seqs)
+            else:
+                seqs = list(islice(reversed(level_seqs), max(n, 0)))[::-1]
+            slots = [seq % self.capacity for seq in seqs]
+            records = [self._records[slot] for slot in slots] if self.renderer else []
+            messages = [self._messages[slot] for slot in slots]
+        return self._render(records, messages)
+
+    def between(self, start: Optional[float] = None, end: Optional[float] = None) -> List[str]:
+        """Return the formatted messages of entries created within [start, end] (epoch seconds)."""
+        with self._lock:
+            lo, hi = self._oldest_seq, self._next_seq
+            created = self._slice(self._created, lo, hi)
+            records = self._slice(self._records, lo, hi) if self.renderer else []
+            messages = self._slice(self._messages, lo, hi)
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+        # a linear scan: records appended by several threads are not strictly in `created` order
+        keep = [i for i, timestamp in enumerate(created) if start <= timestamp <= end]
+        if records:
+            records = [records[i] for i in keep]
+        return self._render(records, [messages[i] for i in keep])
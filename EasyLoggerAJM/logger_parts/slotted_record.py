@@ -0,0 +1,137 @@
+from collections.abc import MutableMapping
+from logging import LogRecord
+
+# every attribute a LogRecord sets in __init__ on this Python version (taskName on 3.12+, ...)
+_LOG_RECORD_ATTRS = tuple(vars(LogRecord('', 0, '', 0, '', (), None)))
+# set later by Formatter.format
+_FORMATTER_ATTRS = ('message', 'asctime')
+
+
+class _SlottedRecordDict(MutableMapping):
+    """
+    Mapping view that stands in for `record.__dict__` on a SlottedLogRecord.
+
+    Formatters read the record through `record.__dict__` and logging.Logger.makeRecord /
+    logging.makeLogRecord write `extra` fields through it, so the view reads and writes
+    the slots and falls back to the record's overflow dict for everything else.
+    """
+    __slots__ = ('_record',)
+
+    def __init__(self, record: 'SlottedLogRecord'):
+        self._record = record
+
+    def __getitem__(self, key):
+        # hot path: Formatter does `fmt % record.__dict__`, one lookup per field.
+        # getattr covers both the slots and (through __getattr__) the extra fields.
+        try:
+            return getattr(self._record, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        if key in SlottedLogRecord.RECORD_SLOTS:
+            try:
+                object.__getattribute__(self._record, key)
+            except AttributeError:
+                return False
+            return True
+        extra = self._record._extra
+        return extra is not None and key in extra
+
+    def __setitem__(self, key, value):
+        if key in SlottedLogRecord.RECORD_SLOTS:
+            object.__setattr__(self._record, key, value)
+        else:
+            self._record.set_extra(key, value)
+
+    def __delitem__(self, key):
+        if key in SlottedLogRecord.RECORD_SLOTS:
+            try:
+                object.__delattr__(self._record, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._record._extra is not None:
+            del self._record._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key in SlottedLogRecord.RECORD_SLOTS:
+            try:
+                object.__getattribute__(self._record, key)
+            except AttributeError:
+                continue
+            yield key
+        if self._record._extra:
+            yield from self._record._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __or__(self, other):
+        return {**self, **other}
+
+    def __ror__(self, other):
+        # Formatter styles with defaults do `defaults | record.__dict__`
+        return {**other, **self}
+
+
+class SlottedLogRecord:
+    """
+    A drop-in LogRecord replacement whose standard attributes live in __slots__.
+
+    A regular LogRecord carries a per-instance __dict__ with ~20 entries. This class
+    stores the same attributes in slots and keeps `extra` fields (uncaught_exception,
+    no_email, ...) in a small overflow dict that is only created when a record has them.
+    Reading an extra field as an attribute works as usual (`record.no_email`,
+    `getattr(record, 'uncaught_exception', False)`).
+
+    To add an attribute after the record is created (e.g. in a filter) use
+    `record.set_extra(key, value)` or `record.__dict__[key] = value`; plain attribute
+    assignment only works for the standard LogRecord attributes.
+
+    It is not a LogRecord subclass (that would bring the __dict__ back), so code that
+    checks isinstance(record, LogRecord) will not accept it. Enable it per logger with
+    `_EasyLoggerCustomLogger.record_factory` or EasyLogger(slotted_records=True).
+
+    It is off by default because the only gain is memory: a record kept alive (buffered,
+    queued, in a FlightRecorderHandler) is smaller (~723 -> ~667 bytes on CPython 3.11, see
+    benchmarks/bench_slotted_records.py). Records/sec is unchanged within noise (creation is
+    a bit cheaper, formatting through the __dict__ view a bit dearer) and so are gen0
+    collections, since the instances are still GC tracked.
+    """
+    RECORD_SLOTS = frozenset(_LOG_RECORD_ATTRS + _FORMATTER_ATTRS)
+    __slots__ = _LOG_RECORD_ATTRS + _FORMATTER_ATTRS + ('_extra',)
+
+    def __init__(self, name, level, pathname, lineno, msg, args, exc_info, func=None, sinfo=None):
+        self._extra = None
+        LogRecord.__init__(self, name, level, pathname, lineno, msg, args, exc_info, func=func, sinfo=sinfo)
+
+    getMessage = LogRecord.getMessage
+    __repr__ = LogRecord.__repr__
+
+    def __getattr__(self, key):
+        # only called when normal lookup fails, i.e. for extra fields
+        extra = object.__getattribute__(self, '_extra')
+        if extra is not None and key in extra:
+            return extra[key]
+        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{key}'")
+
+    @property
+    def __dict__(self):
+        return _SlottedRecordDict(self)
+
+    def set_extra(self, key, value):
+        """Store an attribute that is not one of the standard LogRecord attributes."""
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __getstate__(self):
+        return dict(self.__dict__)
+
+    def __setstate__(self, state):
+        self._extra = None
+        view = _SlottedRecordDict(self)
+        for key, value in state.items():
+            view[key] = value
@@ -0,0 +1,152 @@
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import Handler, ERROR, WARNING, NOTSET, getLevelName
+from typing import Hashable, Iterable, List, Optional, Union
+
+from EasyLoggerAJM.logger_parts.record_snapshot import RecordSnapshot
+
+# the context (request, job, ...) the current thread/task is logging for; None means no context
+LOG_CONTEXT_ID: ContextVar[Optional[Hashable]] = ContextVar('easy_logger_context_id', default=None)
+
+
+class TailSamplingHandler(Handler):
+    """
+    Forwards records to a set of target handlers (e.g. EasyLogger's level file handlers),
+    holding back low level records per context until the context's outcome is known.
+
+    The context is read from a ContextVar (LOG_CONTEXT_ID unless another one is given).
+    For a record logged inside a context:
+        - below `buffer_below` (WARNING by default, so DEBUG and INFO): kept in memory for the context.
+        - at or above `flush_level` (ERROR by default): the context's buffered records are
+          written to the targets first, then the record itself. The rest of that context is
+          passed straight through.
+        - anything else is passed straight through.
+    When the context ends (see `context()`), its buffer is dropped if it finished cleanly
+    and written out if it ended with an exception. Records logged outside any context are
+    passed straight through.
+
+    Memory is bounded per context (`max_records_per_context`, oldest records are dropped
+    first) and in total (`max_total_records`, records are dropped from the oldest contexts
+    first). At most `max_flushed_contexts` flushed contexts that have not ended yet are
+    remembered; past that the oldest is forgotten and its later low level records are
+    buffered again. Buffered records are stored as RecordSnapshots, so `extra` attributes and
+    args are not kept.
+    """
+
+    def __init__(self, targets: Iterable[Handler], max_records_per_context: int = 1000,
+                 max_total_records: int = 10000, flush_level: Union[int, str] = ERROR,
+                 buffer_below: Union[int, str] = WARNING, context_var: ContextVar = LOG_CONTEXT_ID,
+                 max_flushed_contexts: int = 10000):
+        super().__init__(NOTSET)
+        self.targets: List[Handler] = list(targets)
+        self.max_records_per_context = max_records_per_context
+        self.max_total_records = max_total_records
+        self.flush_level = flush_level if isinstance(flush_level, int) else getLevelName(flush_level.upper())
+        self.buffer_below = buffer_below if isinstance(buffer_below, int) else getLevelName(buffer_below.upper())
+        self.context_var = context_var
+        self.max_flushed_contexts = max_flushed_contexts
+
+        self._buffers: 'OrderedDict[Hashable, deque]' = OrderedDict()
+        # an ordered set: contexts that logged at flush_level, oldest first
+        self._flushed_contexts: 'OrderedDict[Hashable, None]' = OrderedDict()
+        self._total = 0
+        self.flushed_records = 0
+        self.discarded_records = 0
+
+    @property
+    def buffered_records(self) -> int:
+        return self._total
+
+    def _dispatch(self, record):
+        for target in self.targets:
+            if record.levelno >= target.level:
+                target.handle(record)
+
+    def _buffer(self, context_id, record):
+        buffer = self._buffers.get(context_id)
+        if buffer is None:
+            buffer = self._buffers[context_id] = deque()
+        if len(buffer) >= self.max_records_per_context:
+            buffer.popleft()
+            self._total -= 1
+            self.discarded_records += 1
+        buffer.append(RecordSnapshot.from_record(record))
+        self._total += 1
+        self._enforce_total_limit()
+
+    def _enforce_total_limit(self):
+        while self._total > self.max_total_records:
+            oldest_id, oldest = next(iter(self._buffers.items()))
+            oldest.popleft()
+            self._total -= 1
+            self.discarded_records += 1
+            if not oldest:
+                del self._buffers[oldest_id]
+
+    def _flush_context(self, context_id):
+        buffer = self._buffers.pop(context_id, None)
+        if not buffer:
+            return
+        self._total -= len(buffer)
+        self.flushed_records += len(buffer)
+        for snapshot in buffer:
+            self._dispatch(snapshot.to_record())
+
+    def emit(self, record):
+        context_id = self.context_var.get()
+        if context_id is None or context_id in self._flushed_contexts:
+            self._dispatch(record)
+        elif record.levelno >= self.flush_level:
+            self._flush_context(context_id)
+            self._flushed_contexts[context_id] = None
+            if len(self._flushed_contexts) > self.max_flushed_contexts:
+                self._flushed_contexts.popitem(last=False)
+            self._dispatch(record)
+        elif record.levelno < self.buffer_below:
+            self._buffer(context_id, record)
+        else:
+            self._dispatch(record)
+
+    def end_context(self, context_id, failed: bool = False):
+        """Drop the context's buffered records, or write them out if `failed`."""
+        with self.lock:
+            if failed:
+                self._flush_context(context_id)
+            else:
+                buffer = self._buffers.pop(context_id, None)
+                if buffer:
+                    self._total -= len(buffer)
+                    self.discarded_records += len(buffer)
+            self._flushed_contexts.pop(context_id, None)
+
+    @contextmanager
+    def context(self, context_id: Hashable):
+        """
+        Log the body of the with block under `context_id`.
+
+        usage:
+            with handler.context(request.id):
+                handle_request(request)
+        """
+        token = self.context_var.set(context_id)
+        failed = False
+        try:
+            yield context_id
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.context_var.reset(token)
+            self.end_context(context_id, failed=failed)
+
+    def flush(self):
+        for target in self.targets:
+            target.flush()
+
+    def close(self):
+        with self.lock:
+            self._buffers.clear()
+            self._flushed_contexts.clear()
+            self._total = 0
+        super().close()
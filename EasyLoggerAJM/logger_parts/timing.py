@@ -0,0 +1,106 @@
+from functools import wraps
+from threading import Lock
+from time import perf_counter_ns, monotonic
+from typing import Callable, Dict, List, Optional, Tuple
+
+from EasyLoggerAJM.logger_parts.instrumentation import LatencyHistogram
+
+
+def format_duration(ns: int) -> str:
+    """Human readable duration: 850ns, 12.3us, 4.56ms, 1.20s."""
+    if ns < 1_000:
+        return f"{ns}ns"
+    if ns < 1_000_000:
+        return f"{ns / 1_000:.1f}us"
+    if ns < 1_000_000_000:
+        return f"{ns / 1_000_000:.2f}ms"
+    return f"{ns / 1_000_000_000:.2f}s"
+
+
+def format_clock(seconds: float) -> str:
+    """Elapsed/remaining time as m:ss or h:mm:ss: 0:07, 12:34, 1:02:03."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+class TimingAggregator:
+    """
+    Per-name LatencyHistograms of durations, summarized once per `interval` seconds instead
+    of one log line per measurement.
+
+    `record()` adds a duration; when the interval has passed it swaps the histograms out
+    and hands each (name, histogram) to `summary_callback` (outside the lock). `flush()`
+    does the same on demand.
+    """
+
+    def __init__(self, summary_callback: Callable[[str, LatencyHistogram], None], interval: float = 60.0):
+        self.summary_callback = summary_callback
+        self.interval = interval
+        self._lock = Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._next_summary = monotonic() + interval
+
+    def record(self, name: str, elapsed_ns: int):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(elapsed_ns)
+            due = monotonic() >= self._next_summary
+        if due:
+            self.flush()
+
+    def _take(self) -> List[Tuple[str, LatencyHistogram]]:
+        with self._lock:
+            histograms, self._histograms = self._histograms, {}
+            self._next_summary = monotonic() + self.interval
+        return sorted(histograms.items())
+
+    def flush(self) -> List[Tuple[str, LatencyHistogram]]:
+        """Summarize and reset every name that has measurements, return what was summarized."""
+        taken = self._take()
+        for name, histogram in taken:
+            self.summary_callback(name, histogram)
+        return taken
+
+    def pending(self) -> Dict[str, dict]:
+        """Snapshot of the measurements since the last summary, per name."""
+        with self._lock:
+            return {name: histogram.snapshot() for name, histogram in self._histograms.items()}
+
+
+class Timed:
+    """
+    Context manager and decorator that records its duration (perf_counter_ns) under `name`
+    in a TimingAggregator. As a context manager it measures one block at a time, use a new
+    `logger.timed(...)` per block; as a decorator every call is timed on its own.
+    """
+    __slots__ = ('name', 'aggregator', '_start')
+
+    def __init__(self, name: str, aggregator: TimingAggregator):
+        self.name = name
+        self.aggregator = aggregator
+        self._start: Optional[int] = None
+
+    def __enter__(self):
+        self._start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.aggregator.record(self.name, perf_counter_ns() - self._start)
+        return False
+
+    def __call__(self, func):
+        name, aggregator = self.name, self.aggregator
+
+        @wraps(func)
+        def timed_func(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                aggregator.record(name, perf_counter_ns() - start)
+        return timed_func
@@ -0,0 +1,12 @@
+"""Performance benchmarks for EasyLoggerAJM.
+
+These are not part of the test suite, run them with e.g.
+python -m benchmarks.bench_durability
+
+bench_suite compares EasyLogger with plain stdlib logging and can save/compare JSON results:
+python -m benchmarks.bench_suite --output results.json
+pytest benchmarks/bench_pytest.py  (needs pytest-benchmark)
+
+soak is a long-run leak check (memory, file descriptors, handlers), exit status 1 on growth:
+python -m benchmarks.soak --records 1000000 --cycles 1000
+"""
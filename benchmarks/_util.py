@@ -0,0 +1,14 @@
+"""Helpers shared by the benchmark scripts."""
+import contextlib
+import os
+
+
+@contextlib.contextmanager
+def devnull_stderr():
+    """
+    Console handlers grab sys.stderr when they are created: point it at devnull meanwhile.
+    The caller closes the yielded file once the handlers are closed.
+    """
+    devnull = open(os.devnull, 'w')
+    with contextlib.redirect_stderr(devnull):
+        yield devnull
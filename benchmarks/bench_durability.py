@@ -0,0 +1,70 @@
+"""
+bench_durability.py
+
+measures the cost of each FsyncPolicy mode on a DurableFileHandler.
+
+usage: python -m benchmarks.bench_durability [--records N] [--json]
+
+"""
+import argparse
+import json
+import logging
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from EasyLoggerAJM.logger_parts import DurableFileHandler, FsyncPolicy
+
+POLICIES = {
+    'never': lambda: FsyncPolicy('never'),
+    'error (1% errors)': lambda: FsyncPolicy('error'),
+    'batch (100)': lambda: FsyncPolicy('batch', batch_size=100),
+    'interval (0.1s)': lambda: FsyncPolicy('interval', interval=0.1),
+    'always': lambda: FsyncPolicy('always'),
+}
+
+
+def bench_policy(policy: FsyncPolicy, records: int, log_dir: Path) -> dict:
+    handler = DurableFileHandler(log_dir / f"{policy.mode}.log", durability_policy=policy)
+    handler.setFormatter(logging.Formatter('%(asctime)s | %(name)s | %(levelname)s | %(message)s'))
+    info = logging.LogRecord('bench', logging.INFO, __file__, 0, 'processed item %d', (0,), None)
+    error = logging.LogRecord('bench', logging.ERROR, __file__, 0, 'failed item %d', (0,), None)
+    try:
+        start = perf_counter()
+        for i in range(records):
+            handler.handle(error if i % 100 == 99 else info)
+        elapsed = perf_counter() - start
+    finally:
+        handler.close()
+    return {'records': records, 'seconds': elapsed,
+            'us_per_record': elapsed / records * 1e6,
+            'records_per_sec': records / elapsed}
+
+
+def run(records: int = 5000) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make_policy in POLICIES.items():
+            results[name] = bench_policy(make_policy(), records, Path(tmp))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=5000)
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.records)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    baseline = results['never']['us_per_record']
+    for name, result in results.items():
+        print(f"{name:<20} {result['us_per_record']:>10.2f} us/record "
+              f"{result['records_per_sec']:>12.0f} records/s "
+              f"{result['us_per_record'] / baseline:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+bench_excepthook_startup.py
+
+measures what installing UncaughtExceptionHook costs at process start: eager
+construction (the UncaughtLogger is built when the hook is installed, the old
+behaviour) versus the lazy hook set_sys_excepthook installs now. Each run is a fresh
+interpreter; the time reported is just the install step (the package import is
+excluded), median over the runs.
+
+usage: python -m benchmarks.bench_excepthook_startup [--runs N] [--json]
+
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_CHILD = """
+import sys
+from time import perf_counter
+from EasyLoggerAJM.UncaughtExceptionHook.uncaught_exception_hook import UncaughtExceptionHook
+start = perf_counter()
+UncaughtExceptionHook.set_sys_excepthook(lazy={lazy}, root_log_location={root!r})
+print(perf_counter() - start)
+"""
+
+
+def install_seconds(lazy: bool, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as root:
+            out = subprocess.run([sys.executable, '-c', _CHILD.format(lazy=lazy, root=root)],
+                                 capture_output=True, text=True, check=True)
+            timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def run(runs: int = 15) -> dict:
+    return {'eager_ms': install_seconds(False, runs) * 1000,
+            'lazy_ms': install_seconds(True, runs) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"eager install {results['eager_ms']:>8.3f} ms")
+    print(f"lazy install  {results['lazy_ms']:>8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+bench_instrumentation.py
+
+per-record cost of handler instrumentation (instrument_handler / EasyLogger(instrument_handlers=True)):
+ns per Handler.handle() of a StreamHandler writing to an in-memory stream, plain vs instrumented,
+without and with a filter on the handler.
+The variants are timed in interleaved rounds (best round wins) so machine noise hits them alike.
+
+usage: python -m benchmarks.bench_instrumentation [--number N] [--rounds N] [--json]
+
+"""
+import argparse
+import io
+import json
+import logging
+import timeit
+
+from EasyLoggerAJM.logger_parts import instrument_handler
+
+
+def _handle_op(instrumented: bool, with_filter: bool):
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter('%(asctime)s | %(name)s | %(levelname)s | %(message)s'))
+    if with_filter:
+        handler.addFilter(logging.Filter())
+    if instrumented:
+        instrument_handler(handler)
+    record = logging.LogRecord('bench', logging.INFO, __file__, 0, 'processed item %d', (42,), None)
+
+    def op():
+        handler.handle(record)
+        handler.stream.seek(0)
+    return op
+
+
+def run(number: int = 20_000, rounds: int = 40) -> dict:
+    variants = {(instrumented, with_filter): _handle_op(instrumented, with_filter)
+                for with_filter in (False, True) for instrumented in (False, True)}
+    best = dict.fromkeys(variants, float('inf'))
+    for _ in range(rounds):
+        for key, op in variants.items():
+            best[key] = min(best[key], timeit.timeit(op, number=number) / number * 1e9)
+    results = {}
+    for with_filter in (False, True):
+        plain, instrumented = best[(False, with_filter)], best[(True, with_filter)]
+        results['with_filter' if with_filter else 'no_filter'] = {
+            'plain_ns': plain, 'instrumented_ns': instrumented, 'overhead_ns': instrumented - plain}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=20_000, help='records per round')
+    parser.add_argument('--rounds', type=int, default=40)
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.number, args.rounds)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for label, result in results.items():
+        print(f"{label:<12} plain {result['plain_ns']:>7.0f} ns  instrumented {result['instrumented_ns']:>7.0f} ns  "
+              f"overhead {result['overhead_ns']:>5.0f} ns/record")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+bench_log_many.py
+
+logger.log_many() vs a Python loop of logger.info() for a batch of precomputed events,
+logged by an EasyLogger with its default DEBUG/INFO/ERROR level files (INFO records go to
+two of them). The result is ns per message for each, timed in interleaved rounds (best
+round wins) so machine noise hits both alike.
+
+usage: python -m benchmarks.bench_log_many [--batch N] [--rounds N] [--json]
+
+"""
+import argparse
+import json
+import logging
+import tempfile
+import timeit
+
+from EasyLoggerAJM import EasyLogger
+
+
+def run(batch: int = 1000, rounds: int = 20) -> dict:
+    with tempfile.TemporaryDirectory() as log_dir:
+        el = EasyLogger(project_name='bench_log_many', root_log_location=log_dir,
+                        logger_name='bench_log_many', propagate=False)
+        logger = el.logger
+        events = [('row %d: %s', i, 'ok') for i in range(batch)]
+
+        def loop():
+            for msg, *args in events:
+                logger.info(msg, *args)
+
+        def log_many():
+            logger.log_many(logging.INFO, events)
+
+        variants = {'loop': loop, 'log_many': log_many}
+        best = dict.fromkeys(variants, float('inf'))
+        try:
+            for _ in range(rounds):
+                for name, op in variants.items():
+                    best[name] = min(best[name], timeit.timeit(op, number=1) / batch * 1e9)
+        finally:
+            el.close()
+    return {'batch': batch, 'loop_ns': best['loop'], 'log_many_ns': best['log_many'],
+            'speedup': best['loop'] / best['log_many']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch', type=int, default=1000, help='messages per call')
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.batch, args.rounds)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"batch of {results['batch']}: loop {results['loop_ns']:>7.0f} ns/msg  "
+          f"log_many {results['log_many_ns']:>7.0f} ns/msg  speedup x{results['speedup']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+bench_pytest.py
+
+bench_suite's cases under pytest-benchmark, one benchmark per case and implementation,
+grouped by case so each EasyLogger number sits next to its stdlib baseline.
+
+usage: pytest benchmarks/bench_pytest.py [--benchmark-json FILE] [--benchmark-compare ...]
+
+(the file name does not match test_*.py on purpose, a plain `pytest` run won't collect it)
+
+"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from benchmarks.bench_suite import CASES  # noqa: E402
+
+
+@pytest.mark.parametrize('impl', ['easylogger', 'stdlib'])
+@pytest.mark.parametrize('case', CASES, ids=[case.name for case in CASES])
+def test_bench(benchmark, tmp_path, case, impl):
+    benchmark.group = case.name
+    benchmark.extra_info['group'] = case.group
+    op, teardown = getattr(case, impl)(tmp_path)
+    try:
+        benchmark(op)
+    finally:
+        teardown()
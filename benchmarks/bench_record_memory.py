@@ -0,0 +1,88 @@
+"""
+bench_record_memory.py
+
+measures, with tracemalloc, the memory retained per record by an in-memory handler
+that keeps full LogRecords versus BufferedRecordHandler's RecordSnapshots.
+
+usage: python -m benchmarks.bench_record_memory [--records N] [--json]
+
+"""
+import argparse
+import gc
+import json
+import logging
+import sys
+import tracemalloc
+from collections import deque
+
+from EasyLoggerAJM.logger_parts import BufferedRecordHandler
+
+
+class _FullRecordHandler(logging.Handler):
+    """What BufferedRecordHandler did before snapshots: keep the LogRecord itself."""
+    def __init__(self, buffer_size):
+        super().__init__()
+        self.buffer = deque(maxlen=buffer_size)
+
+    def emit(self, record):
+        self.buffer.append(record)
+
+
+def _process_item(i: int):
+    rows = [i] * 200  # a frame local that the traceback keeps alive
+    raise ValueError(f"failure {i} after {len(rows)} rows")
+
+
+def _make_records(count: int, with_exc_info: bool):
+    for i in range(count):
+        exc_info = None
+        if with_exc_info:
+            try:
+                _process_item(i)
+            except ValueError:
+                exc_info = sys.exc_info()
+        yield logging.LogRecord('bench', logging.ERROR if exc_info else logging.INFO, __file__, i,
+                                'processed item %d of %s', (i, {'batch': i // 100, 'source': 'bench'}), exc_info)
+
+
+def bytes_per_record(handler: logging.Handler, records: int, with_exc_info: bool) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for record in _make_records(records, with_exc_info):
+        handler.handle(record)
+    del record
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return retained / records
+
+
+def run(records: int = 10_000) -> dict:
+    results = {}
+    for with_exc_info in (False, True):
+        label = 'with_exc_info' if with_exc_info else 'plain'
+        results[label] = {
+            'LogRecord': bytes_per_record(_FullRecordHandler(records), records, with_exc_info),
+            'RecordSnapshot': bytes_per_record(BufferedRecordHandler(records), records, with_exc_info),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=10_000)
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.records)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for label, result in results.items():
+        for kind, per_record in result.items():
+            print(f"{label:<15} {kind:<15} {per_record:>10.0f} bytes/record")
+
+
+if __name__ == '__main__':
+    main()
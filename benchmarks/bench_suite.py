@@ -0,0 +1,294 @@
+"""
+bench_suite.py
+
+EasyLogger vs plain stdlib logging, case by case:
+    - construction: EasyLogger() and SetupLogger.setup_logger()
+    - latency: one logger call at an enabled and at a disabled level
+    - throughput: the default three level files plus console
+    - components: ColorizedFormatter, CleanANSIFileFormatter, ConsoleOneTimeFilter, BufferedRecordHandler
+
+Every case has an 'easylogger' and a 'stdlib' implementation doing the same work; the
+result is ns per operation (best of --repeat runs) for each and their ratio.
+Use --output to save the results as JSON and --compare to check them against a saved run.
+
+usage: python -m benchmarks.bench_suite [--filter TEXT] [--repeat N] [--json] [--output FILE]
+                                        [--compare FILE] [--threshold 0.2]
+
+the same cases run under pytest-benchmark with: pytest benchmarks/bench_pytest.py
+
+"""
+import argparse
+import json
+import logging
+import logging.handlers
+import platform
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from itertools import cycle
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from EasyLoggerAJM import EasyLogger, SetupLogger
+from EasyLoggerAJM._version import __version__
+from EasyLoggerAJM.logger_parts import BufferedRecordHandler, ColorizedFormatter, ConsoleOneTimeFilter
+from EasyLoggerAJM.logger_parts.formatters import CleanANSIFileFormatter
+from benchmarks._util import devnull_stderr
+
+FORMAT = EasyLogger.DEFAULT_FORMAT
+DEFAULT_LEVELS = (logging.DEBUG, logging.INFO, logging.ERROR)
+
+# setup(log_dir) returns (operation, teardown)
+Setup = Callable[[Path], Tuple[Callable[[], None], Callable[[], None]]]
+
+
+class BenchCase(NamedTuple):
+    name: str
+    group: str
+    easylogger: Setup
+    stdlib: Setup
+
+
+def _close_handlers(logger: logging.Logger):
+    for hnd in logger.handlers[:]:
+        logger.removeHandler(hnd)
+        hnd.close()
+
+
+def _stdlib_logger(name: str, log_dir: Path, levels=DEFAULT_LEVELS, console_level=None) -> logging.Logger:
+    """What EasyLogger sets up, done by hand: one file per level (+ a console handler)."""
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    fmt = logging.Formatter(FORMAT)
+    for level in levels:
+        hnd = logging.FileHandler(Path(log_dir, f'{logging.getLevelName(level)}-{name}.log'))
+        hnd.setLevel(level)
+        hnd.setFormatter(fmt)
+        logger.addHandler(hnd)
+    if console_level is not None:
+        hnd = logging.StreamHandler()
+        hnd.setLevel(console_level)
+        hnd.setFormatter(fmt)
+        logger.addHandler(hnd)
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def _easy_logger(name: str, log_dir: Path, **kwargs) -> logging.Logger:
+    el = EasyLogger(project_name=name, root_log_location=str(log_dir), logger_name=name, propagate=False, **kwargs)
+    return el.logger
+
+
+# construction
+def _construct_easylogger(log_dir):
+    def op():
+        _close_handlers(_easy_logger('bench_construct', log_dir))
+    return op, lambda: None
+
+
+def _construct_stdlib(log_dir):
+    def op():
+        _close_handlers(_stdlib_logger('bench_construct_std', log_dir))
+    return op, lambda: None
+
+
+class _CallableEasyLogger(EasyLogger):
+    def __call__(self):
+        return self.logger
+
+
+def _setup_logger_easylogger(log_dir):
+    previous = SetupLogger.DEFAULT_CUSTOM_LOGGER
+    SetupLogger.DEFAULT_CUSTOM_LOGGER = _CallableEasyLogger
+
+    def op():
+        with devnull_stderr() as devnull:
+            _close_handlers(SetupLogger.setup_logger(project_name='bench_setup', root_log_location=str(log_dir),
+                                                     propagate=False))
+        devnull.close()
+
+    def teardown():
+        SetupLogger.DEFAULT_CUSTOM_LOGGER = previous
+    return op, teardown
+
+
+def _setup_logger_stdlib(log_dir):
+    def op():
+        with devnull_stderr() as devnull:
+            _close_handlers(_stdlib_logger('bench_setup_std', log_dir, console_level=logging.INFO))
+        devnull.close()
+    return op, lambda: None
+
+
+# latency
+def _call(make_logger, level, call_level=logging.INFO):
+    def setup(log_dir):
+        logger = make_logger(log_dir)
+        logger.setLevel(level)
+        log = logger.log
+
+        def op():
+            log(call_level, 'processed item %d of %s', 42, 'batch')
+        return op, lambda: _close_handlers(logger)
+    return setup
+
+
+# throughput
+def _mixed_records(logger):
+    levels = cycle([logging.DEBUG, logging.INFO, logging.INFO, logging.WARNING, logging.ERROR])
+    log = logger.log
+
+    def op():
+        log(next(levels), 'processed item %d of %s', 42, 'batch')
+    return op
+
+
+def _with_console(make_logger):
+    def setup(log_dir):
+        with devnull_stderr() as devnull:
+            logger = make_logger(log_dir)
+
+        def teardown():
+            _close_handlers(logger)
+            devnull.close()
+        return _mixed_records(logger), teardown
+    return setup
+
+
+# components
+def _new_record(msg='processed item %d of %s'):
+    return logging.LogRecord('bench', logging.WARNING, __file__, 0, msg, (42, 'batch'), None)
+
+
+def _format_with(formatter_class):
+    def setup(log_dir):
+        formatter = formatter_class(FORMAT)
+
+        def op():
+            formatter.format(_new_record('\x1b[33mprocessed\x1b[0m item %d of %s'))
+        return op, lambda: None
+    return setup
+
+
+def _filter_with(make_filter):
+    def setup(log_dir):
+        record_filter = make_filter()
+        record = _new_record()
+
+        def op():
+            record_filter.filter(record)
+        return op, lambda: None
+    return setup
+
+
+def _handle_with(make_handler):
+    def setup(log_dir):
+        handler = make_handler()
+        handler.setFormatter(logging.Formatter(FORMAT))
+        record = _new_record()
+
+        def op():
+            handler.handle(record)
+        return op, handler.close
+    return setup
+
+
+CASES: List[BenchCase] = [
+    BenchCase('construct', 'construction', _construct_easylogger, _construct_stdlib),
+    BenchCase('setup_logger', 'construction', _setup_logger_easylogger, _setup_logger_stdlib),
+    BenchCase('enabled_call', 'latency',
+              _call(lambda d: _easy_logger('bench_enabled', d), logging.DEBUG),
+              _call(lambda d: _stdlib_logger('bench_enabled_std', d), logging.DEBUG)),
+    BenchCase('disabled_call', 'latency',
+              _call(lambda d: _easy_logger('bench_disabled', d), logging.WARNING, logging.DEBUG),
+              _call(lambda d: _stdlib_logger('bench_disabled_std', d), logging.WARNING, logging.DEBUG)),
+    BenchCase('files_and_console', 'throughput',
+              _with_console(lambda d: _easy_logger('bench_throughput', d, show_warning_logs_in_console=True)),
+              _with_console(lambda d: _stdlib_logger('bench_throughput_std', d, console_level=logging.WARNING))),
+    BenchCase('colorized_formatter', 'components', _format_with(ColorizedFormatter),
+              _format_with(logging.Formatter)),
+    BenchCase('clean_ansi_file_formatter', 'components', _format_with(CleanANSIFileFormatter),
+              _format_with(logging.Formatter)),
+    BenchCase('console_one_time_filter', 'components', _filter_with(ConsoleOneTimeFilter),
+              _filter_with(logging.Filter)),
+    BenchCase('buffered_record_handler', 'components', _handle_with(lambda: BufferedRecordHandler(1000)),
+              _handle_with(lambda: logging.handlers.BufferingHandler(1000))),
+]
+
+
+def time_setup(setup: Setup, log_dir: Path, repeat: int = 5) -> float:
+    """Return the best ns per call of the operation `setup` builds."""
+    op, teardown = setup(log_dir)
+    try:
+        timer = timeit.Timer(op)
+        number, _ = timer.autorange()
+        return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+    finally:
+        teardown()
+
+
+def run(name_filter: str = '', repeat: int = 5) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in CASES:
+            if name_filter and name_filter not in case.name and name_filter != case.group:
+                continue
+            easy_ns = time_setup(case.easylogger, Path(tmp), repeat)
+            stdlib_ns = time_setup(case.stdlib, Path(tmp), repeat)
+            results[case.name] = {'group': case.group, 'easylogger_ns': easy_ns, 'stdlib_ns': stdlib_ns,
+                                  'ratio': easy_ns / stdlib_ns}
+    return {'meta': {'easyloggerajm': __version__, 'python': platform.python_version(),
+                     'implementation': platform.python_implementation(), 'platform': platform.platform(),
+                     'date': datetime.now().isoformat(timespec='seconds')},
+            'results': results}
+
+
+def compare(current: dict, previous: dict, threshold: float) -> List[str]:
+    """Return a line for each case whose EasyLogger time grew by more than `threshold` (0.2 = 20%)."""
+    regressions = []
+    for name, result in current['results'].items():
+        old = previous.get('results', {}).get(name)
+        if not old:
+            continue
+        change = result['easylogger_ns'] / old['easylogger_ns'] - 1
+        if change > threshold:
+            regressions.append(f"{name}: {old['easylogger_ns']:.0f} ns -> {result['easylogger_ns']:.0f} ns "
+                               f"(+{change:.0%}, was {previous['meta'].get('easyloggerajm')})")
+    return regressions
+
+
+def _print_table(results: Dict[str, dict]):
+    print(f"{'case':<28} {'group':<13} {'EasyLogger':>14} {'stdlib':>14} {'ratio':>7}")
+    for name, result in results.items():
+        print(f"{name:<28} {result['group']:<13} {result['easylogger_ns']:>11.0f} ns "
+              f"{result['stdlib_ns']:>11.0f} ns {result['ratio']:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this, or this group')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    parser.add_argument('--output', type=Path, help='also write the JSON results to this file')
+    parser.add_argument('--compare', type=Path, help='JSON results of an earlier run to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown for --compare (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    results = run(args.filter, args.repeat)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results['results'])
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+soak.py
+
+long-run leak check: drives EasyLogger configurations for many records and repeated
+construct/close cycles, sampling tracemalloc, open file descriptors and handler counts,
+and fails (exit status 1) when any of them grows past its threshold.
+
+scenarios:
+    - construct_close: EasyLogger(...) then close(), over and over on the same logger name
+    - files_and_console: default level files + console, unique warning texts (ConsoleOneTimeFilter)
+    - buffered_handler: a BufferedRecordHandler taking records with args and tracebacks
+
+Growth is measured from the first sample after warm-up (the first quarter of the run) to the last.
+
+usage: python -m benchmarks.soak [--records N] [--cycles N] [--samples N]
+                                 [--max-growth-kb KB] [--scenario NAME] [--json]
+
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from EasyLoggerAJM import EasyLogger
+from EasyLoggerAJM.backend import _InternalLoggerMethods
+from EasyLoggerAJM.logger_parts import BufferedRecordHandler, ConsoleOneTimeFilter
+from benchmarks._util import devnull_stderr
+
+DEFAULT_MAX_GROWTH_KB = 512
+
+
+def open_fd_count() -> Optional[int]:
+    """Number of open file descriptors of this process, None where that can't be read."""
+    for fd_dir in ('/proc/self/fd', '/dev/fd'):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
+
+
+def handler_count(*loggers: logging.Logger) -> int:
+    return sum(len(logger.handlers) for logger in loggers)
+
+
+class SoakSampler:
+    """Collects (step, traced bytes, open fds, handler count) samples while a scenario runs."""
+
+    def __init__(self, loggers: List[logging.Logger]):
+        self.loggers = loggers
+        self.samples: List[dict] = []
+
+    def sample(self, step: int):
+        gc.collect()
+        self.samples.append({'step': step,
+                             'traced_bytes': tracemalloc.get_traced_memory()[0],
+                             'open_fds': open_fd_count(),
+                             'handlers': handler_count(*self.loggers)})
+
+    def growth(self, warmup: float = 0.25) -> dict:
+        start = self.samples[min(int(len(self.samples) * warmup), len(self.samples) - 1)]
+        end = self.samples[-1]
+        return {key: (None if start[key] is None else end[key] - start[key])
+                for key in ('traced_bytes', 'open_fds', 'handlers')}
+
+
+def _every(total: int, samples: int) -> int:
+    return max(1, total // samples)
+
+
+def construct_close(log_dir: Path, cycles: int, records: int, samples: int) -> SoakSampler:
+    logger = logging.getLogger('soak_construct')
+    sampler = SoakSampler([logger, logging.getLogger(_InternalLoggerMethods.INTERNAL_LOGGER_NAME)])
+    step = _every(cycles, samples)
+    for i in range(cycles):
+        el = EasyLogger(project_name='soak_construct', root_log_location=str(log_dir),
+                        logger_name='soak_construct', propagate=False)
+        el.logger.info('cycle %d', i)
+        el.close()
+        if i % step == 0 or i == cycles - 1:
+            sampler.sample(i)
+    return sampler
+
+
+def files_and_console(log_dir: Path, cycles: int, records: int, samples: int) -> SoakSampler:
+    with devnull_stderr() as devnull:
+        el = EasyLogger(project_name='soak_files', root_log_location=str(log_dir), logger_name='soak_files',
+                        propagate=False, show_warning_logs_in_console=True)
+    # a cap the unique warnings reach during warm-up, so what follows shows it holding
+    for hnd in el.logger.handlers:
+        for record_filter in hnd.filters:
+            if isinstance(record_filter, ConsoleOneTimeFilter):
+                record_filter.max_messages = min(record_filter.max_messages, max(1, records // 50))
+    sampler = SoakSampler([el.logger])
+    step = _every(records, samples)
+    try:
+        for i in range(records):
+            if i % 5 == 4:
+                # unique text every time: the worst case for ConsoleOneTimeFilter
+                el.logger.warning(f'slow request {i}')
+            else:
+                el.logger.info('processed item %d', i)
+            if i % step == 0 or i == records - 1:
+                sampler.sample(i)
+    finally:
+        el.close()
+        devnull.close()
+    return sampler
+
+
+def buffered_handler(log_dir: Path, cycles: int, records: int, samples: int) -> SoakSampler:
+    logger = logging.getLogger('soak_buffered')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = BufferedRecordHandler(buffer_size=1000)
+    logger.addHandler(handler)
+    sampler = SoakSampler([logger])
+    step = _every(records, samples)
+    try:
+        for i in range(records):
+            if i % 100 == 99:
+                try:
+                    raise ValueError(f'failure {i}')
+                except ValueError:
+                    logger.exception('item %d failed', i)
+            else:
+                logger.debug('processed item %d with %s', i, {'rows': list(range(10))})
+            if i % step == 0 or i == records - 1:
+                sampler.sample(i)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+    return sampler
+
+
+SCENARIOS: Dict[str, Callable[[Path, int, int, int], SoakSampler]] = {
+    'construct_close': construct_close,
+    'files_and_console': files_and_console,
+    'buffered_handler': buffered_handler,
+}
+
+
+def run(records: int = 1_000_000, cycles: int = 1000, samples: int = 20,
+        max_growth_kb: float = DEFAULT_MAX_GROWTH_KB, scenarios: Optional[List[str]] = None) -> dict:
+    """
+    Run the scenarios and return, per scenario, the samples, the growth after warm-up and
+    whether it passed: traced memory grew by at most max_growth_kb, no fds and no handlers leaked.
+    """
+    results = {}
+    tracemalloc.start()
+    try:
+        for name in scenarios or SCENARIOS:
+            with tempfile.TemporaryDirectory() as tmp:
+                sampler = SCENARIOS[name](Path(tmp), cycles, records, samples)
+            growth = sampler.growth()
+            failures = []
+            if growth['traced_bytes'] > max_growth_kb * 1024:
+                failures.append(f"memory grew by {growth['traced_bytes'] / 1024:.0f} KiB")
+            if growth['open_fds']:
+                failures.append(f"{growth['open_fds']} file descriptor(s) leaked")
+            if growth['handlers']:
+                failures.append(f"{growth['handlers']} handler(s) leaked")
+            results[name] = {'passed': not failures, 'failures': failures,
+                             'growth': growth, 'samples': sampler.samples}
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=1_000_000)
+    parser.add_argument('--cycles', type=int, default=1000)
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--max-growth-kb', type=float, default=DEFAULT_MAX_GROWTH_KB)
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                        help='run only this scenario (can be repeated)')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.records, args.cycles, args.samples, args.max_growth_kb, args.scenario)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            growth = result['growth']
+            status = 'PASS' if result['passed'] else 'FAIL: ' + '; '.join(result['failures'])
+            print(f"{name:<20} memory {growth['traced_bytes'] / 1024:>+9.1f} KiB  fds {growth['open_fds']}  "
+                  f"handlers {growth['handlers']}  {status}")
+    sys.exit(0 if all(result['passed'] for result in results.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
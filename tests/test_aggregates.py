@@ -0,0 +1,154 @@
+import logging
+import threading
+
+import pytest
+
+from EasyLoggerAJM import _EasyLoggerCustomLogger, EasyLogger
+from EasyLoggerAJM.logger_parts import MetricAggregator, PeriodicFlusher
+from EasyLoggerAJM.logger_parts.aggregates import format_metrics_line
+
+
+@pytest.fixture
+def aggregate_logger(caplog):
+    logger = _EasyLoggerCustomLogger('aggregate_test')
+    logger.setLevel(logging.DEBUG)
+    logger.aggregate_interval = 3600
+    logger.addHandler(caplog.handler)
+    yield logger
+    logger.stop_aggregates()
+    logger.removeHandler(caplog.handler)
+
+
+class TestCountAndGauge:
+    def test_one_line_per_interval(self, aggregate_logger, caplog):
+        for _ in range(1000):
+            aggregate_logger.count('items.processed')
+        aggregate_logger.count('bytes.read', 512)
+        aggregate_logger.gauge('queue.depth', 3)
+        aggregate_logger.gauge('queue.depth', 17)
+        assert not caplog.records
+        aggregate_logger.flush_aggregates()
+        assert len(caplog.records) == 1
+        record = caplog.records[0]
+        assert record.levelno == logging.INFO
+        assert record.getMessage().startswith('metrics interval=')
+        assert record.getMessage().endswith('bytes.read=512 items.processed=1000 queue.depth=17')
+        assert record.aggregates['counters'] == {'items.processed': 1000, 'bytes.read': 512}
+
+    def test_counters_reset_gauges_persist(self, aggregate_logger, caplog):
+        aggregate_logger.count('events')
+        aggregate_logger.gauge('workers', 4)
+        aggregate_logger.flush_aggregates()
+        aggregate_logger.flush_aggregates()
+        assert caplog.records[1].aggregates['counters'] == {}
+        assert caplog.records[1].aggregates['gauges'] == {'workers': 4}
+
+    def test_nothing_to_report_logs_nothing(self, aggregate_logger, caplog):
+        aggregate_logger.aggregates.take()
+        aggregate_logger.flush_aggregates()
+        assert not caplog.records
+
+    def test_process_stats(self, caplog):
+        logger = _EasyLoggerCustomLogger('aggregate_process_test')
+        logger.aggregate_interval = 3600
+        logger.aggregate_process_stats = True
+        logger.addHandler(caplog.handler)
+        try:
+            logger.flush_aggregates()
+            assert not caplog.records
+            logger.gauge('x', 1)
+            logger.flush_aggregates()
+        finally:
+            logger.stop_aggregates()
+        process = caplog.records[0].aggregates['process']
+        assert process.get('rss_bytes', process.get('max_rss_bytes', 1)) > 0
+        assert {'gc_gen0', 'gc_gen1', 'gc_gen2'} <= set(process)
+
+    def test_background_flush_and_timings(self, caplog):
+        logger = _EasyLoggerCustomLogger('aggregate_background_test')
+        logger.aggregate_interval = 0.01
+        logger.timing_interval = 3600
+        logger.addHandler(caplog.handler)
+        try:
+            with logger.timed('step'):
+                logger.count('items')
+            flushed = threading.Event()
+            logger.addFilter(lambda record: flushed.set() or True)
+            assert flushed.wait(5)
+        finally:
+            logger.stop_aggregates()
+        messages = [r.getMessage() for r in caplog.records]
+        assert any(m.startswith('metrics ') and 'items=1' in m for m in messages)
+        assert any(m.startswith('timing step:') for m in messages)
+
+    def test_stop_flushes_and_allows_restart(self, aggregate_logger, caplog):
+        aggregate_logger.count('before_stop')
+        aggregate_logger.stop_aggregates()
+        assert 'before_stop=1' in caplog.records[-1].getMessage()
+        assert aggregate_logger._aggregate_flusher is None
+        aggregate_logger.count('after_restart')
+        assert aggregate_logger._aggregate_flusher.running
+
+
+class TestEasyLoggerAggregates:
+    def test_lines_go_to_the_info_file(self, tmp_path):
+        el = EasyLogger(project_name='aggregate_test', root_log_location=str(tmp_path),
+                        logger_name='aggregate_el', propagate=False,
+                        aggregates={'interval': 3600, 'process_stats': True})
+        try:
+            assert el.logger._aggregate_flusher.running
+            el.logger.count('rows', 250)
+        finally:
+            el.close()
+        info_file = next(path for path in tmp_path.rglob('*.log') if 'info' in path.name.lower())
+        assert 'rows=250' in info_file.read_text()
+        assert el.logger._aggregate_flusher is None
+
+    def test_close_stops_a_flusher_started_by_count(self, tmp_path):
+        el = EasyLogger(project_name='aggregate_test', root_log_location=str(tmp_path),
+                        logger_name='aggregate_implicit', propagate=False)
+        try:
+            el.logger.count('rows', 3)
+            assert el.aggregates is None and el.logger._aggregate_flusher.running
+        finally:
+            el.close()
+        assert el.logger._aggregate_flusher is None
+        info_file = next(path for path in tmp_path.rglob('*.log') if 'info' in path.name.lower())
+        assert 'rows=3' in info_file.read_text()
+
+
+def test_concurrent_counts():
+    aggregator = MetricAggregator()
+
+    def work():
+        for _ in range(10000):
+            aggregator.count('n')
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert aggregator.take()['counters'] == {'n': 40000}
+
+
+def test_periodic_flusher_stop_is_idempotent():
+    calls = []
+    flusher = PeriodicFlusher(lambda: calls.append(1), 3600).start()
+    flusher.stop()
+    flusher.stop()
+    assert calls == [1]
+
+
+@pytest.mark.parametrize('interval', [0, -1])
+def test_periodic_flusher_needs_a_positive_interval(interval, aggregate_logger):
+    with pytest.raises(ValueError):
+        PeriodicFlusher(lambda: None, interval)
+    aggregate_logger.aggregate_interval = interval
+    with pytest.raises(ValueError):
+        aggregate_logger.count('n')
+    assert aggregate_logger._aggregates is None
+
+
+def test_format_metrics_line():
+    snapshot = {'interval': 60.04, 'counters': {'b': 2, 'a': 1}, 'gauges': {'ratio': 0.25}, 'process': {}}
+    assert format_metrics_line(snapshot) == 'metrics interval=60.0s a=1 b=2 ratio=0.25'
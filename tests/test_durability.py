@@ -0,0 +1,104 @@
+import logging
+import os
+
+import pytest
+from EasyLoggerAJM.easy_logger import EasyLogger
+from EasyLoggerAJM.logger_parts import FsyncPolicy, DurableFileHandler, GzipFileHandler
+
+
+def _record(level=logging.INFO):
+    return logging.LogRecord("durable", level, "path", 1, "msg", None, None)
+
+
+@pytest.fixture
+def fsync_calls(monkeypatch):
+    calls = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (calls.append(fd), real_fsync(fd)))
+    return calls
+
+
+class TestFsyncPolicy:
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            FsyncPolicy('sometimes')
+
+    def test_never_and_always(self):
+        assert FsyncPolicy('never').should_sync(_record(logging.CRITICAL)) is False
+        assert FsyncPolicy('always').should_sync(_record()) is True
+
+    def test_batch(self):
+        policy = FsyncPolicy('batch', batch_size=3)
+        assert [policy.should_sync(_record()) for _ in range(3)] == [False, False, True]
+
+    def test_error(self):
+        policy = FsyncPolicy('error')
+        assert policy.should_sync(_record(logging.WARNING)) is False
+        assert policy.should_sync(_record(logging.ERROR)) is True
+
+    def test_from_value(self):
+        policy = FsyncPolicy('batch', batch_size=2)
+        copied = FsyncPolicy.from_value(policy)
+        assert copied is not policy and (copied.mode, copied.batch_size) == ('batch', 2)
+        assert FsyncPolicy.from_value(None).mode == 'never'
+        with pytest.raises(TypeError):
+            FsyncPolicy.from_value(1)
+
+
+class TestDurableHandlers:
+    def test_durable_file_handler_fsyncs_on_error(self, tmp_path, fsync_calls):
+        handler = DurableFileHandler(tmp_path / "durable.log", durability_policy='error')
+        handler.handle(_record(logging.INFO))
+        assert fsync_calls == []
+        handler.handle(_record(logging.ERROR))
+        assert len(fsync_calls) == 1
+        handler.close()
+        # closing a handler with a policy always fsyncs
+        assert len(fsync_calls) == 2
+
+    def test_gzip_handler_supports_policy(self, tmp_path, fsync_calls):
+        handler = GzipFileHandler(tmp_path / "durable.log", durability_policy='always', flush_interval=3600)
+        handler.handle(_record())
+        assert len(fsync_calls) == 1
+        assert GzipFileHandler.read_text(tmp_path / "durable.log.gz") == "msg\n"
+        handler.close()
+
+    def test_per_level_policy_in_file_logger_levels(self, tmp_path):
+        el = EasyLogger(project_name="DurableProject", root_log_location=str(tmp_path),
+                        logger_name="durable_logger",
+                        file_logger_levels=['DEBUG', 'INFO', ('ERROR', 'error')])
+        try:
+            by_level = {h.level: h for h in el.logger.handlers}
+            assert el.file_logger_levels == [10, 20, 40]
+            assert type(by_level[logging.DEBUG]) is logging.FileHandler
+            assert isinstance(by_level[logging.ERROR], DurableFileHandler)
+            assert by_level[logging.ERROR].durability_policy.mode == 'error'
+        finally:
+            for h in el.logger.handlers[:]:
+                el.logger.removeHandler(h)
+                h.close()
+
+    def test_handlers_do_not_share_a_policy(self, tmp_path, fsync_calls):
+        policy = FsyncPolicy('batch', batch_size=2)
+        first = DurableFileHandler(tmp_path / "first.log", durability_policy=policy)
+        second = DurableFileHandler(tmp_path / "second.log", durability_policy=policy)
+        try:
+            first.handle(_record())
+            second.handle(_record())
+            # one record each: neither handler reached its batch
+            assert fsync_calls == []
+        finally:
+            first.close()
+            second.close()
+
+    def test_default_policy_and_dict_levels(self, tmp_path):
+        el = EasyLogger(project_name="DurableProject2", root_log_location=str(tmp_path),
+                        logger_name="durable_logger_2", durability_policy='batch',
+                        file_logger_levels={'INFO': None, 'ERROR': 'always'})
+        try:
+            policies = {h.level: h.durability_policy.mode for h in el.logger.handlers}
+            assert policies == {logging.INFO: 'batch', logging.ERROR: 'always'}
+        finally:
+            for h in el.logger.handlers[:]:
+                el.logger.removeHandler(h)
+                h.close()
@@ -103,3 +103,23 @@ class TestEasyLogger:
         stream_handlers = [h for h in el.logger.handlers if
                            isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)]
         assert any(h.level == logging.WARNING for h in stream_handlers)
+
+    def test_close_removes_and_closes_own_handlers(self, test_attrs):
+        logger = logging.getLogger('close_test')
+        preexisting = logging.NullHandler()
+        logger.addHandler(preexisting)
+        try:
+            el = EasyLogger(**test_attrs, logger_name='close_test', show_warning_logs_in_console=True)
+            added = [h for h in el.logger.handlers if h is not preexisting]
+            assert added
+            el.close()
+            assert el.logger.handlers == [preexisting]
+            assert all(h.stream is None for h in added if isinstance(h, logging.FileHandler))
+        finally:
+            logger.removeHandler(preexisting)
+
+    def test_repeated_construction_with_close_does_not_accumulate_handlers(self, test_attrs):
+        for _ in range(5):
+            el = EasyLogger(**test_attrs, logger_name='close_cycle_test')
+            el.close()
+        assert logging.getLogger('close_cycle_test').handlers == []
@@ -1,5 +1,11 @@
+import os
+import time
+import pytest
 import logging
-from EasyLoggerAJM.logger_parts import BufferedRecordHandler, LastRecordHandler, HourlyRotatingFileHandler
+from pathlib import Path
+from EasyLoggerAJM.easy_logger import EasyLogger
+from EasyLoggerAJM.logger_parts import (BufferedRecordHandler, LastRecordHandler, HourlyRotatingFileHandler,
+                                        SizeAndTimeRotatingFileHandler, GzipFileHandler, MmapFileHandler)
 
 
 class TestBufferedRecordHandler:
@@ -47,3 +53,246 @@ class TestHourlyRotatingFileHandler:
         # In some python versions, interval is stored in seconds
         assert handler.interval == 1 or handler.interval == 3600
         handler.close()
+
+
+class TestSizeAndTimeRotatingFileHandler:
+    @staticmethod
+    def _record(msg, created=None):
+        record = logging.LogRecord("test_hybrid", logging.INFO, "path", 1, msg, None, None)
+        if created is not None:
+            record.created = created
+        return record
+
+    def test_rolls_over_on_size(self, tmp_path):
+        log_file = tmp_path / "hybrid.log"
+        handler = SizeAndTimeRotatingFileHandler(str(log_file), maxBytes=10, when='H')
+        try:
+            for i in range(6):
+                handler.handle(self._record(f"message number {i}"))
+            stats = handler.stats()
+        finally:
+            handler.close()
+
+        assert stats['rollovers'] >= 2
+        assert log_file.read_text().startswith("message number 0")
+        assert (tmp_path / "hybrid.1.log").read_text().startswith("message number 1")
+        # the pre-opened segment that was never used is cleaned up on close
+        assert not any(p.stat().st_size == 0 for p in tmp_path.iterdir())
+
+    def test_rolls_over_on_time(self, tmp_path):
+        log_file = tmp_path / "hybrid_time.log"
+        handler = SizeAndTimeRotatingFileHandler(str(log_file), maxBytes=0, when='S', interval=60)
+        try:
+            handler.handle(self._record("first"))
+            handler.handle(self._record("second", created=handler._rollover_at + 1))
+            stats = handler.stats()
+        finally:
+            handler.close()
+
+        assert stats['rollovers'] == 1
+        assert stats['last_rollover_ns'] > 0
+        assert (tmp_path / "hybrid_time.1.log").read_text() == "second\n"
+
+    def test_backup_count_prunes_old_segments(self, tmp_path):
+        log_file = tmp_path / "hybrid_prune.log"
+        handler = SizeAndTimeRotatingFileHandler(str(log_file), maxBytes=1, backupCount=2)
+        try:
+            for i in range(6):
+                handler.handle(self._record(f"msg {i}"))
+        finally:
+            handler.close()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["hybrid_prune.3.log", "hybrid_prune.4.log",
+                                                              "hybrid_prune.5.log"]
+
+    def test_counts_encoded_bytes(self, tmp_path):
+        log_file = tmp_path / "hybrid_bytes.log"
+        handler = SizeAndTimeRotatingFileHandler(str(log_file), maxBytes=9, encoding='utf-8')
+        try:
+            # 5 characters, 9 bytes
+            handler.handle(self._record("żółć"))
+            assert handler.stats()['segment_bytes'] == log_file.stat().st_size == 9
+            handler.handle(self._record("next"))
+        finally:
+            handler.close()
+
+        assert (tmp_path / "hybrid_bytes.1.log").read_text(encoding='utf-8') == "next\n"
+
+    def test_continues_after_segments_of_an_earlier_run(self, tmp_path):
+        log_file = tmp_path / "hybrid_restart.log"
+        handler = SizeAndTimeRotatingFileHandler(str(log_file), maxBytes=1)
+        try:
+            for i in range(3):
+                handler.handle(self._record(f"run 1 msg {i}"))
+        finally:
+            handler.close()
+
+        handler = SizeAndTimeRotatingFileHandler(str(log_file), maxBytes=1, backupCount=2)
+        try:
+            assert handler.stats()['current_segment'] == str(tmp_path / "hybrid_restart.2.log")
+            handler.handle(self._record("run 2 msg 0"))
+        finally:
+            handler.close()
+
+        assert (tmp_path / "hybrid_restart.2.log").read_text() == "run 1 msg 2\n"
+        assert (tmp_path / "hybrid_restart.3.log").read_text() == "run 2 msg 0\n"
+        # segments of the earlier run count towards backupCount
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["hybrid_restart.1.log", "hybrid_restart.2.log",
+                                                              "hybrid_restart.3.log"]
+
+    def test_next_segment_is_not_opened_up_front(self, tmp_path):
+        log_file = tmp_path / "hybrid_idle.log"
+        handler = SizeAndTimeRotatingFileHandler(str(log_file), maxBytes=1000)
+        try:
+            handler.handle(self._record("short"))
+            assert [p.name for p in tmp_path.iterdir()] == ["hybrid_idle.log"]
+        finally:
+            handler.close()
+
+    def test_invalid_when(self, tmp_path):
+        with pytest.raises(ValueError):
+            SizeAndTimeRotatingFileHandler(str(tmp_path / "bad.log"), when='W')
+
+
+class TestGzipFileHandler:
+    def test_appends_gz_suffix_and_compresses(self, tmp_path):
+        handler = GzipFileHandler(str(tmp_path / "DEBUG-proj-1200.log"), flush_records=10_000, flush_interval=3600)
+        try:
+            for i in range(2000):
+                handler.handle(logging.LogRecord("gz", logging.DEBUG, "path", 1,
+                                                 "a fairly repetitive debug line %d", (i,), None))
+        finally:
+            handler.close()
+
+        gz_file = tmp_path / "DEBUG-proj-1200.log.gz"
+        text = GzipFileHandler.read_text(gz_file)
+        assert text.splitlines()[0] == "a fairly repetitive debug line 0"
+        assert len(text.splitlines()) == 2000
+        assert gz_file.stat().st_size * 10 < len(text)
+
+    def test_readable_up_to_last_sync_flush_without_close(self, tmp_path):
+        handler = GzipFileHandler(str(tmp_path / "crash.log"), flush_records=2, flush_interval=3600)
+        for msg in ("one", "two", "three"):
+            handler.handle(logging.LogRecord("gz", logging.DEBUG, "path", 1, msg, None, None))
+        # no close(): simulate a crash, only the first two records were sync-flushed
+        assert GzipFileHandler.read_text(tmp_path / "crash.log.gz") == "one\ntwo\n"
+        handler.close()
+        assert GzipFileHandler.read_text(tmp_path / "crash.log.gz") == "one\ntwo\nthree\n"
+
+    def test_idle_handler_flushes_after_flush_interval(self, tmp_path):
+        handler = GzipFileHandler(str(tmp_path / "idle.log"), flush_records=10_000, flush_interval=0.2)
+        try:
+            handler.handle(logging.LogRecord("gz", logging.DEBUG, "path", 1, "tail", None, None))
+            assert GzipFileHandler.read_text(tmp_path / "idle.log.gz") == ""
+            deadline = time.monotonic() + 5
+            while handler._flush_timer is not None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # no further records: the timer flushed the tail
+            assert GzipFileHandler.read_text(tmp_path / "idle.log.gz") == "tail\n"
+        finally:
+            handler.close()
+
+    def test_easy_logger_file_handler_class(self, tmp_path):
+        el = EasyLogger(project_name="GzProject", root_log_location=str(tmp_path / "gz_logs"),
+                        file_handler_class=GzipFileHandler, logger_name="gz_logger")
+        try:
+            gz_handlers = [h for h in el.logger.handlers if isinstance(h, GzipFileHandler)]
+            assert len(gz_handlers) == len(el.file_logger_levels)
+            assert sorted(Path(h.baseFilename).name for h in gz_handlers) == sorted(
+                f"{lvl}-GzProject-{el.timestamp}.log.gz" for lvl in ("DEBUG", "INFO", "ERROR"))
+        finally:
+            for h in el.logger.handlers[:]:
+                el.logger.removeHandler(h)
+                h.close()
+
+
+class TestMmapFileHandler:
+    @staticmethod
+    def _record(msg):
+        return logging.LogRecord("mmap", logging.DEBUG, "path", 1, msg, None, None)
+
+    def test_writes_and_trims_on_close(self, tmp_path):
+        log_file = tmp_path / "DEBUG-proj-1200.log"
+        handler = MmapFileHandler(str(log_file), segment_size=4096)
+        assert log_file.stat().st_size == 4096
+        handler.handle(self._record("first"))
+        handler.handle(self._record("second"))
+        handler.close()
+        assert log_file.read_text() == "first\nsecond\n"
+
+    def test_rolls_to_new_segment_when_full(self, tmp_path):
+        log_file = tmp_path / "mm.log"
+        handler = MmapFileHandler(str(log_file), segment_size=16)
+        for msg in ("0123456789", "abcdefghij", "klmnopqrst"):
+            handler.handle(self._record(msg))
+        handler.close()
+        assert log_file.read_text() == "0123456789\n"
+        assert (tmp_path / "mm.1.log").read_text() == "abcdefghij\n"
+        assert (tmp_path / "mm.2.log").read_text() == "klmnopqrst\n"
+
+    def test_record_larger_than_segment(self, tmp_path):
+        log_file = tmp_path / "big.log"
+        handler = MmapFileHandler(str(log_file), segment_size=8)
+        handler.handle(self._record("x" * 100))
+        handler.close()
+        assert (tmp_path / "big.1.log").read_text() == "x" * 100 + "\n"
+
+    def test_reopen_appends_after_unclean_shutdown(self, tmp_path):
+        log_file = tmp_path / "crash.log"
+        handler = MmapFileHandler(str(log_file), segment_size=4096)
+        handler.handle(self._record("before crash"))
+        handler.stream.flush()
+        # simulate a crash: the file keeps its preallocated NUL tail
+        assert log_file.stat().st_size == 4096
+
+        handler.stream.close()
+        os.close(handler._fd)
+
+        handler2 = MmapFileHandler(str(log_file), segment_size=4096)
+        handler2.handle(self._record("after restart"))
+        handler2.close()
+        assert log_file.read_text() == "before crash\nafter restart\n"
+
+    def test_restart_continues_in_the_newest_segment(self, tmp_path):
+        log_file = tmp_path / "resume.log"
+        handler = MmapFileHandler(str(log_file), segment_size=16)
+        for msg in ("0123456789", "abcdefghij", "klmnopq"):
+            handler.handle(self._record(msg))
+        handler.close()
+
+        handler = MmapFileHandler(str(log_file), segment_size=16)
+        handler.handle(self._record("rs"))
+        handler.handle(self._record("tuvwxyz"))
+        handler.close()
+        assert log_file.read_text() == "0123456789\n"
+        assert (tmp_path / "resume.1.log").read_text() == "abcdefghij\n"
+        assert (tmp_path / "resume.2.log").read_text() == "klmnopq\nrs\n"
+        assert (tmp_path / "resume.3.log").read_text() == "tuvwxyz\n"
+
+    def test_mode_w_starts_over(self, tmp_path):
+        log_file = tmp_path / "fresh.log"
+        handler = MmapFileHandler(str(log_file), segment_size=16)
+        for msg in ("0123456789", "abcdefghij", "klmnopqrst"):
+            handler.handle(self._record(msg))
+        handler.close()
+
+        handler = MmapFileHandler(str(log_file), mode='w', segment_size=16)
+        handler.handle(self._record("new"))
+        handler.close()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["fresh.log"]
+        assert log_file.read_text() == "new\n"
+
+    def test_easy_logger_file_handler_class(self, tmp_path):
+        el = EasyLogger(project_name="MmapProject", root_log_location=str(tmp_path / "mmap_logs"),
+                        file_handler_class=MmapFileHandler, file_handler_kwargs={'segment_size': 1024 * 1024},
+                        logger_name="mmap_logger")
+        try:
+            el.logger.debug("debug line")
+            handlers = [h for h in el.logger.handlers if isinstance(h, MmapFileHandler)]
+            assert len(handlers) == 3
+        finally:
+            for h in el.logger.handlers[:]:
+                el.logger.removeHandler(h)
+                h.close()
+        debug_file = Path(el.log_location, f"DEBUG-MmapProject-{el.timestamp}.log")
+        assert debug_file.read_text().rstrip().endswith("debug line")
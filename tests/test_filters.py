@@ -12,3 +12,13 @@ class TestConsoleOneTimeFilter:
         assert filt.filter(record1) is True
         assert filt.filter(record2) is False  # Same message, should be filtered out
         assert filt.filter(record3) is True  # Different message, should pass
+
+    def test_console_one_time_filter_is_bounded(self):
+        filt = ConsoleOneTimeFilter(max_messages=2)
+        records = [logging.LogRecord("test", logging.WARNING, "path", 1, f"message {i}", None, None)
+                   for i in range(3)]
+        assert [filt.filter(r) for r in records] == [True, True, True]
+        assert len(filt.logged_messages) == 2
+        # the oldest message was forgotten, the newer ones are still filtered
+        assert filt.filter(records[0]) is True
+        assert filt.filter(records[2]) is False
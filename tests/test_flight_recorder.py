@@ -0,0 +1,74 @@
+import logging
+import sys
+
+from EasyLoggerAJM import EasyLogger
+from EasyLoggerAJM.logger_parts import FlightRecorderHandler
+from EasyLoggerAJM.UncaughtExceptionHook.uncaught_exception_hook import UncaughtExceptionHook
+
+
+def _log(handler, level, msg):
+    handler.handle(logging.LogRecord("recorder", level, "dummy_path", 0, msg, None, None))
+
+
+class TestFlightRecorderHandler:
+    def test_keeps_debug_in_memory_until_error(self, tmp_path):
+        recorder = FlightRecorderHandler(tmp_path, buffer_size=3)
+        for i in range(5):
+            _log(recorder, logging.DEBUG, f"debug {i}")
+        assert not recorder.crash_path.exists()
+        assert recorder.get_all_messages() == ["debug 2", "debug 3", "debug 4"]
+
+        _log(recorder, logging.ERROR, "it broke")
+        text = recorder.crash_path.read_text()
+        assert "flight recorder dump (ERROR record from recorder)" in text
+        assert "debug 2" not in text
+        assert text.endswith("debug 3\ndebug 4\nit broke\n")
+        recorder.close()
+
+    def test_repeated_dumps_only_write_new_records(self, tmp_path):
+        recorder = FlightRecorderHandler(tmp_path, buffer_size=10)
+        _log(recorder, logging.INFO, "before")
+        _log(recorder, logging.ERROR, "first error")
+        _log(recorder, logging.ERROR, "second error")
+        assert recorder.dump() is None
+        text = recorder.crash_path.read_text()
+        assert text.count("before") == 1
+        assert text.count("first error") == 1
+        assert recorder.dump_count == 2
+        recorder.close()
+
+    def test_easy_logger_opt_in_without_debug_file(self, tmp_path):
+        el = EasyLogger(project_name="FlightProject", root_log_location=str(tmp_path),
+                        file_logger_levels=["INFO", "ERROR"], flight_recorder={'buffer_size': 50})
+        el.logger.debug("debug context")
+        assert not el.flight_recorder.crash_path.exists()
+        el.logger.error("failure")
+        crash_text = el.flight_recorder.crash_path.read_text()
+        assert "debug context" in crash_text
+        assert el.flight_recorder.crash_path.parent == el.log_location
+        debug_files = [p for p in tmp_path.rglob("*.log") if p.name.startswith("DEBUG")]
+        assert not debug_files
+        el.flight_recorder.close()
+        el.logger.removeHandler(el.flight_recorder)
+
+
+class TestUncaughtExceptionDump:
+    def test_show_exception_and_exit_dumps_recorders(self, tmp_path, mocker):
+        recorder = FlightRecorderHandler(tmp_path, buffer_size=5)
+        _log(recorder, logging.DEBUG, "context before crash")
+
+        hook = UncaughtExceptionHook(lazy=True)
+        hook.log_file_name = tmp_path / "unhandled_exception.log"
+        mocker.patch.object(hook, "_log_exception")
+        exit_mock = mocker.patch.object(UncaughtExceptionHook, "wait_for_key_and_exit")
+        mocker.patch.object(sys, "__excepthook__")
+        try:
+            raise RuntimeError("crash")
+        except RuntimeError:
+            hook.show_exception_and_exit(*sys.exc_info())
+
+        exit_mock.assert_called_once()
+        text = recorder.crash_path.read_text()
+        assert "uncaught RuntimeError" in text
+        assert "context before crash" in text
+        recorder.close()
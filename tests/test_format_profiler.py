@@ -0,0 +1,83 @@
+import logging
+
+import pytest
+
+from EasyLoggerAJM import _EasyLoggerCustomLogger, EasyLogger
+from EasyLoggerAJM.logger_parts import WastedFormatProfiler
+
+
+@pytest.fixture
+def profiled_logger():
+    logger = _EasyLoggerCustomLogger('format_profiler_test')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = logging.NullHandler()
+    handler.setLevel(logging.WARNING)
+    logger.addHandler(handler)
+    logger.format_profiler = WastedFormatProfiler()
+    return logger
+
+
+def _sites(logger):
+    return {row['site'].split(' (')[0].rsplit(':', 1)[1]: row for row in logger.format_profiler.report(None)}
+
+
+class TestWastedFormatProfiler:
+    def test_dropped_by_level_and_by_handlers(self, profiled_logger):
+        value = {'a': 1}
+        for _ in range(3):
+            profiled_logger.debug(f"state {value!r}")
+        for _ in range(2):
+            profiled_logger.info("state %s" % value)
+        rows = profiled_logger.format_profiler.report()
+        assert [(row['count'], row['dropped_by_level'], row['dropped_by_handlers']) for row in rows] == \
+               [(3, 3, 0), (2, 0, 2)]
+        assert all(row['site'].startswith(__file__) for row in rows)
+        assert rows[0]['estimated_wasted_ns'] > 0
+
+    def test_lazy_literal_and_emitted_messages_are_not_waste(self, profiled_logger):
+        value = 1
+        profiled_logger.debug("state %s", value)
+        profiled_logger.debug("a literal")
+        profiled_logger.warning(f"emitted {value}")
+        assert profiled_logger.format_profiler.report() == []
+
+    def test_log_and_exception_report_the_caller(self, profiled_logger):
+        value = 1
+        profiled_logger.log(logging.DEBUG, f"via log {value}")
+        try:
+            raise ValueError
+        except ValueError:
+            profiled_logger.exception(f"dropped? {value}")
+        # ERROR passes the WARNING handler, only the log() call is waste
+        rows = profiled_logger.format_profiler.report()
+        assert len(rows) == 1
+        assert rows[0]['site'].endswith('(test_log_and_exception_report_the_caller)')
+
+    def test_propagation_to_parent_handlers(self, profiled_logger):
+        parent = logging.Logger('format_profiler_parent')
+        parent.addHandler(logging.NullHandler())
+        profiled_logger.parent = parent
+        assert not profiled_logger._has_emitting_handler(logging.INFO)
+        profiled_logger.propagate = True
+        assert profiled_logger._has_emitting_handler(logging.INFO)
+
+    def test_format_report(self, profiled_logger):
+        for i in range(5):
+            profiled_logger.debug(f"item {i}")
+        report = profiled_logger.format_profiler.format_report()
+        assert report.splitlines()[0] == 'wasted message formatting, top 1 of 1 call site(s):'
+        assert '5 msg(s) (level 5, handlers 0, avg 6 chars)' in report
+
+
+def test_easy_logger_kwarg(tmp_path):
+    el = EasyLogger(project_name='format_profiler_test', root_log_location=str(tmp_path),
+                    logger_name='format_profiler_el', propagate=False, profile_formatting=True)
+    try:
+        assert el.logger.format_profiler is el.format_profiler
+        # the DEBUG file accepts everything
+        el.logger.debug(f"kept {el!r}")
+        assert el.format_profiler.report() == []
+    finally:
+        el.close()
+        el.logger.format_profiler = None
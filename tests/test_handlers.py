@@ -2,7 +2,7 @@ import pytest
 import logging
 from io import StringIO
 import sys
-from EasyLoggerAJM.logger_parts.handlers import StreamHandlerIgnoreExecInfo
+from EasyLoggerAJM.logger_parts.handlers import StreamHandlerIgnoreExecInfo, LastRecordHandler
 
 
 @pytest.fixture
@@ -45,3 +45,57 @@ class TestStreamHandlerIgnoreExecInfo:
 
             handler.emit(record)
             assert record.exc_info == exc_info
+
+
+class TestLastRecordHandlerIndex:
+    @staticmethod
+    def _log(handler, name, level, msg):
+        handler.handle(logging.LogRecord(name, level, "dummy_path", 0, msg, None, None))
+
+    def test_per_level_and_per_logger_slots(self):
+        handler = LastRecordHandler()
+        self._log(handler, "app.db", logging.ERROR, "db down")
+        self._log(handler, "app.web", logging.WARNING, "slow request")
+        self._log(handler, "app.db", logging.INFO, "db back")
+
+        assert handler.get_last_message() == "db back"
+        assert handler.get_last_message(level="ERROR") == "db down"
+        assert handler.get_last_message(level=logging.WARNING) == "slow request"
+        assert handler.get_last_message(logger_name="app.db") == "db back"
+        assert handler.get_last_record(logger_name="app.web").levelno == logging.WARNING
+        assert handler.get_last_message(level="CRITICAL") is None
+        with pytest.raises(ValueError):
+            handler.get_last_record(level="ERROR", logger_name="app.db")
+
+    def test_counters_only_go_up(self):
+        handler = LastRecordHandler()
+        for i in range(3):
+            self._log(handler, "app", logging.ERROR, f"error {i}")
+        self._log(handler, "other", logging.INFO, "info")
+        assert handler.get_counts() == {'total': 4, 'levels': {'ERROR': 3, 'INFO': 1},
+                                        'loggers': {'app': 3, 'other': 1}}
+        assert handler._get_slot(level="ERROR").seq == 3
+
+    def test_per_logger_slots_are_capped(self):
+        handler = LastRecordHandler(max_loggers=2)
+        self._log(handler, "a", logging.INFO, "a 1")
+        self._log(handler, "b", logging.INFO, "b 1")
+        self._log(handler, "a", logging.INFO, "a 2")
+        self._log(handler, "c", logging.INFO, "c 1")
+        # "b" logged least recently
+        assert handler.get_last_message(logger_name="b") is None
+        assert handler.get_last_message(logger_name="a") == "a 2"
+        assert handler.get_counts()['loggers'] == {'a': 2, 'c': 1}
+        assert handler.get_counts()['total'] == 4
+
+    def test_message_is_rendered_lazily_once(self, mocker):
+        handler = LastRecordHandler()
+        spy = mocker.spy(handler, "format")
+        self._log(handler, "app", logging.ERROR, "boom")
+        assert spy.call_count == 0
+        handler.get_last_message()
+        handler.get_last_message(level="ERROR")
+        handler.get_last_message(logger_name="app")
+        assert spy.call_count == 1
+        handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        assert handler.get_last_message() == "ERROR: boom"
@@ -0,0 +1,132 @@
+import io
+import logging
+
+import pytest
+
+from EasyLoggerAJM import EasyLogger
+from EasyLoggerAJM.logger_parts import (LatencyHistogram, LastRecordHandler, instrument_handler, get_handler_stats,
+                                        HandlerStats)
+
+
+@pytest.fixture
+def stream_handler():
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    return handler
+
+
+def _record(msg='hello', level=logging.INFO):
+    return logging.LogRecord('test', level, __file__, 0, msg, None, None)
+
+
+class TestLatencyHistogram:
+    def test_record_and_snapshot(self):
+        histogram = LatencyHistogram()
+        for elapsed in (100, 100, 100, 5000):
+            histogram.record(elapsed)
+        snapshot = histogram.snapshot()
+        assert snapshot['count'] == 4
+        assert snapshot['mean_ns'] == 1325
+        assert snapshot['max_ns'] == 5000
+        assert snapshot['p50_ns'] == 106  # interpolated inside the [64, 128) bucket
+        assert snapshot['p99_ns'] == 5000
+        assert snapshot['buckets'] == {128: 3, 8192: 1}
+
+    def test_empty(self):
+        assert LatencyHistogram().snapshot()['p50_ns'] == 0
+
+    def test_reset_keeps_the_bucket_list(self):
+        histogram = LatencyHistogram()
+        buckets = histogram.buckets
+        histogram.record(10)
+        histogram.reset()
+        assert histogram.count == 0
+        assert histogram.buckets is buckets
+
+
+class TestInstrumentHandler:
+    def test_counts_emits_and_bytes(self, stream_handler):
+        stats = instrument_handler(stream_handler, latency_sample_every=1)
+        stream_handler.handle(_record('hello'))
+        stream_handler.handle(_record('hi'))
+        assert stats.emitted == 2
+        assert stats.bytes_written == len(stream_handler.stream.getvalue()) == len('hello\nhi\n')
+        assert stats.latency.count == 2
+
+    def test_counts_errors(self, stream_handler, monkeypatch):
+        monkeypatch.setattr(logging, 'raiseExceptions', False)
+        stats = instrument_handler(stream_handler)
+        stream_handler.stream.close()
+        # the first (timed) emit and an untimed one
+        stream_handler.handle(_record())
+        stream_handler.handle(_record())
+        assert stats.errors == 2
+        assert stats.emitted == 2
+        assert stats.bytes_written == 0
+
+    def test_counts_dropped_records(self, stream_handler):
+        stats = instrument_handler(stream_handler)
+        stream_handler.addFilter(lambda record: record.levelno >= logging.WARNING)
+        stream_handler.handle(_record(level=logging.INFO))
+        stream_handler.handle(_record(level=logging.ERROR))
+        assert stats.dropped == 1
+        assert stats.emitted == 1
+
+    def test_latency_is_sampled(self, stream_handler):
+        stats = instrument_handler(stream_handler)
+        every = HandlerStats.LATENCY_SAMPLE_EVERY
+        for _ in range(every + 1):
+            stream_handler.handle(_record())
+        # the first record and the one after a full interval
+        assert (stats.emitted, stats.latency.count) == (every + 1, 2)
+        with pytest.raises(ValueError):
+            instrument_handler(logging.StreamHandler(io.StringIO()), latency_sample_every=3)
+
+    def test_bytes_of_other_emits(self):
+        handler = LastRecordHandler()
+        stats = instrument_handler(handler)
+        handler.handle(_record('stored'))
+        assert handler.get_last_message() == 'stored'
+        # formatted on read, never written
+        assert (stats.emitted, stats.bytes_written) == (1, 0)
+
+        wrapped = logging.StreamHandler(io.StringIO())
+        original_handle = wrapped.handle
+        wrapped.handle = lambda record: original_handle(record)
+        stats = instrument_handler(wrapped)
+        wrapped.handle(_record('hello'))
+        assert (stats.emitted, stats.bytes_written, stats.latency.count) == (1, len('hello\n'), 1)
+
+    def test_instrumenting_twice_returns_the_same_stats(self, stream_handler):
+        stats = instrument_handler(stream_handler, name='console')
+        assert instrument_handler(stream_handler) is stats
+        assert get_handler_stats(stream_handler) is stats
+        assert stats.name == 'console'
+
+
+class TestEasyLoggerStats:
+    @pytest.fixture
+    def easy_logger(self, tmp_path):
+        el = EasyLogger(project_name='stats_test', root_log_location=str(tmp_path), logger_name='stats_test',
+                        propagate=False, instrument_handlers=True)
+        yield el
+        el.close()
+
+    def test_stats_per_level_file(self, easy_logger):
+        easy_logger.logger.error('boom')
+        stats = easy_logger.stats()
+        assert set(stats) == {'FileHandler-DEBUG', 'FileHandler-INFO', 'FileHandler-ERROR'}
+        assert stats['FileHandler-ERROR']['emitted'] == 1
+        assert stats['FileHandler-ERROR']['bytes_written'] > len('boom')
+
+    def test_handlers_added_later_are_instrumented(self, easy_logger):
+        easy_logger.create_other_handlers(logging.StreamHandler(io.StringIO()), logging_level=logging.WARNING)
+        easy_logger.logger.warning('later')
+        assert easy_logger.stats()['StreamHandler-WARNING']['emitted'] == 1
+
+    def test_disabled_by_default(self, tmp_path):
+        el = EasyLogger(project_name='stats_test', root_log_location=str(tmp_path), logger_name='no_stats_test')
+        try:
+            assert el.stats() == {}
+        finally:
+            el.close()
@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+
+from EasyLoggerAJM import EasyLogger
+from EasyLoggerAJM.backend import _InternalLoggerMethods
+
+
+@pytest.fixture
+def internal_logger(monkeypatch):
+    monkeypatch.delenv(_InternalLoggerMethods.INTERNAL_LEVEL_ENV_VAR, raising=False)
+    logger = logging.getLogger(_InternalLoggerMethods.INTERNAL_LOGGER_NAME)
+
+    def _reset():
+        for h in (_InternalLoggerMethods._internal_file_handler, _InternalLoggerMethods._internal_stream_handler):
+            if h is not None:
+                logger.removeHandler(h)
+                h.close()
+        _InternalLoggerMethods._internal_file_handler = None
+        _InternalLoggerMethods._internal_stream_handler = None
+        _InternalLoggerMethods._internal_level_configured = False
+        logger.setLevel(logging.NOTSET)
+
+    _reset()
+    yield logger
+    _reset()
+
+
+class TestInternalLogger:
+    def test_disabled_by_default(self, tmp_path, internal_logger, mocker):
+        file_handler = mocker.spy(logging.FileHandler, 'emit')
+        EasyLogger(project_name="QuietInternal", root_log_location=str(tmp_path))
+        assert not internal_logger.isEnabledFor(logging.CRITICAL)
+        assert not [h for h in internal_logger.handlers if isinstance(h, logging.FileHandler)]
+        assert not (tmp_path / _InternalLoggerMethods.INTERNAL_LOG_FILE_NAME).exists()
+        assert all(call.args[1].name != internal_logger.name for call in file_handler.call_args_list)
+
+    def test_handlers_added_once_per_process(self, tmp_path, internal_logger):
+        for _ in range(3):
+            EasyLogger(project_name="LoudInternal", root_log_location=str(tmp_path), internal_log_level='INFO')
+        assert len([h for h in internal_logger.handlers if isinstance(h, logging.FileHandler)]) == 1
+        text = (tmp_path / _InternalLoggerMethods.INTERNAL_LOG_FILE_NAME).read_text()
+        assert text.count("internal logger initialized") == 3
+        assert "project_name set to LoudInternal" in text
+
+    def test_level_from_environment(self, tmp_path, internal_logger, monkeypatch):
+        monkeypatch.setenv(_InternalLoggerMethods.INTERNAL_LEVEL_ENV_VAR, 'warning')
+        EasyLogger(project_name="EnvInternal", root_log_location=str(tmp_path))
+        assert internal_logger.level == logging.WARNING
+        monkeypatch.setenv(_InternalLoggerMethods.INTERNAL_LEVEL_ENV_VAR, 'off')
+        EasyLogger(project_name="EnvInternal", root_log_location=str(tmp_path))
+        assert not internal_logger.isEnabledFor(logging.CRITICAL)
+
+    def test_invalid_level(self, internal_logger):
+        with pytest.raises(ValueError):
+            _InternalLoggerMethods._resolve_internal_level('LOUD')
@@ -0,0 +1,129 @@
+import logging
+import os
+
+import pytest
+
+from EasyLoggerAJM import _EasyLoggerCustomLogger, EasyLogger
+from EasyLoggerAJM.logger_parts import Lazy, LazyMessage, lazy
+from EasyLoggerAJM.logger_parts.filters import ConsoleOneTimeFilter
+
+
+class _Calls:
+    def __init__(self, value='payload'):
+        self.value = value
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        return self.value
+
+
+@pytest.fixture
+def lazy_logger():
+    logger = _EasyLoggerCustomLogger('lazy_test')
+    logger.propagate = False
+    handler = logging.StreamHandler(open(os.devnull, 'w'))
+    handler.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    yield logger
+    handler.stream.close()
+
+
+class TestLazyLogging:
+    def test_not_evaluated_when_no_handler_emits(self, lazy_logger):
+        msg, arg = _Calls(), _Calls()
+        lazy_logger.debug(msg)
+        lazy_logger.debug('value %s', lazy(arg))
+        assert (msg.count, arg.count) == (0, 0)
+
+    def test_evaluated_once_across_handlers(self, tmp_path):
+        arg = _Calls(7)
+        el = EasyLogger(project_name='lazy_test', root_log_location=str(tmp_path), logger_name='lazy_el',
+                        propagate=False)
+        try:
+            el.logger.error('value %d', lazy(arg))
+            el.logger.warning(lambda: f'computed {arg()}')
+        finally:
+            el.close()
+        assert arg.count == 2
+        # ERROR goes to the DEBUG, INFO and ERROR files, each with the rendered text
+        error_logs = [p.read_text() for p in tmp_path.rglob('*.log') if 'value 7' in p.read_text()]
+        assert len(error_logs) == 3
+        assert any('computed 7' in text for text in error_logs)
+
+    def test_callable_returning_a_non_str(self, lazy_logger, caplog):
+        lazy_logger.addHandler(caplog.handler)
+        lazy_logger.info(lambda: 42)
+        lazy_logger.info(lambda: ValueError('bad value'))
+        assert [r.getMessage() for r in caplog.records] == ['42', 'bad value']
+
+    def test_failing_message_is_evaluated_once(self, lazy_logger, monkeypatch):
+        calls = []
+
+        def failing():
+            calls.append(1)
+            raise RuntimeError('cannot render')
+        errors = []
+        monkeypatch.setattr(logging.Handler, 'handleError', lambda handler, record: errors.append(handler))
+        second = logging.StreamHandler(open(os.devnull, 'w'))
+        lazy_logger.addHandler(second)
+        try:
+            lazy_logger.info(failing)
+        finally:
+            second.stream.close()
+        # each handler reports the error, the callable ran once
+        assert len(errors) == 2 and calls == [1]
+
+    def test_mapping_args_and_sanitize(self, lazy_logger, caplog):
+        lazy_logger.addHandler(caplog.handler)
+        lazy_logger.info('%(user)s ☃', {'user': lazy(lambda: 'ann')})
+        assert caplog.records[0].getMessage() == 'ann '
+        assert caplog.records[0].args == ()
+
+    def test_print_msg_renders_only_when_printing(self, lazy_logger, capsys):
+        msg = _Calls('printed')
+        lazy_logger.handlers[0].setLevel(logging.WARNING)
+        lazy_logger.debug(msg, print_msg=True)
+        # no handler emits the record, so it is neither printed nor rendered
+        assert capsys.readouterr().out == ''
+        assert msg.count == 0
+        file_like = logging.NullHandler()
+        lazy_logger.addHandler(file_like)
+        lazy_logger.debug(msg, print_msg=True)
+        assert capsys.readouterr().out == 'printed\n'
+        lazy_logger.removeHandler(file_like)
+        lazy_logger.handlers[0].setLevel(logging.DEBUG)
+        lazy_logger.debug(msg, print_msg=True)
+        # a console handler at DEBUG prints it instead, so print_msg doesn't render it
+        assert capsys.readouterr().out == ''
+        assert msg.count == 2
+
+    def test_failing_message_does_not_reach_the_caller(self, lazy_logger, monkeypatch):
+        def failing():
+            raise RuntimeError('cannot render')
+        errors = []
+        monkeypatch.setattr(logging.Handler, 'handleError', lambda handler, record: errors.append(handler))
+        lazy_logger.handlers[0].addFilter(ConsoleOneTimeFilter())
+        lazy_logger.addHandler(logging.NullHandler())
+        lazy_logger.warning(failing, print_msg=True)
+        assert errors == [lazy_logger.handlers[0]]
+
+    def test_plain_callable_args_are_not_called(self, lazy_logger, caplog):
+        lazy_logger.addHandler(caplog.handler)
+        lazy_logger.info('func %s', len)
+        assert caplog.records[0].getMessage() == 'func <built-in function len>'
+
+
+def test_lazy_formatting_helpers():
+    value = lazy(lambda x: x * 2, 21)
+    assert not value.evaluated
+    assert f"{value:>4}|{value!r}|{value}" == '  42|42|42'
+    assert isinstance(value, Lazy)
+
+
+def test_one_time_filter_keys_lazy_messages_by_text():
+    one_time = ConsoleOneTimeFilter()
+    records = [logging.LogRecord('x', logging.WARNING, __file__, 1, LazyMessage('same %s', (lazy(str, 1),)),
+                                 (), None) for _ in range(2)]
+    assert [one_time.filter(record) for record in records] == [True, False]
+    assert list(one_time.logged_messages) == ['same 1']
@@ -0,0 +1,113 @@
+import io
+import logging
+from logging.handlers import RotatingFileHandler
+
+import pytest
+
+from EasyLoggerAJM import _EasyLoggerCustomLogger
+from EasyLoggerAJM.backend import LevelCounters
+from EasyLoggerAJM.logger_parts import handle_batch, instrument_handler, lazy, supports_batches
+
+
+class _CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+class _BatchHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def handle_batch(self, records):
+        self.batches.append(list(records))
+        return len(records)
+
+    def emit(self, record):
+        raise AssertionError('batch handlers are not called per record')
+
+
+@pytest.fixture
+def batch_logger():
+    logger = _EasyLoggerCustomLogger('log_many_test')
+    logger.propagate = False
+    return logger
+
+
+def _stream_handler(level=logging.DEBUG):
+    handler = logging.StreamHandler(_CountingStream())
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter('%(levelname)s %(funcName)s %(message)s'))
+    return handler
+
+
+class TestLogMany:
+    def test_one_write_per_handler(self, batch_logger):
+        debug, error = _stream_handler(), _stream_handler(logging.ERROR)
+        batch_logger.addHandler(debug)
+        batch_logger.addHandler(error)
+        assert batch_logger.log_many(logging.INFO, ['plain', ('row %d', 1), ('%(k)s', {'k': 'v'}),
+                                                    ('lazy %s', lazy(str, 2))]) == 4
+        assert debug.stream.writes == 1
+        lines = debug.stream.getvalue().splitlines()
+        assert lines == [f'INFO test_one_write_per_handler {m}' for m in ('plain', 'row 1', 'v', 'lazy 2')]
+        assert error.stream.getvalue() == ''
+
+    def test_records_are_independent(self, batch_logger, caplog):
+        batch_logger.addHandler(caplog.handler)
+        batch_logger.log_many(logging.WARNING, [('a %s', 1), ('b %s', 2)], extra={'job': 'j1'})
+        first, second = caplog.records
+        assert (first.getMessage(), second.getMessage()) == ('a 1', 'b 2')
+        assert first.job == second.job == 'j1'
+        assert first.created == second.created
+        second.msg = 'changed'
+        assert first.getMessage() == 'a 1'
+
+    def test_disabled_level_and_logger_filter(self, batch_logger):
+        handler = _stream_handler()
+        batch_logger.addHandler(handler)
+        batch_logger.setLevel(logging.INFO)
+        assert batch_logger.log_many(logging.DEBUG, ['dropped']) == 0
+        batch_logger.addFilter(lambda record: record.getMessage() != 'skip')
+        assert batch_logger.log_many(logging.INFO, ['keep', 'skip']) == 1
+        assert handler.stream.getvalue().split() == ['INFO', 'test_disabled_level_and_logger_filter', 'keep']
+
+    def test_handlers_with_and_without_batch_support(self, batch_logger):
+        batch_handler, wrapped = _BatchHandler(), _stream_handler()
+        stats = instrument_handler(wrapped)
+        batch_logger.addHandler(batch_handler)
+        batch_logger.addHandler(wrapped)
+        batch_logger.log_many(logging.INFO, ['one', 'two', 'three'])
+        assert [len(batch) for batch in batch_handler.batches] == [3]
+        # instrumented: handled one record at a time so every emit is measured
+        assert not supports_batches(wrapped)
+        assert (stats.emitted, wrapped.stream.writes) == (3, 3)
+
+    def test_level_counters(self, batch_logger):
+        batch_logger.level_counters = LevelCounters()
+        batch_logger.log_many(logging.ERROR, ['x'] * 5)
+        assert batch_logger.level_counters.snapshot() == {logging.ERROR: 5}
+
+
+def test_delayed_file_handler_is_opened(tmp_path):
+    handler = logging.FileHandler(tmp_path / 'batch.log', delay=True)
+    records = [logging.LogRecord('x', logging.INFO, __file__, 1, 'line %d', (i,), None) for i in range(3)]
+    try:
+        assert supports_batches(handler)
+        assert handle_batch(handler, records) == 3
+    finally:
+        handler.close()
+    assert (tmp_path / 'batch.log').read_text() == 'line 0\nline 1\nline 2\n'
+
+
+def test_rotating_handlers_are_handled_per_record(tmp_path):
+    handler = RotatingFileHandler(tmp_path / 'rotating.log')
+    try:
+        assert not supports_batches(handler)
+    finally:
+        handler.close()
@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from EasyLoggerAJM import EasyLogger
+from EasyLoggerAJM.backend import LevelCounters, PrometheusExporter
+
+
+@pytest.fixture
+def metrics_logger(tmp_path):
+    el = EasyLogger(project_name='metrics_test', root_log_location=str(tmp_path), logger_name='metrics_test',
+                    propagate=False, metrics={'port': 0})
+    yield el
+    el.close()
+
+
+def _scrape(exporter: PrometheusExporter, path='/metrics') -> str:
+    host, port = exporter.server_address
+    with urllib.request.urlopen(f'http://{host}:{port}{path}', timeout=5) as response:
+        assert response.headers['Content-Type'] == PrometheusExporter.CONTENT_TYPE
+        return response.read().decode('utf-8')
+
+
+class TestLevelCounters:
+    def test_counts_per_level(self):
+        counters = LevelCounters()
+        for level in (logging.INFO, logging.INFO, logging.ERROR):
+            counters.increment(level)
+        assert counters.snapshot() == {logging.INFO: 2, logging.ERROR: 1}
+
+    def test_counts_from_finished_threads_are_kept(self):
+        counters = LevelCounters()
+
+        def work():
+            for _ in range(1000):
+                counters.increment(logging.DEBUG)
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert counters.snapshot() == {logging.DEBUG: 4000}
+        # the finished threads were folded into the retired totals
+        assert counters._thread_counts == []
+        assert counters.snapshot() == {logging.DEBUG: 4000}
+
+    def test_finished_threads_are_retired_without_snapshots(self):
+        counters = LevelCounters()
+        for _ in range(50):
+            thread = threading.Thread(target=counters.increment, args=(logging.INFO,))
+            thread.start()
+            thread.join()
+        # registering each new thread folded the finished ones away
+        assert len(counters._thread_counts) <= 1
+        assert counters.snapshot() == {logging.INFO: 50}
+
+
+class TestPrometheusExporter:
+    def test_localhost_scrape(self, metrics_logger):
+        metrics_logger.logger.info('one')
+        metrics_logger.logger.error('two')
+        body = _scrape(metrics_logger.metrics_exporter)
+        assert '# TYPE easylogger_records_total counter' in body
+        assert 'easylogger_records_total{logger="metrics_test",level="ERROR"} 1' in body
+        assert 'easylogger_handler_emitted_total{logger="metrics_test",handler="FileHandler-ERROR"} 1' in body
+        assert ('easylogger_handler_emit_latency_seconds{logger="metrics_test",handler="FileHandler-DEBUG",'
+                'quantile="0.99"}') in body
+        assert 'easylogger_handler_emit_latency_seconds_count{logger="metrics_test",handler="FileHandler-DEBUG"}' in body
+
+    def test_unknown_path_is_404(self, metrics_logger):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _scrape(metrics_logger.metrics_exporter, '/other')
+        assert error.value.code == 404
+
+    def test_dropped_and_queue_depth(self, tmp_path):
+        el = EasyLogger(project_name='metrics_test', root_log_location=str(tmp_path), logger_name='metrics_drop',
+                        propagate=False, show_warning_logs_in_console=True, tail_sampling=True, metrics=True)
+        try:
+            with el.log_context('job-1'):
+                el.logger.debug('held back')
+                el.logger.warning('same')
+                el.logger.warning('same')
+                body = el.metrics_exporter.render()
+        finally:
+            el.close()
+        assert 'easylogger_handler_dropped_total{logger="metrics_drop",handler="StreamHandler-WARNING"} 1' in body
+        assert 'easylogger_handler_queue_depth{logger="metrics_drop",handler="TailSamplingHandler-NOTSET"} 1' in body
+
+    def test_textfile(self, metrics_logger, tmp_path):
+        path = tmp_path / 'easylogger.prom'
+        metrics_logger.logger.critical('to file')
+        metrics_logger.metrics_exporter.write_textfile(path)
+        assert 'easylogger_records_total{logger="metrics_test",level="CRITICAL"} 1' in path.read_text()
+
+    def test_textfile_writer_survives_failed_writes(self, tmp_path):
+        exporter = PrometheusExporter()
+        path = tmp_path / 'missing' / 'easylogger.prom'
+        exporter.start_textfile_writer(path, interval=0.01)
+        try:
+            deadline = time.monotonic() + 5
+            while exporter.textfile_errors < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert exporter.textfile_errors >= 2
+            path.parent.mkdir()
+            while not path.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert path.exists()
+        finally:
+            exporter.stop()
+
+    def test_close_stops_the_server(self, tmp_path):
+        el = EasyLogger(project_name='metrics_test', root_log_location=str(tmp_path), logger_name='metrics_close',
+                        propagate=False, metrics={'port': 0})
+        exporter = el.metrics_exporter
+        el.close()
+        assert exporter.server_address is None
+        assert exporter.sources == []
+        assert el.logger.level_counters is None
+
+    def test_counters_are_dropped_with_the_last_user(self, tmp_path):
+        first = EasyLogger(project_name='metrics_test', root_log_location=str(tmp_path), logger_name='metrics_shared',
+                           propagate=False, metrics=True)
+        second = EasyLogger(project_name='metrics_test', root_log_location=str(tmp_path), logger_name='metrics_shared',
+                            propagate=False, metrics=True)
+        counters = first.logger.level_counters
+        first.close()
+        assert second.logger.level_counters is counters
+        second.close()
+        assert second.logger.level_counters is None
+        third = EasyLogger(project_name='metrics_test', root_log_location=str(tmp_path), logger_name='metrics_shared',
+                           propagate=False, metrics=True)
+        try:
+            # a fresh start, not the totals of the closed instances
+            assert third.logger.level_counters is not counters
+        finally:
+            third.close()
+
+    def test_label_values_are_escaped(self):
+        exporter = PrometheusExporter()
+        family = exporter._family({}, 'x', 'gauge', 'help')
+        family.add(1, logger='a"b\\c\nd')
+        exporter.collect = lambda: [family]
+        assert 'easylogger_x{logger="a\\"b\\\\c\\nd"} 1' in exporter.render()
@@ -0,0 +1,108 @@
+import logging
+
+import pytest
+
+from EasyLoggerAJM import _EasyLoggerCustomLogger
+from EasyLoggerAJM import custom_loggers
+from EasyLoggerAJM.logger_parts.timing import format_clock
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.reads = 0
+
+    def __call__(self):
+        self.reads += 1
+        return self.now
+
+
+@pytest.fixture
+def progress_logger(caplog):
+    logger = _EasyLoggerCustomLogger('progress_test')
+    logger.addHandler(caplog.handler)
+    yield logger
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _FakeClock()
+    monkeypatch.setattr(custom_loggers, 'monotonic', fake)
+    return fake
+
+
+def _messages(caplog):
+    return [record.getMessage() for record in caplog.records]
+
+
+class TestProgress:
+    def test_every_n_with_total(self, progress_logger, caplog, clock):
+        items = []
+        for item in progress_logger.progress(range(100), every_n=25, every_s=None, name='rows'):
+            items.append(item)
+            clock.now += 0.5
+        assert items == list(range(100))
+        messages = _messages(caplog)
+        assert messages[0] == 'progress rows: 25/100 (25.0%), 2.0 items/s, elapsed 0:12, eta 0:37'
+        assert len(messages) == 5
+        assert messages[-1] == 'progress rows: done, 100 items in 0:50, 2.0 items/s'
+
+    def test_every_s_reads_the_clock_rarely(self, progress_logger, caplog, clock):
+        def rows():
+            for i in range(100_000):
+                clock.now += 0.001
+                yield i
+        for _ in progress_logger.progress(rows(), every_s=10):
+            pass
+        messages = _messages(caplog)
+        # 100 s of work: about one line per 10 s, no total so no eta
+        assert 9 <= len(messages) - 1 <= 10
+        assert messages[0].startswith('progress: ') and 'items/s, elapsed 0:1' in messages[0]
+        assert clock.reads < 500
+
+    def test_every_s_after_the_loop_slows_down(self, progress_logger, caplog, clock):
+        lines = []
+        progress_logger.addFilter(lambda record: lines.append(clock.now) or True)
+
+        def rows():
+            # a fast phase grows the stride to its maximum, then every item takes 2 ms
+            for i in range(100_000):
+                clock.now += 0.000001
+                yield i
+            for i in range(6000):
+                clock.now += 0.002
+                yield i
+        for _ in progress_logger.progress(rows(), every_s=1):
+            pass
+        slow_start = 1000.0 + 0.1
+        slow_lines = [t for t in lines[:-1] if t > slow_start]
+        # the first late read gives the slow-down away, from then on a line about every second
+        assert slow_lines[0] - slow_start <= 4096 * 0.002 + 0.01
+        assert all(b - a < 1.1 for a, b in zip(slow_lines, slow_lines[1:]))
+        assert lines[-1] - slow_lines[-1] < 1.1
+
+    def test_stopped_early(self, progress_logger, caplog, clock):
+        for item in progress_logger.progress(iter(range(10)), every_s=None):
+            if item == 3:
+                break
+        # items are counted once the loop body is done with them
+        assert _messages(caplog) == ['progress: stopped, 3 items in 0:00, 0.0 items/s']
+
+    def test_disabled_level_passes_items_through(self, progress_logger, caplog):
+        progress_logger.setLevel(logging.WARNING)
+        assert list(progress_logger.progress([1, 2, 3], every_n=1)) == [1, 2, 3]
+        assert not caplog.records
+
+    def test_exceptions_propagate(self, progress_logger, caplog):
+        def failing():
+            yield 1
+            raise ValueError
+        with pytest.raises(ValueError):
+            list(progress_logger.progress(failing()))
+        assert 'stopped, 1 items' in _messages(caplog)[-1]
+
+
+@pytest.mark.parametrize('seconds, expected', [(7.9, '0:07'), (754, '12:34'), (3723, '1:02:03')])
+def test_format_clock(seconds, expected):
+    assert format_clock(seconds) == expected
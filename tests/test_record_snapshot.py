@@ -0,0 +1,75 @@
+import logging
+import sys
+
+from EasyLoggerAJM.logger_parts import (RecordSnapshot, LastRecordHandler, BufferedRecordHandler,
+                                        FlightRecorderHandler, lazy)
+
+
+def _error_record():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        return logging.LogRecord("snap", logging.ERROR, "/some/path.py", 12, "failed %s", ("job",), sys.exc_info(),
+                                 func="do_job")
+
+
+class TestRecordSnapshot:
+    def test_from_record_renders_message_and_traceback(self):
+        snapshot = RecordSnapshot.from_record(_error_record())
+        assert snapshot.msg == "failed job"
+        assert snapshot.getMessage() == "failed job"
+        assert snapshot.levelname == "ERROR"
+        assert "ValueError: boom" in snapshot.exc_text
+        assert not hasattr(snapshot, "__dict__")
+
+    def test_to_record_formats_like_the_original(self):
+        record = _error_record()
+        fmt = logging.Formatter('%(asctime)s | %(name)s | %(levelname)s | %(funcName)s:%(lineno)d | %(message)s')
+        snapshot = RecordSnapshot.from_record(record)
+        assert fmt.format(snapshot.to_record()) == fmt.format(record)
+
+
+class TestRecordHandlers:
+    def test_last_record_handler_keeps_no_exc_info(self):
+        handler = LastRecordHandler()
+        record = _error_record()
+        record.job_id = 7
+        handler.handle(record)
+        last = handler.get_last_record()
+        assert isinstance(last, logging.LogRecord) and last is handler.last_record
+        assert last.exc_info is None and last.job_id == 7
+        # the handled record itself is left alone for the other handlers
+        assert record.exc_info is not None
+        assert handler.get_last_message().startswith("failed job\nTraceback")
+
+    def test_buffered_record_handler_stores_snapshots(self):
+        handler = BufferedRecordHandler(buffer_size=2)
+        handler.handle(logging.LogRecord("snap", logging.INFO, "/some/path.py", 1, "plain %s", ("args",), None))
+        handler.handle(_error_record())
+        records = handler.buffer.records()
+        assert all(isinstance(r, RecordSnapshot) for r in records)
+        assert records[0].getMessage() == "plain args"
+        assert "ValueError: boom" in records[1].exc_text
+        assert "ValueError: boom" in handler.get_last_message()
+
+    def test_deferred_buffered_record_handler_stores_records(self):
+        handler = BufferedRecordHandler(buffer_size=2, format_on_emit=False)
+        plain = logging.LogRecord("snap", logging.INFO, "/some/path.py", 1, "plain", None, None)
+        handler.handle(plain)
+        handler.handle(_error_record())
+        records = handler.buffer.records()
+        assert records[0] is plain
+        assert records[1].exc_info is None
+        assert "ValueError: boom" in handler.get_last_message()
+
+    def test_flight_recorder_renders_lazy_messages_on_dump(self, tmp_path):
+        calls = []
+        recorder = FlightRecorderHandler(tmp_path, dump_level=logging.CRITICAL)
+        try:
+            recorder.handle(logging.LogRecord("snap", logging.DEBUG, "/some/path.py", 1, "state %s",
+                                              (lazy(calls.append, 'x'),), None))
+            assert calls == []
+            recorder.dump()
+        finally:
+            recorder.close()
+        assert calls == ['x']
@@ -0,0 +1,128 @@
+import json
+import time
+from datetime import date, timedelta
+from zipfile import ZipFile
+
+import pytest
+from EasyLoggerAJM.backend import LogRetentionManager
+from EasyLoggerAJM.easy_logger import EasyLogger
+
+
+def _day(days_ago):
+    return (date.today() - timedelta(days=days_ago)).isoformat()
+
+
+def _make_partition(root, days_ago, project="proj", size=100, run="1200"):
+    day = _day(days_ago)
+    run_dir = root / day / run
+    run_dir.mkdir(parents=True, exist_ok=True)
+    for level in ("DEBUG", "ERROR"):
+        (run_dir / f"{level}-{project}-{day}T{run}.log").write_text(f"{level} line for {project}\n" + "x" * size)
+    return day
+
+
+@pytest.fixture
+def root(tmp_path):
+    return tmp_path / "logs"
+
+
+class TestLogRetentionManager:
+    def test_parse_log_file_name(self):
+        assert LogRetentionManager.parse_log_file_name("DEBUG-my-proj-2024-01-02T1230.log") == ("DEBUG", "my-proj")
+        assert LogRetentionManager.parse_log_file_name("INFO-proj-1200.1.log") == ("INFO", "proj")
+        assert LogRetentionManager.parse_log_file_name("EasyLogger_internal.log") == (None, None)
+
+    def test_compacts_old_partitions_with_manifest(self, root):
+        old_day = _make_partition(root, 10)
+        today = _make_partition(root, 0)
+        manager = LogRetentionManager(root, compact_after_days=7)
+        manager.run_once()
+
+        assert not (root / old_day).exists()
+        assert (root / today).is_dir()
+        with ZipFile(root / f"{old_day}.zip") as zipf:
+            assert sorted(zipf.namelist()) == [f"1200/DEBUG-proj-{old_day}T1200.log",
+                                               f"1200/ERROR-proj-{old_day}T1200.log"]
+        manifest = json.loads((root / f"{old_day}.manifest.json").read_text())
+        assert {m['level'] for m in manifest['members']} == {"DEBUG", "ERROR"}
+        assert manager.stats()['partitions_compacted'] == 1
+
+    def test_search_reads_archives_and_live_files(self, root):
+        _make_partition(root, 10)
+        _make_partition(root, 0)
+        manager = LogRetentionManager(root, compact_after_days=7)
+        manager.run_once()
+
+        results = list(manager.search(r"ERROR line", project="proj"))
+        assert len(results) == 2
+        assert any(".zip:" in source for source, _ in results)
+        assert list(manager.search(r"ERROR line", project="other")) == []
+
+    def test_max_age_deletes(self, root):
+        old_day = _make_partition(root, 40)
+        manager = LogRetentionManager(root, max_age_days=30)
+        manager.run_once()
+        assert not (root / old_day).exists()
+        assert manager.stats()['partitions_deleted'] == 1
+
+    def test_total_size_cap_deletes_oldest_first(self, root):
+        oldest = _make_partition(root, 3)
+        newer = _make_partition(root, 2)
+        manager = LogRetentionManager(root, compact_after_days=None, max_total_bytes=300)
+        manager.run_once()
+        assert not (root / oldest).exists()
+        assert (root / newer).exists()
+
+    def test_project_cap_only_touches_that_project(self, root):
+        day = _make_partition(root, 3, project="big", size=500)
+        _make_partition(root, 3, project="small", size=10)
+        manager = LogRetentionManager(root, compact_after_days=None, max_project_bytes=200)
+        manager.run_once()
+        remaining = sorted(p.name for p in (root / day / "1200").iterdir())
+        assert remaining == [f"DEBUG-small-{day}T1200.log", f"ERROR-small-{day}T1200.log"]
+
+    def test_protected_paths_are_kept(self, root):
+        old_day = _make_partition(root, 40)
+        manager = LogRetentionManager(root, max_age_days=30, protected_paths=[root / old_day / "1200"])
+        manager.run_once()
+        assert (root / old_day).is_dir()
+
+    def test_scan_is_incremental(self, root):
+        for days_ago in range(1, 6):
+            _make_partition(root, days_ago)
+        manager = LogRetentionManager(root, compact_after_days=None, scan_batch_size=2)
+        assert manager.scan_step() == 2
+        assert manager.passes_completed == 0
+        manager.scan_step()
+        manager.scan_step()
+        assert manager.passes_completed == 1
+
+    def test_background_scan_survives_a_failing_step(self, root, mocker):
+        _make_partition(root, 40)
+        manager = LogRetentionManager(root, max_age_days=30, compact_after_days=None, scan_interval=0.01)
+        scan_step = manager.scan_step
+        failures = [PermissionError("locked")]
+
+        def flaky_scan_step():
+            if failures:
+                raise failures.pop()
+            return scan_step()
+        mocker.patch.object(manager, 'scan_step', side_effect=flaky_scan_step)
+        manager.start()
+        try:
+            deadline = time.monotonic() + 5
+            while manager.passes_completed == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            manager.stop()
+        assert manager.scan_errors == 1
+        assert manager.partitions_deleted == 1
+
+    def test_easy_logger_retention_kwarg(self, tmp_path):
+        el = EasyLogger(project_name="RetentionProject", root_log_location=str(tmp_path / "el_logs"),
+                        retention={'max_age_days': 30, 'scan_interval': 3600})
+        try:
+            assert isinstance(el.retention_manager, LogRetentionManager)
+            assert el.log_location.resolve() in el.retention_manager.protected_paths
+        finally:
+            el.retention_manager.stop()
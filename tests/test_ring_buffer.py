@@ -0,0 +1,98 @@
+import logging
+import threading
+
+import pytest
+from EasyLoggerAJM.logger_parts import RecordRingBuffer, BufferedRecordHandler
+
+
+def _record(msg, level=logging.INFO, created=None):
+    record = logging.LogRecord("ring", level, "path", 1, msg, None, None)
+    if created is not None:
+        record.created = created
+    return record
+
+
+@pytest.fixture
+def ring():
+    ring = RecordRingBuffer(4)
+    levels = [logging.INFO, logging.ERROR, logging.INFO, logging.WARNING, logging.ERROR, logging.INFO]
+    for i, level in enumerate(levels):
+        ring.append(_record(f"m{i}", level, created=100.0 + i), f"m{i}")
+    return ring
+
+
+class TestRecordRingBuffer:
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            RecordRingBuffer(0)
+
+    def test_newest_wraps(self, ring):
+        assert len(ring) == 4
+        assert ring.newest() == ["m2", "m3", "m4", "m5"]
+        assert ring.newest(2) == ["m4", "m5"]
+        assert ring.newest(10) == ["m2", "m3", "m4", "m5"]
+        assert ring.newest(0) == []
+
+    def test_by_level_drops_evicted(self, ring):
+        assert ring.by_level(logging.ERROR) == ["m4"]
+        assert ring.by_level(logging.INFO) == ["m2", "m5"]
+        assert ring.by_level(logging.INFO, 1) == ["m5"]
+        assert ring.by_level(logging.DEBUG) == []
+
+    def test_between(self, ring):
+        assert ring.between(103.0, 104.0) == ["m3", "m4"]
+        assert ring.between(start=104.5) == ["m5"]
+        assert ring.between(end=102.0) == ["m2"]
+        assert ring.between(200.0, 300.0) == []
+
+    def test_between_out_of_order_appends(self):
+        # a thread that created its record first can append it last
+        ring = RecordRingBuffer(8)
+        for msg, created in (("a", 10.0), ("b", 12.0), ("c", 11.0), ("d", 9.0), ("e", 13.0)):
+            ring.append(_record(msg, created=created), msg)
+        assert ring.between(10.5, 12.0) == ["b", "c"]
+        assert ring.between(end=10.0) == ["a", "d"]
+        assert ring.between(start=12.5) == ["e"]
+
+    def test_records_and_clear(self, ring):
+        assert [r.msg for r in ring.records(1)] == ["m5"]
+        ring.clear()
+        assert not ring
+        assert ring.newest() == []
+
+    def test_concurrent_appends(self):
+        ring = RecordRingBuffer(1000)
+
+        def writer(prefix):
+            for i in range(500):
+                ring.append(_record(f"{prefix}{i}"), f"{prefix}{i}")
+
+        threads = [threading.Thread(target=writer, args=(p,)) for p in "abcd"]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(ring.newest()) == 1000
+        assert len(ring.by_level(logging.INFO)) == 1000
+
+
+class TestBufferedRecordHandlerQueries:
+    def test_level_and_time_queries(self):
+        handler = BufferedRecordHandler(buffer_size=5)
+        handler.setFormatter(logging.Formatter("%(levelname)s:%(message)s"))
+        handler.handle(_record("a", logging.INFO, created=1.0))
+        handler.handle(_record("b", logging.ERROR, created=2.0))
+        handler.handle(_record("c", logging.ERROR, created=3.0))
+
+        assert handler.get_messages_by_level("ERROR") == ["ERROR:b", "ERROR:c"]
+        assert handler.get_messages_by_level(logging.ERROR, 1) == ["ERROR:c"]
+        assert handler.get_messages_between(1.5, 2.5) == ["ERROR:b"]
+
+    def test_formats_each_record_once(self, mocker):
+        handler = BufferedRecordHandler(buffer_size=5)
+        spy = mocker.spy(handler, 'format')
+        handler.handle(_record("a"))
+        for _ in range(10):
+            handler.get_all_messages()
+            handler.get_last_n_messages(1)
+        assert spy.call_count == 1
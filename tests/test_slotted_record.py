@@ -0,0 +1,105 @@
+import copy
+import logging
+import pickle
+import sys
+
+import pytest
+
+from EasyLoggerAJM import EasyLogger
+from EasyLoggerAJM.custom_loggers import _EasyLoggerCustomLogger
+from EasyLoggerAJM.logger_parts import SlottedLogRecord, BufferedRecordHandler
+from EasyLoggerAJM.UncaughtExceptionHook.filters import UncaughtExceptionFilter, NoEmailFilter
+
+
+def _slotted_logger(name):
+    logger = _EasyLoggerCustomLogger(name)
+    logger.record_factory = SlottedLogRecord
+    return logger
+
+
+def _pair(msg, args=(), exc_info=None):
+    kwargs = dict(func="do_job", sinfo=None)
+    return (logging.LogRecord("slots", logging.ERROR, "/some/path.py", 12, msg, args, exc_info, **kwargs),
+            SlottedLogRecord("slots", logging.ERROR, "/some/path.py", 12, msg, args, exc_info, **kwargs))
+
+
+class TestSlottedLogRecord:
+    def test_has_no_instance_dict(self):
+        _, record = _pair("plain")
+        assert not isinstance(record.__dict__, dict)
+        assert record.__dict__["msg"] == "plain"
+        assert record._extra is None
+
+    def test_formats_like_a_log_record(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+        original, slotted = _pair("failed %s", ("job",), exc_info)
+        slotted.created, slotted.msecs, slotted.relativeCreated = (original.created, original.msecs,
+                                                                   original.relativeCreated)
+        fmt = logging.Formatter('%(asctime)s | %(name)s | %(levelname)s | %(funcName)s:%(lineno)d | %(message)s')
+        assert fmt.format(slotted) == fmt.format(original)
+        assert "ValueError: boom" in fmt.format(slotted)
+
+    def test_extra_fields_and_dict_view(self):
+        _, record = _pair("plain")
+        record.set_extra("no_email", True)
+        record.__dict__["request_id"] = 7
+        assert record.no_email is True
+        assert record.__dict__["request_id"] == 7
+        assert getattr(record, "uncaught_exception", False) is False
+        assert logging.Formatter('%(request_id)s %(message)s').format(record) == "7 plain"
+
+    def test_copy_and_pickle_keep_extras(self):
+        _, record = _pair("pickled %d", (1,))
+        record.set_extra("uncaught_exception", True)
+        for clone in (copy.copy(record), pickle.loads(pickle.dumps(record))):
+            assert isinstance(clone, SlottedLogRecord)
+            assert clone.getMessage() == "pickled 1"
+            assert clone.uncaught_exception is True
+
+
+class TestSlottedRecordFactory:
+    def test_make_record_applies_extra(self):
+        logger = _slotted_logger("slots.extra")
+        record = logger.makeRecord(logger.name, logging.INFO, __file__, 1, "hi", (), None,
+                                   extra={"uncaught_exception": True})
+        assert isinstance(record, SlottedLogRecord)
+        assert UncaughtExceptionFilter().filter(record)
+        with pytest.raises(KeyError):
+            logger.makeRecord(logger.name, logging.INFO, __file__, 1, "hi", (), None, extra={"msg": "x"})
+
+    def test_no_email_filter_and_buffered_handler(self):
+        logger = _slotted_logger("slots.filters")
+        logger.propagate = False
+        handler = BufferedRecordHandler(buffer_size=5)
+        handler.addFilter(NoEmailFilter())
+        logger.addHandler(handler)
+        logger.error("kept %s", "one")
+        logger.error("dropped", extra={"no_email": True})
+        assert handler.get_all_messages() == ["kept one"]
+
+    def test_easy_logger_opt_in(self, tmp_path):
+        el = EasyLogger(project_name="SlottedProject", root_log_location=str(tmp_path),
+                        logger_name="slots.easy_logger", slotted_records=True)
+        try:
+            assert el.logger.record_factory is SlottedLogRecord
+            el.logger.info("slotted info line")
+            for hnd in el.logger.handlers:
+                hnd.flush()
+        finally:
+            el.close()
+        log_text = "".join(p.read_text() for p in tmp_path.rglob("*.log"))
+        assert "slotted info line" in log_text
+
+    def test_later_easy_logger_without_slots_resets_the_factory(self, tmp_path):
+        el = EasyLogger(project_name="SlottedProject", root_log_location=str(tmp_path),
+                        logger_name="slots.easy_logger_reset", slotted_records=True)
+        el.close()
+        el = EasyLogger(project_name="SlottedProject", root_log_location=str(tmp_path),
+                        logger_name="slots.easy_logger_reset")
+        try:
+            assert el.logger.record_factory is None
+        finally:
+            el.close()
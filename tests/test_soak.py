@@ -0,0 +1,28 @@
+import pytest
+
+soak = pytest.importorskip('benchmarks.soak')
+
+
+class TestSoak:
+    @pytest.mark.parametrize('scenario', list(soak.SCENARIOS))
+    def test_scenario_does_not_leak(self, scenario):
+        result = soak.run(records=5000, cycles=40, samples=8, scenarios=[scenario])[scenario]
+        assert result['passed'], result['failures']
+        assert result['growth']['handlers'] == 0
+
+    def test_leaked_handlers_fail_the_run(self, monkeypatch):
+        def leaky(log_dir, cycles, records, samples):
+            logger = soak.logging.getLogger('soak_leaky')
+            sampler = soak.SoakSampler([logger])
+            for i in range(samples):
+                logger.addHandler(soak.logging.NullHandler())
+                sampler.sample(i)
+            return sampler
+
+        monkeypatch.setitem(soak.SCENARIOS, 'leaky', leaky)
+        try:
+            result = soak.run(samples=8, scenarios=['leaky'])['leaky']
+        finally:
+            soak.logging.getLogger('soak_leaky').handlers.clear()
+        assert not result['passed']
+        assert any('handler' in failure for failure in result['failures'])
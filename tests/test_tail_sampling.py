@@ -0,0 +1,117 @@
+import asyncio
+import logging
+
+import pytest
+
+from EasyLoggerAJM import EasyLogger
+from EasyLoggerAJM.UncaughtExceptionHook import UncaughtLogger
+from EasyLoggerAJM.logger_parts import TailSamplingHandler, BufferedRecordHandler
+
+
+def _log(handler, level, msg):
+    handler.handle(logging.LogRecord("sampled", level, "dummy_path", 0, msg, None, None))
+
+
+@pytest.fixture
+def target():
+    return BufferedRecordHandler(buffer_size=100)
+
+
+class TestTailSamplingHandler:
+    def test_clean_context_is_dropped(self, target):
+        sampler = TailSamplingHandler([target])
+        with sampler.context("req-1"):
+            _log(sampler, logging.DEBUG, "debug detail")
+            _log(sampler, logging.WARNING, "warning passes")
+        assert target.get_all_messages() == ["warning passes"]
+        assert sampler.buffered_records == 0
+        assert sampler.discarded_records == 1
+
+    def test_error_flushes_context_then_passes_through(self, target):
+        sampler = TailSamplingHandler([target])
+        with sampler.context("req-2"):
+            _log(sampler, logging.DEBUG, "step 1")
+            _log(sampler, logging.INFO, "step 2")
+            _log(sampler, logging.ERROR, "failed")
+            _log(sampler, logging.DEBUG, "after")
+        assert target.get_all_messages() == ["step 1", "step 2", "failed", "after"]
+
+    def test_exception_exit_flushes(self, target):
+        sampler = TailSamplingHandler([target])
+        with pytest.raises(RuntimeError):
+            with sampler.context("job"):
+                _log(sampler, logging.DEBUG, "before crash")
+                raise RuntimeError("crash")
+        assert target.get_all_messages() == ["before crash"]
+
+    def test_records_outside_context_pass_through(self, target):
+        sampler = TailSamplingHandler([target])
+        _log(sampler, logging.DEBUG, "no context")
+        assert target.get_all_messages() == ["no context"]
+
+    def test_memory_bounds(self, target):
+        sampler = TailSamplingHandler([target], max_records_per_context=3, max_total_records=4)
+        with sampler.context("a"):
+            for i in range(5):
+                _log(sampler, logging.DEBUG, f"a{i}")
+            assert sampler.buffered_records == 3
+            with sampler.context("b"):
+                _log(sampler, logging.DEBUG, "b0")
+                _log(sampler, logging.DEBUG, "b1")
+                assert sampler.buffered_records == 4
+            _log(sampler, logging.ERROR, "a failed")
+        assert target.get_all_messages() == ["a3", "a4", "a failed"]
+
+    def test_flushed_contexts_are_bounded(self, target):
+        sampler = TailSamplingHandler([target], max_flushed_contexts=2)
+        for context_id in ("a", "b", "c"):
+            # flushed, but never ended
+            token = sampler.context_var.set(context_id)
+            _log(sampler, logging.ERROR, f"{context_id} error")
+            sampler.context_var.reset(token)
+        assert list(sampler._flushed_contexts) == ["b", "c"]
+
+    def test_contexts_are_isolated_between_tasks(self, target):
+        sampler = TailSamplingHandler([target])
+
+        async def request(name, fail):
+            with sampler.context(name):
+                _log(sampler, logging.DEBUG, f"{name} start")
+                await asyncio.sleep(0)
+                if fail:
+                    _log(sampler, logging.ERROR, f"{name} failed")
+
+        async def main():
+            await asyncio.gather(request("ok", False), request("bad", True))
+
+        asyncio.run(main())
+        assert target.get_all_messages() == ["bad start", "bad failed"]
+
+
+class TestEasyLoggerTailSampling:
+    def test_level_files_only_get_failed_contexts(self, tmp_path):
+        el = EasyLogger(project_name="SampledProject", root_log_location=str(tmp_path),
+                        logger_name="sampled_logger", tail_sampling=True)
+        try:
+            with el.log_context("good"):
+                el.logger.debug("good debug")
+            with el.log_context("bad"):
+                el.logger.debug("bad debug")
+                el.logger.error("bad error")
+            for hnd in el.file_handlers:
+                hnd.flush()
+            assert all(h not in el.logger.handlers for h in el.file_handlers)
+        finally:
+            el.close()
+        debug_file = next(p for p in tmp_path.rglob("DEBUG-*.log"))
+        text = debug_file.read_text()
+        assert "good debug" not in text
+        assert "bad debug" in text and "bad error" in text
+
+    def test_uncaught_logger_has_no_file_handlers(self, tmp_path):
+        el = UncaughtLogger(project_name="SampledProject", root_log_location=str(tmp_path),
+                            logger_name="sampled_uncaught_logger", tail_sampling=True)
+        try:
+            assert el.tail_sampler.targets == []
+        finally:
+            el.close()
@@ -0,0 +1,89 @@
+import logging
+import time
+
+import pytest
+
+from EasyLoggerAJM import _EasyLoggerCustomLogger
+from EasyLoggerAJM.logger_parts import TimingAggregator
+from EasyLoggerAJM.logger_parts.timing import format_duration
+
+
+@pytest.fixture
+def timing_logger(caplog):
+    logger = _EasyLoggerCustomLogger('timing_test')
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(caplog.handler)
+    yield logger
+    logger.stop_timings()
+    logger.removeHandler(caplog.handler)
+
+
+class TestTimed:
+    def test_context_manager_logs_one_summary(self, timing_logger, caplog):
+        for _ in range(50):
+            with timing_logger.timed('db.query'):
+                pass
+        assert not caplog.records
+        timing_logger.flush_timings()
+        assert len(caplog.records) == 1
+        message = caplog.records[0].getMessage()
+        assert message.startswith('timing db.query: count=50 p50=')
+        assert all(part in message for part in ('p95=', 'p99=', 'max='))
+
+    def test_decorator(self, timing_logger, caplog):
+        @timing_logger.timed('work')
+        def work(x):
+            return x * 2
+
+        assert work(2) == 4
+        assert work.__name__ == 'work'
+        assert timing_logger.timings.pending()['work']['count'] == 1
+
+    def test_exceptions_are_timed_and_propagate(self, timing_logger):
+        with pytest.raises(ValueError):
+            with timing_logger.timed('failing'):
+                raise ValueError
+        assert timing_logger.timings.pending()['failing']['count'] == 1
+
+    def test_summary_after_the_interval(self, caplog):
+        logger = _EasyLoggerCustomLogger('timing_interval_test')
+        logger.timing_interval = 0
+        logger.addHandler(caplog.handler)
+        with logger.timed('fast'):
+            pass
+        assert [r.getMessage().split(':')[0] for r in caplog.records] == ['timing fast']
+        assert logger.timings.pending() == {}
+
+    def test_idle_name_is_summarized_by_the_flusher(self, timing_logger, caplog):
+        timing_logger.timing_interval = 0.05
+        with timing_logger.timed('once'):
+            pass
+        deadline = time.monotonic() + 5
+        while not caplog.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # no further measurement arrived, the background flusher logged the interval
+        assert [r.getMessage().split(':')[0] for r in caplog.records] == ['timing once']
+
+    def test_stop_timings_flushes(self, timing_logger, caplog):
+        with timing_logger.timed('last'):
+            pass
+        timing_logger.stop_timings()
+        assert [r.getMessage().split(':')[0] for r in caplog.records] == ['timing last']
+
+
+class TestTimingAggregator:
+    def test_flush_resets(self):
+        summaries = []
+        aggregator = TimingAggregator(lambda name, histogram: summaries.append((name, histogram.count)), 3600)
+        aggregator.record('a', 1000)
+        aggregator.record('a', 2000)
+        aggregator.record('b', 10)
+        aggregator.flush()
+        assert summaries == [('a', 2), ('b', 1)]
+        assert aggregator.flush() == []
+
+
+@pytest.mark.parametrize('ns, expected', [(850, '850ns'), (12_300, '12.3us'), (4_560_000, '4.56ms'),
+                                          (1_200_000_000, '1.20s')])
+def test_format_duration(ns, expected):
+    assert format_duration(ns) == expected
@@ -0,0 +1,184 @@
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+from EasyLoggerAJM.UncaughtExceptionHook.uncaught_exception_hook import UncaughtExceptionHook
+
+
+class _RecordingUncaughtLogger:
+    instances = 0
+
+    def __init__(self, logger_name, **kwargs):
+        self.__class__.instances += 1
+        self.kwargs = kwargs
+        self.logger = logging.getLogger(logger_name)
+
+    def __call__(self):
+        return self.logger
+
+
+class TestLazyUncaughtLogger:
+    def test_set_sys_excepthook_defers_logger(self, mocker):
+        mocker.patch.object(sys, 'excepthook')
+        _RecordingUncaughtLogger.instances = 0
+        hook = UncaughtExceptionHook.set_sys_excepthook(uncaught_logger_class=_RecordingUncaughtLogger,
+                                                        project_name='lazy')
+        assert sys.excepthook == hook.show_exception_and_exit
+        assert not hook.logger_initialized
+        assert _RecordingUncaughtLogger.instances == 0
+
+        assert hook.uc_logger is logging.getLogger('UncaughtExceptionLogger')
+        assert hook.uncaught_logger_class.kwargs == {'project_name': 'lazy'}
+        assert _RecordingUncaughtLogger.instances == 1
+
+    def test_eager_by_default(self):
+        _RecordingUncaughtLogger.instances = 0
+        hook = UncaughtExceptionHook(uncaught_logger_class=_RecordingUncaughtLogger)
+        assert hook.logger_initialized
+        assert _RecordingUncaughtLogger.instances == 1
+
+    def test_logger_built_on_first_exception(self, tmp_path, mocker):
+        hook = UncaughtExceptionHook(lazy=True, root_log_location=str(tmp_path))
+        assert not hook.logger_initialized
+        mocker.patch.object(UncaughtExceptionHook, 'wait_for_key_and_exit')
+        mocker.patch.object(sys, '__excepthook__')
+        error_spy = mocker.patch('logging.Logger.error')
+        try:
+            raise ValueError("first crash")
+        except ValueError:
+            hook.show_exception_and_exit(*sys.exc_info())
+        assert hook.logger_initialized
+        assert error_spy.call_args.kwargs['extra'] == {'uncaught_exception': True}
+
+
+class TestNonInteractiveExit:
+    @staticmethod
+    def _hook(mocker, **kwargs):
+        hook = UncaughtExceptionHook(lazy=True, interactive=False, **kwargs)
+        mocker.patch.object(hook, '_log_exception')
+        mocker.patch.object(sys, '__excepthook__')
+        return hook
+
+    def test_exits_without_prompt_after_closing_handlers(self, mocker):
+        hook = self._hook(mocker)
+        wait_mock = mocker.patch.object(UncaughtExceptionHook, 'wait_for_key_and_exit')
+        close_mock = mocker.patch.object(UncaughtExceptionHook, 'flush_and_close_handlers')
+        exit_mock = mocker.patch('os._exit')
+        try:
+            raise ValueError("batch failure")
+        except ValueError:
+            hook.show_exception_and_exit(*sys.exc_info())
+        wait_mock.assert_not_called()
+        close_mock.assert_called_once_with(deadline=hook.flush_deadline)
+        exit_mock.assert_called_once_with(-1)
+
+    def test_flush_deadline_bounds_stuck_handlers(self):
+        import threading
+        import time
+
+        release = threading.Event()
+
+        class _StuckHandler(logging.Handler):
+            def emit(self, record):
+                pass
+
+            def flush(self):
+                release.wait(5)
+
+        closed = logging.Handler()
+        start = time.monotonic()
+        assert UncaughtExceptionHook.flush_and_close_handlers([closed], deadline=1) is True
+        assert UncaughtExceptionHook.flush_and_close_handlers([_StuckHandler()], deadline=0.1) is False
+        assert time.monotonic() - start < 1
+        release.set()
+
+    def test_thread_exceptions_are_hooked(self, mocker):
+        import threading
+
+        mocker.patch.object(sys, 'excepthook')
+        mocker.patch.object(threading, 'excepthook')
+        mocker.patch.object(threading, '__excepthook__')
+        hook = UncaughtExceptionHook.set_sys_excepthook(hook_threads=True,
+                                                        uncaught_logger_class=_RecordingUncaughtLogger)
+        assert threading.excepthook == hook.show_thread_exception_and_exit
+        report = mocker.patch.object(hook, '_report_exception')
+        exit_mock = mocker.patch.object(hook, 'exit_process')
+
+        def crash():
+            raise RuntimeError("thread crash")
+
+        worker = threading.Thread(target=crash)
+        worker.start()
+        worker.join()
+        assert report.call_args.args[0] is RuntimeError
+        # the hook is interactive, but a thread never prompts
+        exit_mock.assert_called_once_with(interactive=False)
+
+    def test_thread_hook_without_threading_default_hook(self, mocker, monkeypatch):
+        import threading
+        from types import SimpleNamespace
+
+        # as on Python 3.8/3.9
+        monkeypatch.delattr(threading, '__excepthook__', raising=False)
+        default_hook = mocker.patch.object(sys, '__excepthook__')
+        hook = UncaughtExceptionHook(uncaught_logger_class=_RecordingUncaughtLogger)
+        mocker.patch.object(hook, '_report_exception')
+        exit_mock = mocker.patch.object(hook, 'exit_process')
+        error = RuntimeError("thread crash")
+        hook.show_thread_exception_and_exit(SimpleNamespace(exc_type=RuntimeError, exc_value=error,
+                                                            exc_traceback=None, thread=None))
+        default_hook.assert_called_once_with(RuntimeError, error, None)
+        exit_mock.assert_called_once_with(interactive=False)
+
+    def test_threads_are_not_hooked_by_default(self, mocker):
+        import threading
+
+        mocker.patch.object(sys, 'excepthook')
+        mocker.patch.object(threading, 'excepthook')
+        hook = UncaughtExceptionHook.set_sys_excepthook(uncaught_logger_class=_RecordingUncaughtLogger)
+        assert threading.excepthook != hook.show_thread_exception_and_exit
+
+    def test_thread_exception_ends_the_process(self, tmp_path):
+        script = textwrap.dedent(f"""
+            import threading, time
+            from EasyLoggerAJM.UncaughtExceptionHook.uncaught_exception_hook import UncaughtExceptionHook
+
+            UncaughtExceptionHook.set_sys_excepthook(hook_threads=True, root_log_location={str(tmp_path)!r})
+
+            def crash():
+                raise RuntimeError("worker crash")
+
+            threading.Thread(target=crash).start()
+            time.sleep(20)
+            print("main thread finished")
+        """)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(Path(__file__).parents[1]),
+                                                                         os.environ.get('PYTHONPATH')])))
+        start = time.monotonic()
+        result = subprocess.run([sys.executable, '-c', script], cwd=tmp_path, env=env, stdin=subprocess.DEVNULL,
+                                capture_output=True, text=True, timeout=60)
+        # no prompt or 3 second wait, and the process fails instead of carrying on without the thread
+        assert time.monotonic() - start < 15
+        assert result.returncode != 0
+        assert "main thread finished" not in result.stdout
+        assert "worker crash" in result.stderr
+
+    def test_asyncio_handler(self, mocker):
+        import asyncio
+
+        hook = self._hook(mocker)
+        report = mocker.patch.object(hook, '_report_exception')
+        exit_mock = mocker.patch.object(hook, 'exit_process')
+
+        async def main():
+            loop = hook.install_asyncio_handler()
+            loop.call_soon(loop.call_exception_handler, {'message': 'boom', 'exception': KeyError('k')})
+            await asyncio.sleep(0.01)
+
+        asyncio.run(main())
+        assert report.call_args.args[0] is KeyError
+        exit_mock.assert_called_once_with(interactive=False)
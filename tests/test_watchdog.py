@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from EasyLoggerAJM import EasyLogger
+from EasyLoggerAJM.backend import StallWatchdog
+from EasyLoggerAJM.backend import watchdog as watchdog_module
+
+
+class _BlockingHandler(logging.Handler):
+    def __init__(self, release: threading.Event):
+        super().__init__()
+        self.unblock = release
+
+    def emit(self, record):
+        self.unblock.wait(5)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestStallWatchdog:
+    def test_no_heartbeat_before_the_first_one(self, tmp_path):
+        watchdog = StallWatchdog(tmp_path, heartbeat_timeout_ms=1)
+        time.sleep(0.01)
+        assert watchdog.stall_reasons() == []
+
+    def test_missed_heartbeat_samples_all_threads(self, tmp_path):
+        watchdog = StallWatchdog(tmp_path, heartbeat_timeout_ms=1)
+        stop = threading.Event()
+        workers = [threading.Thread(target=stop.wait, name=f'idle-{i}') for i in range(3)]
+        for worker in workers:
+            worker.start()
+        try:
+            watchdog.heartbeat()
+            time.sleep(0.01)
+            path = watchdog.check()
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+        text = path.read_text()
+        assert 'watchdog stack sample (no heartbeat for' in text
+        # the three idle threads share one stack
+        assert '--- 3 thread(s): idle-0, idle-1, idle-2 ---' in text
+        assert 'MainThread' in text
+
+    def test_samples_are_rate_limited(self, tmp_path):
+        watchdog = StallWatchdog(tmp_path, heartbeat_timeout_ms=1, min_sample_interval=3600)
+        watchdog.heartbeat()
+        time.sleep(0.01)
+        assert watchdog.check() is not None
+        assert watchdog.check() is None
+        assert (watchdog.samples_written, watchdog.samples_suppressed) == (1, 1)
+
+    def test_reentrant_handler(self, tmp_path, monkeypatch):
+        clock = iter(range(100))
+        monkeypatch.setattr(watchdog_module, 'monotonic', lambda: next(clock))
+        watchdog = StallWatchdog(tmp_path, emit_timeout_ms=60_000)
+        logger = logging.getLogger('watchdog_reentrant')
+        logger.propagate = False
+        starts = []
+
+        class _ReentrantHandler(logging.Handler):
+            def emit(self, record):
+                if record.msg == 'outer':
+                    logger.warning('inner')
+                starts.append(dict(in_flight))
+        handler = _ReentrantHandler()
+        watchdog.watch_handler(handler)
+        in_flight = handler._watchdog_in_flight
+        logger.addHandler(handler)
+        try:
+            logger.warning('outer')
+        finally:
+            logger.removeHandler(handler)
+        # the outer call was still in flight, with its own start, after the inner one
+        ident = threading.get_ident()
+        assert (starts[0][ident], starts[1][ident]) == (1, 0)
+        assert in_flight == {}
+
+    def test_blocked_handler(self, tmp_path):
+        release = threading.Event()
+        handler = _BlockingHandler(release)
+        watchdog = StallWatchdog(tmp_path, heartbeat_timeout_ms=None, emit_timeout_ms=20).start()
+        watchdog.watch_handler(handler, 'blocking')
+        logger = logging.getLogger('watchdog_blocked')
+        logger.propagate = False
+        logger.addHandler(handler)
+        writer = threading.Thread(target=logger.error, args=('stuck',), name='writer')
+        writer.start()
+        try:
+            assert _wait_for(lambda: watchdog.samples_written)
+        finally:
+            release.set()
+            writer.join()
+            watchdog.stop()
+            logger.removeHandler(handler)
+        assert watchdog.last_reason.startswith('blocking blocked for')
+        assert 'self.unblock.wait(5)' in watchdog.stacks_path.read_text()
+        assert watchdog.stall_reasons() == []
+
+
+class TestEasyLoggerWatchdog:
+    @pytest.fixture
+    def el(self, tmp_path):
+        el = EasyLogger(project_name='watchdog_test', root_log_location=str(tmp_path), logger_name='watchdog_el',
+                        propagate=False, watchdog={'heartbeat_timeout_ms': 20, 'min_sample_interval': 3600})
+        yield el
+        el.close()
+
+    def test_heartbeat_stall_writes_to_log_location(self, el):
+        el.heartbeat()
+        assert _wait_for(lambda: el.watchdog.samples_written)
+        assert el.watchdog.stacks_path.parent == el.log_location
+        assert el.watchdog.stacks_path.is_file()
+
+    def test_handlers_are_watched(self, el):
+        assert all(getattr(hnd, '_watchdog_in_flight', None) is not None for hnd in el._own_handlers())
+        el.logger.info('still works')
+        assert not el.watchdog.samples_written